@@ -0,0 +1,42 @@
+# Dataset.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+
+class Dataset():
+
+    def __init__(self):
+        """This sets the defaults of parametric airfoil dataset generation.
+
+        Assumptions:
+        The airfoil template is Geometry.Segments['section_1']
+
+        Source:
+        N/A
+
+        Inputs:
+        None
+
+        Outputs:
+        None
+
+        Properties Used:
+        N/A
+        """
+
+        self.directory       = None             # Output directory of the dataset shards
+        self.parametrization = 'PARSEC'         # Sampled airfoil parameters: 'PARSEC' or 'CST'
+        self.bounds          = {}               # Sampled parameters {name: [lower, upper]}. Lower and upper
+                                                # bounds of CST coefficient lists are lists themselves
+        self.sampling        = 'sobol'          # Sampling plan: 'sobol' or 'lhs'
+        self.n_samples       = 1024             # Total number of sampled airfoils
+        self.shard_size      = 256              # Number of samples per shard file
+        self.seed            = 0                # Seed of the sampling plan
+        self.workers         = 1                # Number of shards computed at once (separate processes)
+        self.min_thickness   = 0.02             # Minimum maximum-thickness-to-chord ratio of a valid airfoil
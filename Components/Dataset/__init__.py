@@ -0,0 +1,6 @@
+
+# -----------------------------------------
+# Import directories
+# -----------------------------------------
+
+from .Dataset import Dataset
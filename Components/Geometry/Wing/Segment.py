@@ -161,7 +161,8 @@ class Segment():
                             yy_no_fl_pre,xx_fl_suc,yy_fl_suc,xx_fl_pre,
                             yy_fl_pre,flap_cut1,flap_cut2)
         
-        mpi4py.MPI.Finalize()
+        if not mpi4py.MPI.Is_finalized():
+            mpi4py.MPI.Finalize()
 
 
         return airfoil_points       
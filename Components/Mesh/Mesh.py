@@ -41,6 +41,8 @@ class Mesh():
         self.far_field          = 0.0
         self.glyph_file         = "mesh_clean_airfoil_SU2.glf"
         self.pw_mesh_file       = 'mesh_file.pw'
+        self.convert_to_binary  = False         # Convert the SU2 mesh once to CGNS before the SU2 sweep
+        self.metadata           = {}            # Record of the mesh conversion
 
         self.airfoil_mesh_settings = {}
 
@@ -24,6 +24,72 @@ class Solver():
         self.max_iterations = 5000
         self.save_frequency = 100 
         self.warmstart      = 'NO'
+        self.max_cores      = None              # Total cores shared by concurrent cases (None - one case at a time)
+        self.resume         = False             # Reuse cases completed in an interrupted sweep
+        self.cache_dir        = None            # Directory of the solver result cache (None - disabled)
+        self.cache_size_limit = 10e9            # Result cache size limit [bytes]
+        self.case_file_mode   = 'link'          # Mesh/restart files in case directories: 'link', 'symlink', or 'copy'
+        self.symmetric      = False
+        self.export_workbook  = True            # Export arrays.xlsx from the result store
+        self.trace            = False           # Write a timing trace of the run stages to working_dir/trace.json
+        self.su2_driver        = 'mpiexec'      # SU2 runs: 'mpiexec' (SU2_CFD per case) or 'pysu2' (in process)
+        self.su2_python_module = 'pysu2'        # Python module of the in-process SU2 driver
+
+        # Execution of solver runs (overridden by the PYAEROSWEEP_BACKEND environment variable)
+        self.execution_backend = 'local'        # 'local' processes, 'batch' scheduler jobs, or a shared-filesystem 'work_queue'
+        self.backend_settings  = {
+            "batch"      : {"submit"        : 'sbatch',     # Job submit command (with options, e.g. 'sbatch --account=abc')
+                            "queue"         : 'squeue',     # Queue listing command
+                            "cancel"        : 'scancel',    # Job cancel command
+                            "directives"    : [],           # Scheduler options of every job, e.g. ['--time=04:00:00']
+                            "setup"         : [],           # Shell lines run before the solver, e.g. ['module load su2']
+                            "poll_interval" : 10.0,         # Time between queue checks of a job [s]
+                            "max_cores"     : None},        # Cores of all jobs queued at once (None - max_cores above)
+            "work_queue" : {"queue_dir"     : None,         # Queue directory shared with the workers (None - working_dir/work_queue)
+                            "poll_interval" : 1.0,          # Time between checks of a job [s]
+                            "stale_timeout" : 300.0,        # Time without a lease renewal of its worker after which a job is queued again [s]
+                            "max_cores"     : None}         # Cores of all jobs queued at once (None - max_cores above)
+        }
+
+        # MPI rank tuning of SU2 cases
+        self.tune_processors  = False           # Set processors from the measured strong scaling of the mesh
+        self.processor_tuning = {
+            "rank_counts"       : [1, 2, 4, 8, 16],     # Rank counts benchmarked (up to the core budget)
+            "iterations"        : [5, 25],              # Benchmark iterations, their difference gives the time per iteration
+            "case_iterations"   : None                  # Expected iterations per case (None - max_iterations)
+        }
+
+        # Restarts of SU2 cases from the nearest converged solution
+        self.restart_index = False              # Start cases from the nearest solution in working_dir/restart_index.json
+        self.restart_selection = {
+            "scales"        : {"Mach"            : 0.05,    # Distance scales of the (Mach, Re, AoA) conditions
+                               "Reynolds"        : 0.5,     # Reynolds number scale in decades
+                               "Angle_of_attack" : 2.0},    # Angle-of-attack scale [deg]
+            "max_distance"  : 4.0,                  # Largest distance a restart is taken from (cold start beyond)
+            "metric"        : None,                 # Custom distance function(a, b) of (Mach, Re, AoA) tuples
+            "seed_pairs"    : 1                     # (Altitude, Mach) pairs whose first cases run before those of the others
+        }
+
+        # Resource sampling of solver runs (requires psutil)
+        self.sample_resources  = False          # Store peak RSS, CPU time, core utilization, and disk I/O of every local solver run
+        self.resource_sampling = {
+            "interval"          : 1.0,                  # Time between samples of the solver process tree [s]
+            "rss_warning"       : None                  # Peak RSS above which a warning is printed [bytes] (None - no warning)
+        }
+
+        # Live convergence monitoring of SU2 cases
+        self.monitor_convergence = False        # Stop SU2 cases once the criteria below are met
+        self.convergence_monitor = {
+            "history_file"      : 'history.csv',        # SU2 history file (CONV_FILENAME + .csv)
+            "coefficients"      : ['CL', 'CD', 'CM'],   # Coefficients checked by the Cauchy criterion
+            "window"            : 100,                  # Iterations in the Cauchy window
+            "cauchy_eps"        : 1e-5,                 # Maximum relative coefficient spread in the window
+            "cauchy_floor"      : 1e-3,                 # Smallest coefficient magnitude the spread is relative to
+            "residual_drop"     : 6.0,                  # Residual drop to stop at [orders of magnitude]
+            "divergence_rise"   : 3.0,                  # Residual rise treated as divergence [orders of magnitude]
+            "min_iterations"    : 200,                  # Iterations before any criterion is applied
+            "poll_interval"     : 2.0                   # Time between history file reads [s]
+        }
 
         # Xfoil default values
         self.e_n = 9                        # The factor N for the e^N method
@@ -31,6 +97,25 @@ class Solver():
         self.free_transition = False
         self.x_transition    = [0.0, 0.0]
 
+        self.parallel_workers = 1           # Number of Xfoil sessions running at once
+        self.xfoil_batch_size = 1           # Number of (Altitude, Mach) pairs run in one Xfoil session
+        self.xfoil_display    = 'xvfb-run'  # X display of the Xfoil sessions: 'xvfb-run', 'shared', or 'none'
+
+        # Vortex-lattice default values
+        self.vlm_chordwise_panels = 8       # Number of chordwise panels of the vortex lattice
+        self.vlm_spanwise_panels  = 20      # Number of spanwise panels per wing segment
+
+        # Multi-fidelity sweeps
+        self.multi_fidelity = False             # Correct a low-fidelity sweep with selected SU2 cases
+        self.multi_fidelity_settings = {
+            "low_fidelity_solver"  : 'Xfoil',               # Solver of the full sweep: 'Xfoil' or 'Panel' (2D), 'VLM' (3D)
+            "case_fraction"        : 0.15,                  # Fraction of the sweep points run with SU2
+            "first_round_fraction" : 0.5,                   # Part of the SU2 cases run before the correction is checked
+            "transonic_mach"       : 0.6,                   # Mach number from which sweep points count as transonic
+            "rbf_kernel"           : 'thin_plate_spline',   # Kernel of the RBF correction model
+            "rbf_smoothing"        : 0.0                    # Smoothing of the RBF correction model
+        }
+
 
     def run_solver(self,Freestream,Mesh,Geometry):
         ''' 
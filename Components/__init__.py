@@ -3,6 +3,7 @@
 # Import directories
 # -----------------------------------------
 
+from . import Dataset
 from . import Geometry
 from . import Mesh
 from . import Solver
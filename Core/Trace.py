@@ -0,0 +1,304 @@
+# Trace.py
+#
+# Created:  Oct 2026
+# Modified:
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+
+import os
+import json
+import time
+import threading
+
+# The trace of the running analysis, None while tracing is off
+_active_trace = None
+
+# ----------------------------------------------------------------------
+#   Trace
+# ----------------------------------------------------------------------
+
+## @ingroup Core
+class Trace():
+    """ Records nested timing spans of an analysis run and writes them as a
+        Chrome trace (chrome://tracing, ui.perfetto.dev) with a summary table.
+
+        Assumptions:
+        Spans of one thread are nested. Spans of concurrent threads are shown
+        on their own tracks
+
+        Source:
+        Trace Event Format, Google
+    """
+
+    def __init__(self, filename):
+        """ Starts the trace clock.
+
+            Assumptions:
+            N/A
+
+            Source:
+            N/A
+
+            Inputs:
+            filename    [trace file (.json)]
+
+            Outputs:
+            N/A
+
+            Properties Used:
+            N/A
+        """
+        self.filename = filename
+        self.start    = time.perf_counter()
+        self.events   = []
+        self.threads  = {}
+        self.local    = threading.local()
+        self.lock     = threading.Lock()
+
+    def begin(self, name, args):
+        """ Opens a span on the calling thread.
+
+            Assumptions:
+            N/A
+
+            Source:
+            N/A
+
+            Inputs:
+            name        [span name]
+            args        [dictionary shown with the span]
+
+            Outputs:
+            N/A
+
+            Properties Used:
+            N/A
+        """
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        # name, arguments, start time, time spent in child spans
+        stack.append([name, args, time.perf_counter(), 0.0])
+
+    def end(self):
+        """ Closes the innermost span of the calling thread and records it.
+
+            Assumptions:
+            N/A
+
+            Source:
+            N/A
+
+            Inputs:
+            N/A
+
+            Outputs:
+            N/A
+
+            Properties Used:
+            N/A
+        """
+        stop  = time.perf_counter()
+        stack = self.local.stack
+        name, args, start, children = stack.pop()
+        duration = stop - start
+        if stack:
+            stack[-1][3] += duration
+
+        ident = threading.get_ident()
+        with self.lock:
+            if ident not in self.threads:
+                self.threads[ident] = (len(self.threads), threading.current_thread().name)
+            self.events.append({"name" : name,
+                                "ph"   : 'X',
+                                "ts"   : (start - self.start)*1e6,
+                                "dur"  : duration*1e6,
+                                "pid"  : os.getpid(),
+                                "tid"  : self.threads[ident][0],
+                                "args" : args,
+                                "self" : duration - children})
+
+    def summary(self):
+        """ Builds the table of total and self time per span name.
+
+            Assumptions:
+            Self time is the time not spent in nested spans of the same thread.
+            Totals of spans running on several threads at once can exceed the
+            wall time of the run
+
+            Source:
+            N/A
+
+            Inputs:
+            N/A
+
+            Outputs:
+            table       [text of the summary table]
+
+            Properties Used:
+            N/A
+        """
+        wall   = time.perf_counter() - self.start
+        totals = {}
+        with self.lock:
+            for event in self.events:
+                entry = totals.setdefault(event["name"], [0, 0.0, 0.0])
+                entry[0] += 1
+                entry[1] += event["dur"]*1e-6
+                entry[2] += event["self"]
+
+        width = max([len(name) for name in totals] + [4])
+        lines = ['Timing summary, wall time ' + str("{:.3f}".format(wall)) + ' s',
+                 'Span'.ljust(width) + '    Calls    Total [s]     Self [s]    Total [%]']
+        for name, (calls, total, own) in sorted(totals.items(), key=lambda item: -item[1][1]):
+            lines.append(name.ljust(width) + str(calls).rjust(9) + str("{:.3f}".format(total)).rjust(13) + \
+                         str("{:.3f}".format(own)).rjust(13) + str("{:.1f}".format(100*total/wall)).rjust(13))
+
+        return '\n'.join(lines)
+
+    def write(self):
+        """ Writes the trace file and the summary table next to it.
+
+            Assumptions:
+            The summary table is written to <trace>_summary.txt
+
+            Source:
+            N/A
+
+            Inputs:
+            N/A
+
+            Outputs:
+            table       [text of the summary table]
+
+            Properties Used:
+            N/A
+        """
+        table = self.summary()
+        with self.lock:
+            events = [{key: value for key, value in event.items() if key != "self"} for event in self.events]
+            for number, name in self.threads.values():
+                events.append({"name": 'thread_name', "ph": 'M', "pid": os.getpid(), "tid": number,
+                               "args": {"name": name}})
+
+        with open(self.filename, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": 'ms'}, f)
+        with open(os.path.splitext(self.filename)[0] + '_summary.txt', 'w') as f:
+            f.write(table + '\n')
+
+        return table
+
+# ----------------------------------------------------------------------
+#   Spans
+# ----------------------------------------------------------------------
+
+class _Span():
+    """ Context manager of one span of the active trace. """
+
+    __slots__ = ('trace', 'name', 'args')
+
+    def __init__(self, trace, name, args):
+        self.trace = trace
+        self.name  = name
+        self.args  = args
+
+    def __enter__(self):
+        self.trace.begin(self.name, self.args)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.trace.end()
+        return False
+
+class _NullSpan():
+    """ Context manager used while tracing is off. """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+## @ingroup Core
+def span(name, **args):
+    """ Times a block of the analysis: with span('Config writing', case=name): ...
+
+        Assumptions:
+        While tracing is off the shared no-op span is returned, so the cost is
+        one function call per block
+
+        Source:
+        N/A
+
+        Inputs:
+        name        [span name, shared by all spans summed in the summary table]
+        args        [values shown with the span in the trace viewer]
+
+        Outputs:
+        context manager
+
+        Properties Used:
+        N/A
+    """
+    trace = _active_trace
+    if trace is None:
+        return _NULL_SPAN
+    return _Span(trace, name, args)
+
+## @ingroup Core
+def start_trace(filename):
+    """ Starts recording spans into a new trace.
+
+        Assumptions:
+        One trace is recorded at a time. Starting a trace replaces the active one
+
+        Source:
+        N/A
+
+        Inputs:
+        filename    [trace file (.json)]
+
+        Outputs:
+        trace       [Trace]
+
+        Properties Used:
+        N/A
+    """
+    global _active_trace
+    _active_trace = Trace(filename)
+    return _active_trace
+
+## @ingroup Core
+def stop_trace():
+    """ Stops recording, writes the trace and its summary table, and prints the table.
+
+        Assumptions:
+        Does nothing while tracing is off
+
+        Source:
+        N/A
+
+        Inputs:
+        N/A
+
+        Outputs:
+        N/A
+
+        Properties Used:
+        N/A
+    """
+    global _active_trace
+    trace = _active_trace
+    if trace is None:
+        return
+    _active_trace = None
+
+    table = trace.write()
+    print(table)
+    print('Timing trace written to ' + trace.filename)
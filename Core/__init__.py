@@ -6,4 +6,5 @@
 from .Data 		        import Data
 from .DataOrdered 	    import DataOrdered
 from .ContainerOrdered  import ContainerOrdered
+from .Trace             import Trace, span, start_trace, stop_trace
 
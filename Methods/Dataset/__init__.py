@@ -0,0 +1,6 @@
+
+# -----------------------------------------
+# Import directories
+# -----------------------------------------
+
+from .airfoil_dataset import generate_airfoil_dataset, read_airfoil_dataset
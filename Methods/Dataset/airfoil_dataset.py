@@ -0,0 +1,550 @@
+# airfoil_dataset.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Generates parametric airfoil datasets for machine learning. Sampled airfoils
+    are solved shard by shard and streamed into compressed NPZ shard files
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+import copy
+import json
+import shutil
+import warnings
+import functools
+import multiprocessing
+import numpy as np
+
+from Core.Data                          import Data
+from Methods.Solver.run_Panel           import contour_from_points, batch_panel_coefficients
+from Methods.Solver.run_Xfoil           import xfoil_commands, launch_Xfoil, read_polar
+from Methods.Solver.display_server      import DisplayServer
+
+
+
+def generate_airfoil_dataset(Dataset,Solver,Freestream,Mesh,Geometry):
+
+    ''' Samples airfoil parameters, solves the airfoils, and writes the results into shards
+
+        Inputs:
+            Dataset     - dataset settings (see Components.Dataset)
+            Solver      - solver settings. Solver.name is 'Panel' or 'Xfoil'
+            Freestream  - Freestream conditions
+            Mesh        - Mesh settings (Xfoil panel distribution)
+            Geometry    - Geometric settings. Geometry.Segments['section_1'] is the
+                          template airfoil, its parameters without bounds are kept fixed
+
+        Outputs:
+            filenames of the shards computed by this call, yielded as they are completed
+
+        Assumptions:
+            1. Shard n holds samples n*shard_size to (n+1)*shard_size - 1 of the sampling
+               plan. The samples are regenerated from the seed inside each shard, so the
+               memory use does not depend on the number of samples
+            2. Sobol samples are taken from one scrambled sequence. Latin hypercube
+               samples are stratified within every shard
+            3. Shards are written to a temporary file and renamed once complete.
+               Existing shards are skipped, so an interrupted campaign resumes from
+               the shards that are missing
+            4. Shards are computed in separate processes if Dataset.workers > 1
+            5. Only single-element airfoils are supported
+
+    '''
+
+    if Solver.name not in ('Panel', 'Xfoil'):
+        raise Exception('Airfoil datasets can be generated with the Panel or Xfoil solver only')
+
+    spec     = parameter_bounds(Dataset,Geometry)
+    n_shards = int(np.ceil(Dataset.n_samples/Dataset.shard_size))
+
+    os.makedirs(Dataset.directory, exist_ok=True)
+    write_manifest(Dataset,Solver,Freestream,Geometry,spec)
+
+    # Remove shards and work directories left by an interrupted campaign
+    for filename in os.listdir(Dataset.directory):
+        path = os.path.join(Dataset.directory,filename)
+        if filename.endswith('.tmp'):
+            os.remove(path)
+        elif filename.startswith('work_') and os.path.isdir(path):
+            shutil.rmtree(path)
+
+    pending = [shard for shard in range(n_shards) if not os.path.exists(shard_filename(Dataset.directory,shard))]
+    if len(pending) < n_shards:
+        print(str(n_shards - len(pending)) + ' of ' + str(n_shards) + ' shards found in ' + Dataset.directory)
+
+    task = functools.partial(run_shard,Dataset,Solver,Freestream,Mesh,Geometry)
+
+    if Dataset.workers > 1 and len(pending) > 1:
+        with multiprocessing.Pool(min(Dataset.workers,len(pending))) as pool:
+            for filename in pool.imap_unordered(task,pending):
+                print('Shard ' + os.path.basename(filename) + ' completed')
+                yield filename
+    else:
+        for shard in pending:
+            filename = task(shard)
+            print('Shard ' + os.path.basename(filename) + ' completed')
+            yield filename
+
+
+    return
+
+
+
+def run_shard(Dataset,Solver,Freestream,Mesh,Geometry,shard):
+
+    ''' Samples, screens, and solves the airfoils of one shard
+
+        Inputs:
+            Dataset, Solver, Freestream, Mesh, Geometry - see generate_airfoil_dataset
+            shard       - shard number
+
+        Outputs:
+            filename    - shard file with
+                            sample_index    - sample numbers of the valid airfoils [m]
+                            parameters      - sampled parameters [m, n_parameters]
+                            coordinates     - contours normalized by the chord [m, 2, n_points],
+                                              ordered as in contour_from_points
+                            Cl, Cd, Cm      - polars [m, n_altitude, n_mach, n_aoa]
+                            converged       - convergence flags of the polar points
+                            rejected        - sample numbers of the airfoils screened out
+
+        Assumptions:
+            Airfoils that cannot be generated or fail screen_airfoil are rejected
+
+    '''
+
+    spec   = parameter_bounds(Dataset,Geometry)
+    values = sample_parameters(Dataset,spec,shard)
+    start  = shard*Dataset.shard_size
+
+    # Generate and screen the airfoils
+    segment = copy.deepcopy(Geometry.Segments['section_1'])
+    segment.write_airfoil = False
+    segment.plot_airfoil  = False
+
+    valid    = []
+    contours = []
+    rejected = []
+    for n in range(len(values)):
+        try:
+            with np.errstate(all='ignore'):
+                x, y = build_airfoil(segment,Dataset.parametrization,spec,values[n])
+            accepted = screen_airfoil(x,y,Dataset.min_thickness)
+        except Exception:
+            accepted = False
+
+        if accepted:
+            valid.append(n)
+            contours.append(np.array([x,y]))
+        else:
+            rejected.append(start + n)
+
+    if len(contours) > 0:
+        coordinates = np.array(contours)
+    else:
+        coordinates = np.zeros((0,2,0))
+
+    # Solve the valid airfoils
+    if Solver.name == 'Panel':
+        Cl, Cd, Cm, converged = panel_polars(Freestream,Geometry,coordinates)
+    else:
+        work_dir = os.path.join(Dataset.directory,'work_' + str(shard).zfill(6))
+        Cl, Cd, Cm, converged = xfoil_polars(Solver,Freestream,Mesh,Geometry,coordinates,work_dir)
+
+    # Write the shard
+    filename  = shard_filename(Dataset.directory,shard)
+    temp_file = filename + '.tmp'
+    with open(temp_file, 'wb') as f:
+        np.savez_compressed(f, sample_index=start + np.asarray(valid, dtype=int), parameters=values[valid],
+                            coordinates=coordinates, Cl=Cl, Cd=Cd, Cm=Cm, converged=converged,
+                            rejected=np.asarray(rejected, dtype=int))
+    os.replace(temp_file, filename)
+
+
+    return filename
+
+
+
+def parameter_bounds(Dataset,Geometry):
+
+    ''' Collects the sampled parameters of the template airfoil
+
+        Inputs:
+            Dataset.parametrization, bounds
+            Geometry.Segments['section_1'].Airfoil[parametrization]  - template parameters
+
+        Outputs:
+            spec.parameters - sampled template parameters
+                .sizes      - number of values of every sampled parameter
+                .names      - names of the sampled values, e.g. 'rle' or 'upper[2]'
+                .lower      - lower bounds of the sampled values
+                .upper      - upper bounds of the sampled values
+
+        Assumptions:
+
+    '''
+
+    if Dataset.parametrization not in ('PARSEC', 'CST'):
+        raise Exception('Unknown airfoil parametrization ' + str(Dataset.parametrization))
+
+    template = Geometry.Segments['section_1'].Airfoil[Dataset.parametrization]
+
+    spec            = Data()
+    spec.parameters = []
+    spec.sizes      = []
+    spec.names      = []
+    lower           = []
+    upper           = []
+    for key, (lower_i, upper_i) in Dataset.bounds.items():
+        if key not in template:
+            raise Exception('The template airfoil has no ' + Dataset.parametrization + ' parameter ' + str(key))
+
+        lower_i = np.atleast_1d(np.asarray(lower_i, dtype=float))
+        upper_i = np.atleast_1d(np.asarray(upper_i, dtype=float))
+        if lower_i.shape != upper_i.shape or lower_i.size != np.size(template[key]):
+            raise Exception('The bounds of ' + str(key) + ' do not match the size of the template parameter')
+        if np.any(upper_i <= lower_i):
+            raise Exception('The upper bounds of ' + str(key) + ' must be above the lower bounds')
+
+        spec.parameters.append(key)
+        spec.sizes.append(lower_i.size)
+        if np.ndim(template[key]) == 0:
+            spec.names.append(key)
+        else:
+            spec.names += [key + '[' + str(k) + ']' for k in range(lower_i.size)]
+        lower.append(lower_i)
+        upper.append(upper_i)
+
+    if len(spec.parameters) == 0:
+        raise Exception('No parameter bounds are defined for the dataset')
+
+    spec.lower = np.concatenate(lower)
+    spec.upper = np.concatenate(upper)
+
+
+    return spec
+
+
+
+def sample_parameters(Dataset,spec,shard):
+
+    ''' Returns the sampled parameter values of one shard
+
+        Inputs:
+            Dataset.sampling, n_samples, shard_size, seed
+            spec        - sampled parameters (see parameter_bounds)
+            shard       - shard number
+
+        Outputs:
+            values      - [n_shard_samples, n_parameters]
+
+        Assumptions:
+            1. The Sobol sequence is fast-forwarded to the first sample of the shard
+            2. Latin hypercube samples are seeded with the seed and the shard number
+
+    '''
+
+    from scipy.stats import qmc
+
+    start = shard*Dataset.shard_size
+    count = min(Dataset.shard_size, Dataset.n_samples - start)
+    d     = len(spec.names)
+
+    if Dataset.sampling == 'sobol':
+        sampler = qmc.Sobol(d, scramble=True, seed=np.random.default_rng(Dataset.seed))
+        if start > 0:
+            sampler.fast_forward(start)
+        with warnings.catch_warnings():
+            # Shards are not aligned to powers of two
+            warnings.simplefilter('ignore')
+            unit = sampler.random(count)
+    elif Dataset.sampling == 'lhs':
+        sampler = qmc.LatinHypercube(d, seed=np.random.default_rng([Dataset.seed, shard]))
+        unit    = sampler.random(count)
+    else:
+        raise Exception('Unknown sampling plan ' + str(Dataset.sampling))
+
+
+    return qmc.scale(unit, spec.lower, spec.upper)
+
+
+
+def build_airfoil(segment,parametrization,spec,values):
+
+    ''' Generates the contour of one sampled airfoil
+
+        Inputs:
+            segment         - template segment, its airfoil parameters are replaced
+            parametrization - 'PARSEC' or 'CST'
+            spec            - sampled parameters (see parameter_bounds)
+            values          - sampled values
+
+        Outputs:
+            x, y            - contour normalized by the chord (see contour_from_points)
+
+        Assumptions:
+
+    '''
+
+    parameters = dict(segment.Airfoil[parametrization])
+
+    k = 0
+    for key, size in zip(spec.parameters, spec.sizes):
+        if np.ndim(parameters[key]) == 0:
+            parameters[key] = float(values[k])
+        else:
+            parameters[key] = np.array(values[k:k+size])
+        k += size
+
+    segment.Airfoil[parametrization] = parameters
+
+    if parametrization == 'PARSEC':
+        points = segment.create_PARSEC_airfoil()
+    else:
+        points = segment.create_CST_airfoil()
+
+
+    return contour_from_points(points)
+
+
+
+def screen_airfoil(x,y,min_thickness):
+
+    ''' Checks that a generated airfoil is a valid single-element shape
+
+        Inputs:
+            x, y            - contour ordered from the lower trailing edge (see contour_from_points)
+            min_thickness   - minimum maximum-thickness-to-chord ratio
+
+        Outputs:
+            True for valid airfoils
+
+        Assumptions:
+            1. Both surfaces run monotonically from the leading to the trailing edge
+            2. The surfaces must not touch or cross between 1% and 99% chord
+
+    '''
+
+    if not (np.all(np.isfinite(x)) and np.all(np.isfinite(y))):
+        return False
+
+    n_le       = np.argmin(x)
+    x_lo, y_lo = x[:n_le+1][::-1], y[:n_le+1][::-1]
+    x_up, y_up = x[n_le:], y[n_le:]
+
+    if np.any(np.diff(x_lo) <= 0) or np.any(np.diff(x_up) <= 0):
+        return False
+
+    xc        = np.linspace(0.01, 0.99, 99)
+    thickness = np.interp(xc,x_up,y_up) - np.interp(xc,x_lo,y_lo)
+
+
+    return bool(np.all(thickness > 0) and np.max(thickness) >= min_thickness)
+
+
+
+def panel_polars(Freestream,Geometry,coordinates):
+
+    ''' Solves a stack of airfoils with the panel method
+
+        Inputs:
+            Freestream  - Freestream conditions
+            Geometry    - Geometric settings (moment reference point)
+            coordinates - contours normalized by the chord [m, 2, n_points]
+
+        Outputs:
+            Cl, Cd, Cm, converged   - [m, n_altitude, n_mach, n_aoa]
+
+        Assumptions:
+            Inviscid flow with the Prandtl-Glauert correction, so Cd is zero
+
+    '''
+
+    shape = (len(coordinates), len(Freestream.Altitude), len(Freestream.Mach), len(Freestream.Angle_of_attack))
+    Cl    = np.zeros(shape)
+    Cm    = np.zeros(shape)
+
+    if len(coordinates) > 0:
+        chord  = Geometry.reference_values["Length"]
+        x_ref  = Geometry.reference_values["Point"][0]/chord
+        y_ref  = Geometry.reference_values["Point"][1]/chord
+        Cl_inc, Cm_inc = batch_panel_coefficients(coordinates[:,0,:],coordinates[:,1,:],Freestream.Angle_of_attack,x_ref,y_ref)
+
+        for j in range(len(Freestream.Mach)):
+            beta = np.sqrt(1 - Freestream.Mach[j]**2)
+            Cl[:,:,j,:] = (Cl_inc/beta)[:,None,:]
+            Cm[:,:,j,:] = (Cm_inc/beta)[:,None,:]
+
+
+    return Cl, np.zeros(shape), Cm, np.isfinite(Cl)
+
+
+
+def xfoil_polars(Solver,Freestream,Mesh,Geometry,coordinates,work_dir):
+
+    ''' Solves airfoils one by one with Xfoil
+
+        Inputs:
+            Solver      - Solver settings
+            Freestream  - Freestream conditions
+            Mesh        - Mesh settings (Xfoil panel distribution)
+            Geometry    - Geometric settings
+            coordinates - contours normalized by the chord [m, 2, n_points]
+            work_dir    - directory of the Xfoil runs, removed afterwards
+
+        Outputs:
+            Cl, Cd, Cm, converged   - [m, n_altitude, n_mach, n_aoa]. Points that did not
+                                      converge are NaN
+
+        Assumptions:
+            All conditions of one airfoil are run in one Xfoil session
+
+    '''
+
+    AoA   = Freestream.Angle_of_attack
+    shape = (len(coordinates), len(Freestream.Altitude), len(Freestream.Mach), len(AoA))
+    Cl    = np.full(shape, np.nan)
+    Cd    = np.full(shape, np.nan)
+    Cm    = np.full(shape, np.nan)
+    converged = np.zeros(shape, dtype=bool)
+
+    pairs      = [(i,j) for i in range(len(Freestream.Altitude)) for j in range(len(Freestream.Mach))]
+    conditions = [(Freestream.Altitude[i],Freestream.Mach[j],'polar_' + str(i) + '_' + str(j) + '.dat') for (i,j) in pairs]
+
+    commands = xfoil_commands(Solver,Mesh,'airfoil.dat',AoA,conditions,Geometry)
+    if Solver.xfoil_display == 'none':
+        # Switch the graphics off so that Xfoil does not open an X display
+        commands = 'PLOP\nG\n\n' + commands
+
+    with DisplayServer(Solver.xfoil_display) as display:
+        for n in range(len(coordinates)):
+            file_direct = os.path.join(work_dir,'sample_' + str(n))
+            os.makedirs(file_direct)
+
+            # Selig format, from the trailing edge along the upper surface
+            with open(os.path.join(file_direct,'airfoil.dat'), 'w') as f:
+                f.write('sample\n')
+                for x, y in coordinates[n].T[::-1]:
+                    f.write(f'{x:.8f} {y:.8f}\n')
+            with open(os.path.join(file_direct,'xfoil_commands.txt'), 'w') as f:
+                f.write(commands)
+
+            launch_Xfoil('xfoil_commands.txt',file_direct,display)
+
+            for (i,j), (Alt, Mach, output_polar) in zip(pairs,conditions):
+                output_file = os.path.join(file_direct,output_polar)
+                if os.path.exists(output_file):
+                    Cl[n,i,j], Cd[n,i,j], Cm[n,i,j], converged[n,i,j] = read_polar(output_file,AoA)
+
+            shutil.rmtree(file_direct)
+
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+
+    return Cl, Cd, Cm, converged
+
+
+
+def write_manifest(Dataset,Solver,Freestream,Geometry,spec):
+
+    ''' Writes dataset.json, or checks it against the settings when resuming
+
+        Inputs:
+            Dataset, Solver, Freestream, Geometry - see generate_airfoil_dataset
+            spec        - sampled parameters (see parameter_bounds)
+
+        Outputs:
+
+        Assumptions:
+            Dataset.workers may change between runs, all other settings may not
+
+    '''
+
+    template = Geometry.Segments['section_1'].Airfoil[Dataset.parametrization]
+
+    manifest = {
+        "parametrization" : Dataset.parametrization,
+        "template"        : {key: np.asarray(value).tolist() for key, value in template.items()},
+        "parameters"      : spec.names,
+        "lower"           : spec.lower.tolist(),
+        "upper"           : spec.upper.tolist(),
+        "sampling"        : Dataset.sampling,
+        "n_samples"       : int(Dataset.n_samples),
+        "shard_size"      : int(Dataset.shard_size),
+        "seed"            : int(Dataset.seed),
+        "min_thickness"   : float(Dataset.min_thickness),
+        "solver"          : Solver.name,
+        "axes"            : [["Altitude",        np.asarray(Freestream.Altitude).tolist()],
+                             ["Mach",            np.asarray(Freestream.Mach).tolist()],
+                             ["Angle_of_attack", np.asarray(Freestream.Angle_of_attack).tolist()]]
+    }
+    manifest = json.loads(json.dumps(manifest))
+
+    manifest_file = os.path.join(Dataset.directory,'dataset.json')
+    if os.path.exists(manifest_file):
+        with open(manifest_file, 'r') as f:
+            if json.load(f) != manifest:
+                raise Exception(Dataset.directory + ' holds a dataset generated with different settings')
+        return
+
+    with open(manifest_file + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(manifest_file + '.tmp', manifest_file)
+
+
+    return
+
+
+
+def shard_filename(directory,shard):
+
+    ''' Returns the file of shard number shard '''
+
+
+    return os.path.join(directory, 'shard_' + str(shard).zfill(6) + '.npz')
+
+
+
+def read_airfoil_dataset(directory):
+
+    ''' Reads a dataset shard by shard, also while it is being generated
+
+        Inputs:
+            directory   - dataset directory
+
+        Outputs:
+            one Data per completed shard, in shard order, with the shard arrays
+            (see run_shard) and
+                .parameter_names    - names of the parameter columns
+                .axes               - Altitude, Mach, and Angle_of_attack values
+
+        Assumptions:
+            Only one shard is held in memory at a time
+
+    '''
+
+    with open(os.path.join(directory,'dataset.json'), 'r') as f:
+        manifest = json.load(f)
+
+    axes = Data()
+    for name, values in manifest["axes"]:
+        axes[name] = np.array(values)
+
+    shards = sorted(filename for filename in os.listdir(directory) if filename.startswith('shard_') and filename.endswith('.npz'))
+    for filename in shards:
+        shard = Data()
+        with np.load(os.path.join(directory,filename)) as f:
+            for name in f.files:
+                shard[name] = f[name]
+        shard.parameter_names = manifest["parameters"]
+        shard.axes            = axes
+        yield shard
+
+
+    return
@@ -9,4 +9,5 @@ from .glyph_updater_flapped	import update_glyph_script_fl
 from .mesh_pre_process_2D	import mesh_pre_process_2D
 from .mesh_pre_process_3D	import WingMeshPreProcess
 from .miscellaneous_meshing import *
+from .mesh_conversion       import convert_mesh, read_su2_mesh, write_cgns_mesh, read_cgns_mesh
 
@@ -0,0 +1,386 @@
+# mesh_conversion.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    One-time conversion of ASCII SU2 meshes to the binary CGNS format
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+import json
+import time
+import itertools
+import numpy as np
+
+from Core.Data                           import Data
+from Methods.Solver.miscellaneous_solver import file_digest
+
+
+# Number of nodes and CGNS element type of the SU2 (VTK) element types
+SU2_ELEMENTS = {
+    3  : (2, 3),            # Line          - BAR_2
+    5  : (3, 5),            # Triangle      - TRI_3
+    9  : (4, 7),            # Quadrilateral - QUAD_4
+    10 : (4, 10),           # Tetrahedron   - TETRA_4
+    12 : (8, 17),           # Hexahedron    - HEXA_8
+    13 : (6, 14),           # Prism         - PENTA_6
+    14 : (5, 12),           # Pyramid       - PYRA_5
+}
+CGNS_MIXED = 20
+
+# Lines of a point or element block of an SU2 mesh parsed at a time
+CHUNK_LINES = 100000
+
+
+
+def convert_mesh(working_dir,Mesh):
+
+    ''' Converts the SU2 mesh of the sweep to CGNS once and points the sweep at it
+
+        Inputs:
+            working_dir     - directory of the mesh file
+            Mesh.filename   - ASCII SU2 mesh file name
+
+
+        Outputs:
+            Mesh.filename   - binary mesh file name
+                .metadata   - conversion record: source file and digest, mesh sizes,
+                              file sizes, and the Python parse times of both files
+
+
+        Assumptions:
+            1. The conversion is skipped if the binary file was written from a
+               source mesh with the same digest. The record is kept next to the
+               binary mesh as <mesh>.json
+            2. Parse times are those of the Python readers of this module. They
+               compare the two formats but are not the mesh loading times of SU2
+
+    '''
+
+    source = Mesh.filename
+    if os.path.splitext(source)[1].lower() == '.cgns':
+        return Mesh
+
+    target   = os.path.splitext(source)[0] + '.cgns'
+    record   = os.path.join(working_dir, target + '.json')
+    digest   = file_digest(os.path.join(working_dir, source))
+
+    metadata = None
+    if os.path.exists(record) and os.path.exists(os.path.join(working_dir, target)):
+        with open(record, 'r') as f:
+            metadata = json.load(f)
+        if metadata.get("source_digest") != digest:
+            metadata = None
+
+    if metadata is None:
+        print('Converting mesh ' + source + ' to ' + target)
+
+        start = time.perf_counter()
+        mesh  = read_su2_mesh(os.path.join(working_dir, source))
+        ascii_parse = time.perf_counter() - start
+
+        write_cgns_mesh(mesh, os.path.join(working_dir, target))
+
+        start = time.perf_counter()
+        read_cgns_mesh(os.path.join(working_dir, target))
+        binary_parse = time.perf_counter() - start
+
+        metadata = {"source"          : source,
+                    "source_digest"   : digest,
+                    "format"          : 'CGNS',
+                    "dimension"       : mesh.dimension,
+                    "points"          : int(mesh.points.shape[0]),
+                    "elements"        : int(sum(len(nodes) for nodes in mesh.elements.values())),
+                    "markers"         : list(mesh.markers.keys()),
+                    "ascii_size"      : os.path.getsize(os.path.join(working_dir, source)),
+                    "binary_size"     : os.path.getsize(os.path.join(working_dir, target)),
+                    "ascii_parse_time" : ascii_parse,
+                    "binary_parse_time": binary_parse,
+                    "converted"       : time.strftime('%Y-%m-%d %H:%M:%S')}
+
+        with open(record, 'w') as f:
+            json.dump(metadata, f, indent=1)
+
+    print('Mesh ' + target + ': ' + str("{:.1f}".format(metadata["binary_size"]/1e6)) + ' MB instead of ' + \
+          str("{:.1f}".format(metadata["ascii_size"]/1e6)) + ' MB, parsed in Python in ' + \
+          str("{:.2f}".format(metadata["binary_parse_time"])) + ' s instead of ' + \
+          str("{:.2f}".format(metadata["ascii_parse_time"])) + ' s')
+
+    Mesh.filename = target
+    Mesh.metadata = metadata
+
+
+    return Mesh
+
+
+
+def read_su2_mesh(filename):
+
+    ''' Reads a single-zone ASCII SU2 mesh
+
+        Inputs:
+            filename        - .su2 mesh file
+
+
+        Outputs:
+            mesh.dimension  - 2 or 3
+                .points     - [n_points, dimension] coordinates
+                .elements   - SU2 element type -> [n_elements, n_nodes] 0-based connectivity
+                .markers    - marker name -> dictionary of SU2 element type -> connectivity
+
+
+        Assumptions:
+            1. Element lines may end with an element index, point lines with a point index
+            2. The point and element blocks are parsed into arrays CHUNK_LINES lines at a
+               time, so only one chunk of the file is held as text. The blocks have
+               exactly the number of lines given by their count
+
+    '''
+
+    mesh         = Data()
+    mesh.markers = {}
+
+    with open(filename, 'r') as f:
+        for line in f:
+            key, _, value = line.split('%')[0].partition('=')
+            key   = key.strip().upper()
+            value = value.split()
+
+            if key == 'NZONE' and int(value[0]) > 1:
+                raise Exception('Multi-zone SU2 meshes are not supported: ' + filename)
+            elif key == 'NDIME':
+                mesh.dimension = int(value[0])
+            elif key == 'NELEM':
+                mesh.elements = parse_elements(f,int(value[0]))
+            elif key == 'NPOIN':
+                mesh.points = parse_points(f,int(value[0]),mesh.dimension)
+            elif key == 'MARKER_TAG':
+                tag = value[0]
+            elif key == 'MARKER_ELEMS':
+                mesh.markers[tag] = parse_elements(f,int(value[0]))
+
+
+    return mesh
+
+
+
+def parse_points(f,count,dimension):
+
+    ''' Parses the next count point lines of an SU2 mesh file into a coordinate array '''
+
+    points = np.empty((count, dimension))
+    for start in range(0, count, CHUNK_LINES):
+        rows = min(CHUNK_LINES, count - start)
+        points[start:start+rows] = np.loadtxt(itertools.islice(f, rows), usecols=range(dimension), ndmin=2)
+
+
+    return points
+
+
+
+def parse_elements(f,count):
+
+    ''' Parses the next count element lines of an SU2 mesh file into connectivity arrays per element type '''
+
+    chunks = {}
+    for start in range(0, count, CHUNK_LINES):
+        grouped = {}
+        for line in itertools.islice(f, min(CHUNK_LINES, count - start)):
+            grouped.setdefault(int(line.split(None, 1)[0]), []).append(line)
+
+        for element_type, lines in grouped.items():
+            if element_type not in SU2_ELEMENTS:
+                raise Exception('Unknown SU2 element type ' + str(element_type))
+            n_nodes = SU2_ELEMENTS[element_type][0]
+            chunks.setdefault(element_type, []).append(np.loadtxt(lines, dtype=np.int64, usecols=range(1, 1+n_nodes), ndmin=2))
+
+    elements = {element_type: np.concatenate(arrays) for element_type, arrays in chunks.items()}
+
+
+    return elements
+
+
+
+def write_cgns_mesh(mesh,filename):
+
+    ''' Writes a mesh read by read_su2_mesh to a CGNS/HDF5 file
+
+        Inputs:
+            mesh            - see read_su2_mesh
+            filename        - .cgns output file
+
+
+        Outputs:
+
+
+        Assumptions:
+            1. The file follows CGNS 3.4 with the mesh as one unstructured zone.
+               Interior elements are written with one section per element type,
+               every marker as a section named after the marker, which SU2 reads
+               as its boundary markers
+            2. The node ordering of the SU2 file is kept. SU2 checks the
+               element orientation when it loads the mesh
+
+    '''
+
+    import h5py
+
+    n_points = mesh.points.shape[0]
+    n_cells  = int(sum(len(nodes) for nodes in mesh.elements.values()))
+    n_total  = n_cells + int(sum(len(nodes) for marker in mesh.markers.values() for nodes in marker.values()))
+    if max(n_points, n_total) < 2**31 - 1:
+        index_type = ('I4', np.int32)
+    else:
+        index_type = ('I8', np.int64)
+
+    with h5py.File(filename, 'w', track_order=True) as f:
+        set_node_attributes(f, 'HDF5 MotherNode', 'Root Node of HDF5 File', 'MT')
+        f.create_dataset(' format', data=string_data('IEEE_LITTLE_32', 15))
+        f.create_dataset(' hdf5version', data=string_data('HDF5 Version ' + h5py.version.hdf5_version, 33))
+        create_node(f, 'CGNSLibraryVersion', 'CGNSLibraryVersion_t', 'R4', np.array([3.4], dtype=np.float32))
+
+        base = create_node(f, 'Base', 'CGNSBase_t', 'I4', np.array([mesh.dimension, mesh.dimension], dtype=np.int32))
+        zone = create_node(base, 'Zone', 'Zone_t', index_type[0],
+                           np.array([[n_points, n_cells, 0]], dtype=index_type[1]))
+        create_node(zone, 'ZoneType', 'ZoneType_t', 'C1', string_data('Unstructured'))
+
+        coordinates = create_node(zone, 'GridCoordinates', 'GridCoordinates_t', 'MT')
+        for d, name in enumerate(['CoordinateX', 'CoordinateY', 'CoordinateZ'][:mesh.dimension]):
+            create_node(coordinates, name, 'DataArray_t', 'R8', np.ascontiguousarray(mesh.points[:,d]))
+
+        start = 1
+        for element_type, nodes in mesh.elements.items():
+            name  = 'Elements_' + str(SU2_ELEMENTS[element_type][1])
+            start = write_section(zone, name, {element_type: nodes}, start, index_type)
+        for tag, elements in mesh.markers.items():
+            start = write_section(zone, tag, elements, start, index_type)
+
+
+    return
+
+
+
+def write_section(zone,name,elements,start,index_type):
+
+    ''' Writes an Elements_t section and returns the index of the next element '''
+
+    if len(name) > 32:
+        raise Exception('CGNS section names are limited to 32 characters: ' + name)
+
+    count = int(sum(len(nodes) for nodes in elements.values()))
+    if len(elements) == 1:
+        element_type, nodes = list(elements.items())[0]
+        cgns_type    = SU2_ELEMENTS[element_type][1]
+        connectivity = (nodes + 1).ravel()
+    else:
+        # Sections with several element types list the type before the nodes of every element
+        cgns_type    = CGNS_MIXED
+        connectivity = np.concatenate([np.column_stack((np.full(len(nodes), SU2_ELEMENTS[element_type][1]), nodes + 1)).ravel()
+                                       for element_type, nodes in elements.items()])
+
+    section = create_node(zone, name, 'Elements_t', 'I4', np.array([cgns_type, 0], dtype=np.int32))
+    create_node(section, 'ElementRange', 'IndexRange_t', index_type[0],
+                np.array([start, start + count - 1], dtype=index_type[1]))
+    create_node(section, 'ElementConnectivity', 'DataArray_t', index_type[0], connectivity.astype(index_type[1]))
+
+
+    return start + count
+
+
+
+def create_node(parent,name,label,data_type,data=None):
+
+    ''' Creates a CGNS node: an HDF5 group with the CGNS attributes and its data
+
+        Inputs:
+            parent      - parent group
+            name        - node name
+            label       - SIDS label, e.g. 'Zone_t'
+            data_type   - 'MT', 'C1', 'I4', 'I8', 'R4', or 'R8'
+            data        - node data in C order, None for MT nodes
+
+
+        Outputs:
+            node        - HDF5 group
+
+
+        Assumptions:
+            Arrays are stored with reversed dimensions, following the Fortran
+            ordering of CGNS
+
+    '''
+
+    node = parent.create_group(name, track_order=True)
+    set_node_attributes(node, name, label, data_type)
+    if data is not None:
+        node.create_dataset(' data', data=np.asarray(data).T)
+
+
+    return node
+
+
+
+def set_node_attributes(node,name,label,data_type):
+
+    ''' Sets the name, label, type, and flags attributes of a CGNS node '''
+
+    node.attrs.create('name',  np.bytes_(name.encode('ascii')),      dtype='S33')
+    node.attrs.create('label', np.bytes_(label.encode('ascii')),     dtype='S33')
+    node.attrs.create('type',  np.bytes_(data_type.encode('ascii')), dtype='S3')
+    node.attrs.create('flags', np.array([1], dtype=np.int32))
+
+    return
+
+
+
+def string_data(text,length=None):
+
+    ''' Returns a string as the int8 character array CGNS stores '''
+
+    data = np.frombuffer(text.encode('ascii'), dtype=np.int8)
+    if length is not None:
+        data = np.concatenate((data, np.zeros(length - len(data), dtype=np.int8)))
+
+
+    return data
+
+
+
+def read_cgns_mesh(filename):
+
+    ''' Reads the coordinates and element sections of a CGNS mesh written by write_cgns_mesh
+
+        Inputs:
+            filename        - .cgns file
+
+
+        Outputs:
+            mesh.points     - [n_points, dimension] coordinates
+                .sections   - section name -> (CGNS element type, 1-based connectivity)
+
+
+        Assumptions:
+
+    '''
+
+    import h5py
+
+    mesh          = Data()
+    mesh.sections = {}
+
+    with h5py.File(filename, 'r') as f:
+        zone        = f['Base']['Zone']
+        coordinates = [zone['GridCoordinates'][name][' data'][()] for name in ('CoordinateX', 'CoordinateY', 'CoordinateZ')
+                       if name in zone['GridCoordinates']]
+        mesh.points = np.column_stack(coordinates)
+        for name, node in zone.items():
+            if node.attrs.get('label') == b'Elements_t':
+                mesh.sections[name] = (int(node[' data'][0]), node['ElementConnectivity'][' data'][()])
+
+
+    return mesh
@@ -5,4 +5,21 @@
 
 from .run_SU2   import *
 from .run_Xfoil import *
+from .run_Panel import *
+from .run_VLM   import *
+from .run_multi_fidelity import *
+from .case_scheduler       import CaseScheduler
+from .execution_backend    import execution_backend, LocalBackend, BatchBackend, WorkQueueBackend, run_worker
+from .miscellaneous_solver import *
+from .sweep_journal        import SweepJournal
+from .result_cache         import ResultCache
+from .convergence_monitor  import ConvergenceMonitor
+from .resource_sampler     import ResourceSampler
+from .su2_log              import read_log
+from .su2_config           import SU2ConfigTemplate
+from .su2_driver           import SU2Driver
+from .restart_index        import RestartIndex
+from .display_server       import DisplayServer
+from .result_store         import ResultStore, read_result_store, export_workbook
+from .sweep_result         import SweepResult
 
@@ -0,0 +1,225 @@
+# case_scheduler.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Runs sweep cases concurrently within a global core budget while
+    respecting dependencies between cases (e.g. warm-start chains)
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import threading
+import traceback
+
+from Core.Trace import span
+
+
+
+class CaseScheduler():
+
+    def __init__(self,core_budget,raise_on_failure=True):
+
+        ''' Initializes the scheduler
+
+            Inputs:
+                core_budget      - total number of cores that may be used at once
+                raise_on_failure - raise an exception once all cases have run if
+                                   any case failed. Otherwise the failed and skipped
+                                   cases are only reported
+
+            Outputs:
+
+            Assumptions:
+                A case that requests more cores than the budget runs alone
+
+        '''
+
+        self.core_budget = max(1,int(core_budget))
+        self.raise_on_failure = raise_on_failure
+        self.cases       = {}                       # key -> case definition, in insertion order
+        self.results     = {}                       # key -> value returned by the case function
+        self.failed      = {}                       # key -> formatted traceback
+        self.skipped     = []                       # cases not run because a dependency failed
+
+
+    def add_case(self,key,cores,function,depends_on=(),after=()):
+
+        ''' Adds a case to the schedule
+
+            Inputs:
+                key         - unique case identifier
+                cores       - number of cores the case occupies while running
+                              (0 for cases that do not launch a solver)
+                function    - callable without arguments that runs the case
+                depends_on  - keys of cases that must complete first
+                after       - keys of cases that must finish first, whether they
+                              complete, fail, or are skipped
+
+            Outputs:
+
+            Assumptions:
+                Cases are started in the order they are added once their
+                dependencies are complete and enough cores are free
+
+        '''
+
+        if key in self.cases:
+            raise Exception('Case ' + str(key) + ' is already scheduled')
+
+        self.cases[key] = {
+            "cores"      : min(max(0,int(cores)),self.core_budget),
+            "function"   : function,
+            "depends_on" : [dep for dep in depends_on if dep is not None],
+            "after"      : [dep for dep in after if dep is not None],
+        }
+
+        return
+
+
+    def run(self):
+
+        ''' Runs all cases and waits for them to complete
+
+            Inputs:
+
+            Outputs:
+                results - dictionary of case results
+
+            Assumptions:
+                If a case fails, its dependents are skipped, all other cases
+                still run, and an exception is raised at the end unless
+                raise_on_failure is False
+
+        '''
+
+        for key, case in self.cases.items():
+            for dep in case["depends_on"] + case["after"]:
+                if dep not in self.cases:
+                    raise Exception('Case ' + str(key) + ' depends on an unknown case ' + str(dep))
+
+        pending    = list(self.cases.keys())
+        running    = set()
+        done       = set()
+        free_cores = self.core_budget
+        condition  = threading.Condition()
+
+        def worker(key):
+            try:
+                with span('Case', case=str(key)):
+                    result = self.cases[key]["function"]()
+                error  = None
+            except Exception:
+                result = None
+                error  = traceback.format_exc()
+
+            with condition:
+                if error is None:
+                    self.results[key] = result
+                else:
+                    self.failed[key] = error
+                done.add(key)
+                running.discard(key)
+                condition.notify_all()
+
+        with condition:
+            while pending or running:
+
+                # Drop cases whose dependencies can no longer complete
+                dropped = True
+                while dropped:
+                    dropped = False
+                    for key in list(pending):
+                        deps = self.cases[key]["depends_on"]
+                        if any(dep in self.failed or dep in self.skipped for dep in deps):
+                            pending.remove(key)
+                            self.skipped.append(key)
+                            dropped = True
+
+                # Start every ready case that fits into the free cores
+                started = False
+                for key in list(pending):
+                    deps  = self.cases[key]["depends_on"]
+                    after = self.cases[key]["after"]
+                    cores = self.cases[key]["cores"]
+                    if all(dep in done and dep not in self.failed for dep in deps) and \
+                            all(dep in done or dep in self.skipped for dep in after) and cores <= free_cores:
+                        pending.remove(key)
+                        running.add(key)
+                        free_cores -= cores
+                        started     = True
+                        threading.Thread(target=worker, args=(key,), daemon=True).start()
+
+                if not started and (running or pending):
+                    if not running:
+                        raise Exception('Case schedule contains a dependency cycle')
+                    finished = set(done)
+                    condition.wait()
+                    for key in done - finished:
+                        free_cores += self.cases[key]["cores"]
+
+        if self.failed:
+            for key, error in self.failed.items():
+                print('Case ' + str(key) + ' failed:\n' + error)
+            if self.skipped:
+                print('Skipped cases with failed dependencies: ' + ', '.join(str(key) for key in self.skipped))
+            if self.raise_on_failure:
+                raise Exception(str(len(self.failed)) + ' sweep case(s) failed')
+            print(str(len(self.failed)) + ' sweep case(s) failed')
+
+
+        return self.results
+
+
+    def run_in_order(self,order):
+
+        ''' Runs all cases one at a time in the calling thread
+
+            Inputs:
+                order   - case keys in the order they are run
+
+            Outputs:
+                results - dictionary of case results
+
+            Assumptions:
+                1. Every case comes after its dependencies in the order
+                2. If a case fails, its dependents are skipped, all other cases
+                   still run, and an exception is raised at the end unless
+                   raise_on_failure is False
+
+        '''
+
+        if len(order) != len(self.cases) or set(order) != set(self.cases.keys()):
+            raise Exception('Case order does not match the scheduled cases')
+
+        done = set()
+        for key in order:
+            deps = self.cases[key]["depends_on"]
+            if any(dep in self.failed or dep in self.skipped for dep in deps):
+                self.skipped.append(key)
+                continue
+            if not all(dep in done for dep in deps) or \
+                    not all(dep in done or dep in self.skipped for dep in self.cases[key]["after"]):
+                raise Exception('Case ' + str(key) + ' is run before its dependencies')
+
+            try:
+                with span('Case', case=str(key)):
+                    self.results[key] = self.cases[key]["function"]()
+            except Exception:
+                self.failed[key] = traceback.format_exc()
+            done.add(key)
+
+        if self.failed:
+            for key, error in self.failed.items():
+                print('Case ' + str(key) + ' failed:\n' + error)
+            if self.skipped:
+                print('Skipped cases with failed dependencies: ' + ', '.join(str(key) for key in self.skipped))
+            if self.raise_on_failure:
+                raise Exception(str(len(self.failed)) + ' sweep case(s) failed')
+            print(str(len(self.failed)) + ' sweep case(s) failed')
+
+
+        return self.results
@@ -0,0 +1,270 @@
+# convergence_monitor.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Follows the SU2 convergence history while the solver runs and stops the
+    solver once the coefficients have converged or the solution diverged
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+import math
+import time
+import subprocess
+from collections import deque
+
+from Core.Data import Data
+from Methods.Solver.execution_backend import LocalBackend
+
+
+
+class ConvergenceMonitor():
+
+    def __init__(self,settings):
+
+        ''' Initializes the monitor
+
+            Inputs:
+                settings["history_file"]        - SU2 history file name in the case directory
+                        ["coefficients"]        - coefficients checked by the Cauchy criterion
+                        ["window"]              - number of iterations of the Cauchy window
+                        ["cauchy_eps"]          - maximum relative spread of the coefficients in the window
+                        ["cauchy_floor"]        - smallest coefficient magnitude the spread is taken
+                                                  relative to, so coefficients near zero are
+                                                  checked against cauchy_eps*cauchy_floor
+                        ["residual_drop"]       - residual drop from the first iteration [orders of magnitude]
+                        ["divergence_rise"]     - residual rise above the first iteration [orders of magnitude]
+                        ["min_iterations"]      - iterations before any criterion is applied
+                        ["poll_interval"]       - time between history file reads [s]
+
+            Outputs:
+
+            Assumptions:
+                Residuals in the history file are log10 values (SU2 rms[...] fields)
+
+        '''
+
+        self.history_file    = settings.get("history_file", 'history.csv')
+        self.coefficients    = settings.get("coefficients", ['CL', 'CD', 'CM'])
+        self.window          = settings.get("window", 100)
+        self.cauchy_eps      = settings.get("cauchy_eps", 1e-5)
+        self.cauchy_floor    = settings.get("cauchy_floor", 1e-3)
+        self.residual_drop   = settings.get("residual_drop", 6.0)
+        self.divergence_rise = settings.get("divergence_rise", 3.0)
+        self.min_iterations  = settings.get("min_iterations", 200)
+        self.poll_interval   = settings.get("poll_interval", 2.0)
+
+
+    def run(self,command,file_direct,output_file,backend=None,cores=1,sampler=None):
+
+        ''' Runs the solver and stops it once a criterion is met
+
+            Inputs:
+                command     - solver command line
+                file_direct - case directory
+                output_file - solver log file name in the case directory
+                backend     - execution backend, None to run the solver as a local process
+                cores       - cores of the solver run
+                sampler     - ResourceSampler of the run (optional)
+
+            Outputs:
+                status.stop_reason  - why the solver stopped
+                      .stopped      - True if the monitor stopped the solver
+                      .iterations   - last iteration in the history file
+                      .CL, CD, CM   - coefficients of the last iteration
+                      .residual     - residual of the last iteration
+
+            Assumptions:
+                The solver writes a new history row every iteration
+
+        '''
+
+        history = HistoryReader(os.path.join(file_direct,self.history_file), self.window)
+        status  = Data()
+        status.stopped     = False
+        status.stop_reason = 'solver exit'
+
+        if backend is None:
+            backend = LocalBackend()
+        process = backend.submit(command,file_direct,output_file,cores)
+        if sampler is not None:
+            sampler.start(process)
+
+        while process.poll() is None:
+            time.sleep(self.poll_interval)
+            history.update()
+            reason = self.check(history)
+            if reason is not None:
+                status.stopped     = True
+                status.stop_reason = reason
+                process.terminate()
+                try:
+                    process.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
+                break
+
+        if sampler is not None:
+            sampler.stop()
+
+        history.update()
+        status.iterations = history.iteration
+        status.residual   = history.residual
+        for name in ['CL', 'CD', 'CM']:
+            if len(history.rows) > 0 and name in history.rows[-1]:
+                status[name] = history.rows[-1][name]
+            else:
+                status[name] = float('nan')
+
+
+        return status
+
+
+    def check(self,history):
+
+        ''' Applies the stopping criteria to the history read so far
+
+            Inputs:
+                history     - HistoryReader of the running case
+
+            Outputs:
+                reason      - stop reason, None to continue
+
+            Assumptions:
+                The Cauchy spread of a coefficient is relative to its mean, but at
+                least to cauchy_floor, since CL and CM of symmetric airfoils at zero
+                angle-of-attack stay near zero
+
+        '''
+
+        if len(history.rows) == 0:
+            return None
+
+        last = history.rows[-1]
+
+        # Divergence
+        for name, value in last.items():
+            if math.isnan(value) or math.isinf(value):
+                return 'diverged: ' + name + ' is not finite'
+        if history.residual is not None and history.residual > history.residual_start + self.divergence_rise:
+            return 'diverged: residual rise of ' + str("{:.1f}".format(history.residual - history.residual_start)) + ' orders'
+
+        if history.iteration < self.min_iterations:
+            return None
+
+        # Residual drop
+        if history.residual is not None and history.residual_start - history.residual >= self.residual_drop:
+            return 'converged: residual drop of ' + str("{:.1f}".format(history.residual_start - history.residual)) + ' orders'
+
+        # Windowed Cauchy criterion on the coefficients
+        if len(history.rows) >= self.window:
+            for name in self.coefficients:
+                values = [row[name] for row in history.rows if name in row]
+                if len(values) < self.window:
+                    return None
+                scale = max(abs(sum(values)/len(values)), self.cauchy_floor)
+                if (max(values) - min(values))/scale > self.cauchy_eps:
+                    return None
+            return 'converged: Cauchy criterion on ' + ', '.join(self.coefficients) + ' over ' + str(self.window) + ' iterations'
+
+
+        return None
+
+
+
+class HistoryReader():
+
+    def __init__(self,filename,window):
+
+        ''' Reads an SU2 history file incrementally while it is written
+
+            Inputs:
+                filename    - history file (CSV)
+                window      - number of last rows kept in memory
+
+            Outputs:
+
+            Assumptions:
+                The moment coefficient is taken from CMz, CMy, or CMx, in this order
+
+        '''
+
+        self.filename       = filename
+        self.offset         = 0
+        self.columns        = None
+        self.rows           = deque(maxlen=window)
+        self.iteration      = 0
+        self.residual       = None
+        self.residual_start = None
+        self.residuals      = {}                # Last values of all rms[...] columns
+        self.count          = 0                 # Number of rows read
+
+
+    def update(self):
+
+        ''' Reads the rows appended since the last call '''
+
+        if not os.path.exists(self.filename):
+            return
+
+        with open(self.filename, 'r') as f:
+            f.seek(self.offset)
+            while True:
+                line = f.readline()
+                if not line.endswith('\n'):
+                    break
+                self.offset = f.tell()
+                self.parse_line(line)
+
+        return
+
+
+    def parse_line(self,line):
+
+        ''' Parses one line of the history file '''
+
+        fields = [field.strip().strip('"').strip() for field in line.split(',')]
+
+        if self.columns is None:
+            self.columns = fields
+            return
+
+        try:
+            values = [float(field) for field in fields]
+        except ValueError:
+            return
+
+        record = dict(zip(self.columns, values))
+        row    = {}
+        for name in ['CL', 'CD']:
+            if name in record:
+                row[name] = record[name]
+        for name in ['CMz', 'CMy', 'CMx']:
+            if name in record:
+                row['CM'] = record[name]
+                break
+
+        residuals = [name for name in self.columns if name.startswith('rms[')]
+        if len(residuals) > 0:
+            row['residual'] = record[residuals[0]]
+            self.residual   = record[residuals[0]]
+            if self.residual_start is None:
+                self.residual_start = self.residual
+        for name in residuals:
+            self.residuals[name] = record[name]
+
+        for name in ['Inner_Iter', 'Outer_Iter', 'Time_Iter']:
+            if name in record:
+                self.iteration = int(record[name])
+                break
+
+        self.rows.append(row)
+        self.count += 1
+
+        return
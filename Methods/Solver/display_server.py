@@ -0,0 +1,134 @@
+# display_server.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Headless X display used by the Xfoil sessions of a sweep
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+import subprocess
+
+
+
+class DisplayServer():
+
+    def __init__(self,mode='xvfb-run'):
+
+        ''' Initializes the display server
+
+            Inputs:
+                mode    - 'xvfb-run' - every Xfoil run starts its own Xvfb through xvfb-run
+                          'shared'   - one Xvfb is started for the sweep and shared by all runs
+                          'none'     - no X server, Xfoil graphics are switched off
+
+            Outputs:
+
+            Assumptions:
+
+        '''
+
+        if mode not in ('xvfb-run', 'shared', 'none'):
+            raise Exception('Unknown Xfoil display mode ' + str(mode))
+
+        self.mode    = mode
+        self.process = None
+        self.display = None
+
+
+    def start(self):
+
+        ''' Starts the shared Xvfb server
+
+            Inputs:
+
+            Outputs:
+
+            Assumptions:
+                Xvfb picks a free display number and reports it through -displayfd
+
+        '''
+
+        if self.mode != 'shared' or self.process is not None:
+            return
+
+        read_fd, write_fd = os.pipe()
+        try:
+            self.process = subprocess.Popen(['Xvfb', '-displayfd', str(write_fd), '-screen', '0', '1024x768x16', '-nolisten', 'tcp'],
+                                            pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            os.close(write_fd)
+            write_fd = None
+            with os.fdopen(read_fd, 'r') as f:
+                read_fd = None
+                number  = f.readline().strip()
+        finally:
+            for fd in (read_fd, write_fd):
+                if fd is not None:
+                    os.close(fd)
+
+        if number == '':
+            self.stop()
+            raise Exception('Xvfb did not start')
+
+        self.display = ':' + number
+
+        return
+
+
+    def stop(self):
+
+        ''' Stops the shared Xvfb server '''
+
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+            self.display = None
+
+        return
+
+
+    def command(self,command):
+
+        ''' Returns the command line and the environment of a run on this display
+
+            Inputs:
+                command     - command line of the run
+
+            Outputs:
+                command     - command line including the display wrapper
+                env         - environment of the run, None to inherit it
+
+            Assumptions:
+
+        '''
+
+        if self.mode == 'xvfb-run':
+            return ['xvfb-run', '-a'] + list(command), None
+
+        if self.mode == 'shared':
+            env            = dict(os.environ)
+            env['DISPLAY'] = self.display
+            return list(command), env
+
+
+        return list(command), None
+
+
+    def __enter__(self):
+        self.start()
+        return self
+
+
+    def __exit__(self,*args):
+        self.stop()
+        return False
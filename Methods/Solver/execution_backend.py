@@ -0,0 +1,866 @@
+# execution_backend.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Execution backends of the solver runs: local processes, jobs of a batch
+    scheduler, or a work queue on a shared file system drained by workers on
+    several nodes
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+import sys
+import json
+import time
+import uuid
+import shlex
+import socket
+import subprocess
+
+
+# Environment variable that overrides Solver.execution_backend
+BACKEND_VARIABLE = 'PYAEROSWEEP_BACKEND'
+
+
+
+def execution_backend(name,settings,working_dir):
+
+    ''' Creates the execution backend of a sweep
+
+        Inputs:
+            name            - 'local', 'batch', or 'work_queue'
+            settings        - dictionary of backend name -> backend settings
+            working_dir     - sweep working directory
+
+
+        Outputs:
+            backend         - backend with submit(command, file_direct, output_file,
+                              cores, stdin_file, env) and max_cores
+
+
+        Assumptions:
+            The PYAEROSWEEP_BACKEND environment variable, if set, replaces the name,
+            so a sweep can be moved to other machines without editing its input file
+
+    '''
+
+    name = os.environ.get(BACKEND_VARIABLE, name)
+
+    if name == 'local':
+        backend = LocalBackend()
+    elif name == 'batch':
+        backend = BatchBackend(settings.get("batch", {}))
+    elif name == 'work_queue':
+        backend = WorkQueueBackend(settings.get("work_queue", {}),working_dir)
+    else:
+        raise Exception('Unknown execution backend ' + str(name))
+
+
+    return backend
+
+
+
+class LocalJob():
+
+    def __init__(self,command,file_direct,output_file,stdin_file=None,env=None):
+
+        ''' Starts a solver run as a child process
+
+            Inputs:
+                command     - solver command line
+                file_direct - case directory the solver runs in
+                output_file - log file name in the case directory
+                stdin_file  - file in the case directory passed as the standard input (optional)
+                env         - environment of the process, None for that of this process
+
+            Outputs:
+
+            Assumptions:
+                Without a stdin_file the solver gets an empty pipe as its standard input
+
+        '''
+
+        self.output = open(os.path.join(file_direct,output_file), 'w')
+        if stdin_file is None:
+            self.input = None
+            stdin      = subprocess.PIPE
+        else:
+            self.input = open(os.path.join(file_direct,stdin_file), 'r')
+            stdin      = self.input
+
+        self.process = subprocess.Popen(command, stdout= self.output, stderr= None, stdin=stdin, cwd=file_direct, env=env)
+        self.pid     = self.process.pid
+        self.on_exit = None                     # Function called once the run exited, before it is reaped
+
+
+    def poll(self):
+
+        ''' Returns the exit code of the run, None while it is running '''
+
+        if self.on_exit is not None and self._exited(0):
+            self._report_exit()
+        code = self.process.poll()
+        if code is not None:
+            self._close()
+
+        return code
+
+
+    def wait(self,timeout=None):
+
+        ''' Waits for the run to end and returns its exit code
+
+            Raises subprocess.TimeoutExpired if the run does not end within the timeout [s]
+        '''
+
+        if self.on_exit is not None and self._exited(timeout):
+            self._report_exit()
+        code = self.process.wait(timeout=timeout)
+        self._close()
+
+        return code
+
+
+    def terminate(self):
+
+        ''' Asks the solver to stop '''
+
+        self.process.terminate()
+
+        return
+
+
+    def kill(self):
+
+        ''' Stops the solver immediately '''
+
+        self.process.kill()
+
+        return
+
+
+    def _exited(self,timeout=None):
+
+        ''' Waits until the run exited without reaping it
+
+            Inputs:
+                timeout     - longest wait [s], None to wait until the run exits
+
+            Outputs:
+                True once the run exited, False on timeout or where os.waitid is not available
+
+            Assumptions:
+                The exited process stays a zombie, so its totals can still be read
+
+        '''
+
+        if not hasattr(os, 'waitid') or self.process.returncode is not None:
+            return False
+
+        end = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                if end is None:
+                    os.waitid(os.P_PID, self.pid, os.WEXITED | os.WNOWAIT)
+                    return True
+                if os.waitid(os.P_PID, self.pid, os.WEXITED | os.WNOWAIT | os.WNOHANG) is not None:
+                    return True
+            except ChildProcessError:
+                return False
+            if time.monotonic() >= end:
+                return False
+            time.sleep(min(0.05, max(0.0, end - time.monotonic())))
+
+
+    def _report_exit(self):
+
+        ''' Calls on_exit once '''
+
+        on_exit      = self.on_exit
+        self.on_exit = None
+        on_exit()
+
+        return
+
+
+    def _close(self):
+
+        ''' Closes the log and input files of the run '''
+
+        self.output.close()
+        if self.input is not None:
+            self.input.close()
+
+        return
+
+
+
+class LocalBackend():
+
+    def __init__(self):
+
+        ''' Runs the solver as child processes of the sweep. The case scheduler
+            of the sweep keeps their number within the core budget
+
+            Inputs:
+
+            Outputs:
+
+            Assumptions:
+
+        '''
+
+        self.max_cores = None                   # The core budget of the solver settings applies
+
+
+    def submit(self,command,file_direct,output_file,cores=1,stdin_file=None,env=None):
+
+        ''' Starts a solver run, see LocalJob '''
+
+
+        return LocalJob(command,file_direct,output_file,stdin_file,env)
+
+
+
+class BatchJob():
+
+    def __init__(self,backend,job_id,command,exit_file):
+
+        ''' Follows a job of the batch scheduler
+
+            Inputs:
+                backend     - BatchBackend the job was submitted through
+                job_id      - scheduler job identifier
+                command     - solver command line
+                exit_file   - file the job script writes the exit code of the solver to
+
+            Outputs:
+
+            Assumptions:
+
+        '''
+
+        self.backend    = backend
+        self.job_id     = job_id
+        self.command    = command
+        self.exit_file  = exit_file
+        self.code       = None
+        self.last_check = 0.0
+        self.missing    = 0
+
+
+    def poll(self):
+
+        ''' Returns the exit code of the job, None while it is queued or running
+
+            Assumptions:
+                1. The scheduler queue is checked at most every poll_interval seconds
+                2. A job that left the queue without writing its exit code is
+                   reported as failed (exit code 1) after three checks, which
+                   allows for delays of the shared file system
+
+        '''
+
+        if self.code is not None:
+            return self.code
+
+        if os.path.exists(self.exit_file):
+            self.code = read_exit_code(self.exit_file)
+            return self.code
+
+        if time.time() - self.last_check < self.backend.poll_interval:
+            return None
+        self.last_check = time.time()
+
+        if self.backend.queued(self.job_id):
+            self.missing = 0
+            return None
+
+        self.missing += 1
+        if os.path.exists(self.exit_file):
+            self.code = read_exit_code(self.exit_file)
+        elif self.missing >= 3:
+            print('Batch job ' + self.job_id + ' left the queue without an exit code')
+            self.code = 1
+
+
+        return self.code
+
+
+    def wait(self,timeout=None):
+
+        ''' Waits for the job to end and returns its exit code
+
+            Raises subprocess.TimeoutExpired if the job does not end within the timeout [s]
+        '''
+
+        start = time.time()
+        while self.poll() is None:
+            if timeout is not None and time.time() - start > timeout:
+                raise subprocess.TimeoutExpired(self.command, timeout)
+            time.sleep(min(1.0, self.backend.poll_interval))
+
+        return self.code
+
+
+    def terminate(self):
+
+        ''' Cancels the job '''
+
+        self.backend.cancel(self.job_id)
+
+        return
+
+
+    def kill(self):
+
+        ''' Cancels the job '''
+
+        self.backend.cancel(self.job_id)
+
+        return
+
+
+
+class BatchBackend():
+
+    def __init__(self,settings):
+
+        ''' Runs the solver as jobs of a batch scheduler (Slurm by default)
+
+            Inputs:
+                settings["submit"]          - submit command, e.g. 'sbatch --account=abc'
+                        ["queue"]           - queue listing command
+                        ["cancel"]          - job cancel command
+                        ["directives"]      - scheduler options written into every
+                                              job script, e.g. ['--time=04:00:00']
+                        ["setup"]           - shell lines run before the solver,
+                                              e.g. ['module load su2']
+                        ["poll_interval"]   - time between queue checks of a job [s]
+                        ["max_cores"]       - cores of all jobs queued at once,
+                                              None for the core budget of the solver settings
+
+            Outputs:
+
+            Assumptions:
+                1. The submit command prints the job identifier first (sbatch --parsable)
+                2. The queue command lists the jobs given with -j without a header (-h)
+                   and no longer lists jobs that ended
+                3. The case directories are on a file system shared with the compute nodes
+
+        '''
+
+        self.submit_command = shlex.split(settings.get("submit", 'sbatch'))
+        self.queue_command  = shlex.split(settings.get("queue", 'squeue'))
+        self.cancel_command = shlex.split(settings.get("cancel", 'scancel'))
+        self.directives     = settings.get("directives", [])
+        self.setup          = settings.get("setup", [])
+        self.poll_interval  = settings.get("poll_interval", 10.0)
+        self.max_cores      = settings.get("max_cores")
+
+
+    def submit(self,command,file_direct,output_file,cores=1,stdin_file=None,env=None):
+
+        ''' Writes a job script into the case directory and submits it
+
+            Inputs:
+                see LocalJob, cores - tasks requested for the job
+
+            Outputs:
+                job         - BatchJob
+
+            Assumptions:
+                Environment variables of env that differ from this process are
+                exported in the job script
+
+        '''
+
+        file_direct = os.path.abspath(file_direct)
+        name        = os.path.splitext(output_file)[0]
+        script      = os.path.join(file_direct, name + '.job.sh')
+        exit_file   = os.path.join(file_direct, name + '.exit')
+        if os.path.exists(exit_file):
+            os.remove(exit_file)
+
+        if stdin_file is None:
+            stdin = '/dev/null'
+        else:
+            stdin = stdin_file
+
+        lines = ['#!/bin/bash',
+                 '#SBATCH --job-name=' + os.path.basename(file_direct),
+                 '#SBATCH --ntasks=' + str(max(1,int(cores))),
+                 '#SBATCH --output=' + name + '.job.log']
+        lines += ['#SBATCH ' + directive for directive in self.directives]
+        lines += ['', 'cd ' + shlex.quote(file_direct)]
+        lines += ['export ' + key + '=' + shlex.quote(value) for key, value in changed_environment(env).items()]
+        lines += self.setup
+        lines += [' '.join(shlex.quote(word) for word in command) + ' < ' + shlex.quote(stdin) + ' > ' + shlex.quote(output_file),
+                  'echo $? > ' + shlex.quote(exit_file + '.tmp'),
+                  'mv ' + shlex.quote(exit_file + '.tmp') + ' ' + shlex.quote(exit_file)]
+
+        with open(script, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+        output = subprocess.run(self.submit_command + ['--parsable', script], cwd=file_direct,
+                                capture_output=True, text=True, check=True).stdout
+        job_id = output.strip().split(';')[0]
+        print('Submitted batch job ' + job_id + ' for ' + os.path.basename(file_direct))
+
+
+        return BatchJob(self,job_id,command,exit_file)
+
+
+    def queued(self,job_id):
+
+        ''' Returns True while the scheduler lists the job '''
+
+        listing = subprocess.run(self.queue_command + ['-h', '-j', job_id, '-o', '%i'],
+                                 capture_output=True, text=True)
+        if listing.returncode != 0:
+            # Slurm rejects the identifiers of jobs that ended a while ago
+            return False
+
+
+        return job_id in listing.stdout.split()
+
+
+    def cancel(self,job_id):
+
+        ''' Cancels a job '''
+
+        subprocess.run(self.cancel_command + [job_id], capture_output=True)
+
+        return
+
+
+
+class WorkQueueJob():
+
+    def __init__(self,backend,job_id,command):
+
+        ''' Follows a job of the shared-filesystem work queue
+
+            Inputs:
+                backend     - WorkQueueBackend the job was submitted through
+                job_id      - job file name in the queue
+                command     - solver command line
+
+            Outputs:
+
+            Assumptions:
+
+        '''
+
+        self.backend = backend
+        self.job_id  = job_id
+        self.command = command
+        self.code    = None
+
+
+    def poll(self):
+
+        ''' Returns the exit code of the job, None while it is queued or running
+
+            Assumptions:
+                A running job whose worker did not renew its lease for stale_timeout
+                seconds is put back into the queue. If the worker is still alive, it
+                finds the job gone and stops its run
+
+        '''
+
+        if self.code is not None:
+            return self.code
+
+        queue_dir = self.backend.queue_dir
+        done_file = os.path.join(queue_dir,'done',self.job_id)
+        if os.path.exists(done_file):
+            with open(done_file, 'r') as f:
+                self.code = json.load(f)["returncode"]
+            os.remove(done_file)
+            return self.code
+
+        for worker in os.listdir(os.path.join(queue_dir,'running')):
+            running_file = os.path.join(queue_dir,'running',worker,self.job_id)
+            if not os.path.exists(running_file):
+                continue
+            try:
+                age = time.time() - os.path.getmtime(os.path.join(queue_dir,'workers',worker))
+            except OSError:
+                age = float('inf')
+            if age > self.backend.stale_timeout:
+                try:
+                    os.rename(running_file, os.path.join(queue_dir,'pending',self.job_id))
+                    print('Work queue job ' + self.job_id + ' was abandoned by worker ' + worker + ' and is queued again')
+                except OSError:
+                    pass
+            break
+
+
+        return None
+
+
+    def wait(self,timeout=None):
+
+        ''' Waits for the job to end and returns its exit code
+
+            Raises subprocess.TimeoutExpired if the job does not end within the timeout [s]
+        '''
+
+        start = time.time()
+        while self.poll() is None:
+            if timeout is not None and time.time() - start > timeout:
+                raise subprocess.TimeoutExpired(self.command, timeout)
+            time.sleep(self.backend.poll_interval)
+
+        return self.code
+
+
+    def terminate(self):
+
+        ''' Removes the job from the queue or asks its worker to stop the solver '''
+
+        self.backend.cancel(self.job_id,'terminate')
+
+        return
+
+
+    def kill(self):
+
+        ''' Removes the job from the queue or asks its worker to kill the solver '''
+
+        self.backend.cancel(self.job_id,'kill')
+
+        return
+
+
+
+class WorkQueueBackend():
+
+    def __init__(self,settings,working_dir):
+
+        ''' Runs the solver through a work queue on a shared file system. Workers
+            started on any number of nodes (see run_worker) take jobs from it
+
+            Inputs:
+                settings["queue_dir"]       - queue directory, None for working_dir/work_queue
+                        ["poll_interval"]   - time between checks of a job [s]
+                        ["stale_timeout"]   - time after which a running job without
+                                              updates from its worker is queued again [s]
+                        ["max_cores"]       - cores of all jobs queued at once,
+                                              None for the core budget of the solver settings
+                working_dir                 - sweep working directory
+
+            Outputs:
+
+            Assumptions:
+                1. The queue holds one JSON file per job in the pending, running,
+                   and done directories. A job moves between them by renaming its
+                   file, which only one worker can do for a pending job
+                2. Running jobs are kept in a directory per worker, running/<worker>.
+                   The worker renews its lease, workers/<worker>, at every poll
+                3. The case directories are on a file system shared with the workers
+
+        '''
+
+        queue_dir = settings.get("queue_dir")
+        if queue_dir is None:
+            queue_dir = os.path.join(working_dir,'work_queue')
+
+        self.queue_dir     = os.path.abspath(queue_dir)
+        self.poll_interval = settings.get("poll_interval", 1.0)
+        self.stale_timeout = settings.get("stale_timeout", 300.0)
+        self.max_cores     = settings.get("max_cores")
+
+        create_queue(self.queue_dir)
+
+
+    def submit(self,command,file_direct,output_file,cores=1,stdin_file=None,env=None):
+
+        ''' Adds a solver run to the queue
+
+            Inputs:
+                see LocalJob, cores - cores the job occupies on its worker
+
+            Outputs:
+                job         - WorkQueueJob
+
+            Assumptions:
+                Environment variables of env that differ from this process are
+                set by the worker
+
+        '''
+
+        # Job files are named by their submission time so workers take them in order
+        job_id = str(time.time_ns()) + '_' + uuid.uuid4().hex[:8] + '.json'
+        spec   = {"command"     : list(command),
+                  "file_direct" : os.path.abspath(file_direct),
+                  "output_file" : output_file,
+                  "stdin_file"  : stdin_file,
+                  "env"         : changed_environment(env),
+                  "cores"       : max(1,int(cores))}
+
+        temp_file = os.path.join(self.queue_dir, 'tmp', job_id)
+        with open(temp_file, 'w') as f:
+            json.dump(spec, f, indent=1)
+        os.rename(temp_file, os.path.join(self.queue_dir, 'pending', job_id))
+
+
+        return WorkQueueJob(self,job_id,command)
+
+
+    def cancel(self,job_id,signal):
+
+        ''' Removes a pending job or asks the worker of a running job to stop it '''
+
+        try:
+            os.remove(os.path.join(self.queue_dir,'pending',job_id))
+            write_done(self.queue_dir,job_id,-15)
+        except FileNotFoundError:
+            with open(os.path.join(self.queue_dir,'cancel',job_id), 'w') as f:
+                f.write(signal)
+
+        return
+
+
+
+def run_worker(queue_dir,cores=1,poll_interval=1.0,idle_timeout=None):
+
+    ''' Takes jobs from a work queue and runs them until the queue stays empty
+
+        Inputs:
+            queue_dir       - queue directory of a WorkQueueBackend
+            cores           - cores of this worker shared by its running jobs
+            poll_interval   - time between queue checks [s]
+            idle_timeout    - time without jobs after which the worker stops [s],
+                              None to run until it is interrupted
+
+
+        Outputs:
+
+
+        Assumptions:
+            1. Jobs that request more cores than the worker has run alone
+            2. The worker claims jobs into its own directory, running/<worker>, and
+               renews its lease file, workers/<worker>, every poll so that submitters
+               can tell abandoned jobs apart
+            3. A job that a submitter queued again after the lease went stale is
+               stopped and not reported, since another worker runs it
+
+    '''
+
+    create_queue(queue_dir)
+    host       = socket.gethostname()
+    worker     = host + '_' + str(os.getpid()) + '_' + uuid.uuid4().hex[:8]
+    worker_dir = os.path.join(queue_dir,'running',worker)
+    lease      = os.path.join(queue_dir,'workers',worker)
+    running    = {}                             # job id -> (LocalJob, cores)
+    free_cores = max(1,int(cores))
+    idle_since = time.time()
+
+    os.makedirs(worker_dir, exist_ok=True)
+    print('Worker ' + worker + ' takes jobs from ' + queue_dir)
+
+    while True:
+
+        # Renew the lease of the running jobs
+        with open(lease, 'w') as f:
+            f.write(str(len(running)))
+
+        # Collect finished jobs and forward cancel requests
+        for job_id, (job, job_cores) in list(running.items()):
+            job_file = os.path.join(worker_dir,job_id)
+            if not os.path.exists(job_file):
+                print('Worker ' + worker + ' lost job ' + job_id + ', which was queued again, and stops it')
+                stop_job(job)
+                free_cores += job_cores
+                del running[job_id]
+                continue
+
+            cancel_file = os.path.join(queue_dir,'cancel',job_id)
+            if os.path.exists(cancel_file):
+                with open(cancel_file, 'r') as f:
+                    signal = f.read().strip()
+                os.remove(cancel_file)
+                if signal == 'kill':
+                    job.kill()
+                else:
+                    job.terminate()
+
+            code = job.poll()
+            if code is None:
+                continue
+
+            free_cores += job_cores
+            del running[job_id]
+
+            # Removing the job file fails if the job was queued again meanwhile
+            try:
+                os.remove(job_file)
+            except FileNotFoundError:
+                print('Worker ' + worker + ' finished job ' + job_id + ' after it was queued again, the result is dropped')
+                continue
+            write_done(queue_dir,job_id,code,host)
+            print('Worker ' + worker + ' finished job ' + job_id + ' with exit code ' + str(code))
+
+        # Start queued jobs that fit into the free cores
+        while free_cores > 0:
+            claimed = claim_job(queue_dir,worker_dir,free_cores,len(running) == 0)
+            if claimed is None:
+                break
+            job_id, spec = claimed
+            job_cores    = min(spec["cores"], max(1,int(cores)))
+
+            env = None
+            if len(spec["env"]) > 0:
+                env = dict(os.environ)
+                env.update(spec["env"])
+            try:
+                job = LocalJob(spec["command"],spec["file_direct"],spec["output_file"],spec["stdin_file"],env)
+            except OSError as error:
+                print('Worker ' + worker + ' could not start job ' + job_id + ': ' + str(error))
+                try:
+                    os.remove(os.path.join(worker_dir,job_id))
+                except FileNotFoundError:
+                    continue
+                write_done(queue_dir,job_id,127,host)
+                continue
+
+            running[job_id] = (job, job_cores)
+            free_cores     -= job_cores
+            print('Worker ' + worker + ' started job ' + job_id + ' in ' + spec["file_direct"])
+
+        if len(running) > 0:
+            idle_since = time.time()
+        elif idle_timeout is not None and time.time() - idle_since > idle_timeout:
+            print('Worker ' + worker + ' found no jobs for ' + str(idle_timeout) + ' s and stops')
+            os.rmdir(worker_dir)
+            os.remove(lease)
+            return
+
+        time.sleep(poll_interval)
+
+
+
+def claim_job(queue_dir,worker_dir,free_cores,idle):
+
+    ''' Takes the oldest pending job that fits into the free cores
+
+        Inputs:
+            queue_dir   - queue directory
+            worker_dir  - running directory of the worker
+            free_cores  - free cores of the worker
+            idle        - True if the worker runs no jobs, so any job fits
+
+        Outputs:
+            (job id, job specification), None if no job was taken
+
+        Assumptions:
+            A job is taken by renaming its file into the running directory of the
+            worker. Of several workers renaming the same file only one succeeds
+
+    '''
+
+    pending = os.path.join(queue_dir,'pending')
+    for job_id in sorted(os.listdir(pending)):
+        try:
+            with open(os.path.join(pending,job_id), 'r') as f:
+                spec = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if spec["cores"] > free_cores and not idle:
+            continue
+
+        try:
+            os.rename(os.path.join(pending,job_id), os.path.join(worker_dir,job_id))
+        except OSError:
+            continue
+
+        return job_id, spec
+
+
+    return None
+
+
+
+def create_queue(queue_dir):
+
+    ''' Creates the directories of a work queue '''
+
+    for name in ('tmp', 'pending', 'running', 'done', 'cancel', 'workers'):
+        os.makedirs(os.path.join(queue_dir,name), exist_ok=True)
+
+    return
+
+
+
+def stop_job(job,timeout=30):
+
+    ''' Terminates a solver run and kills it if it does not stop within the timeout [s] '''
+
+    if job.poll() is not None:
+        return
+
+    job.terminate()
+    try:
+        job.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        job.kill()
+        job.wait()
+
+    return
+
+
+
+def write_done(queue_dir,job_id,code,host=None):
+
+    ''' Records the exit code of a job '''
+
+    temp_file = os.path.join(queue_dir,'tmp',job_id)
+    with open(temp_file, 'w') as f:
+        json.dump({"returncode": code, "host": host}, f)
+    os.rename(temp_file, os.path.join(queue_dir,'done',job_id))
+
+    return
+
+
+
+def changed_environment(env):
+
+    ''' Returns the variables of env that are not set the same way in this process '''
+
+    if env is None:
+        return {}
+
+
+    return {key: value for key, value in env.items() if os.environ.get(key) != value}
+
+
+
+def read_exit_code(exit_file):
+
+    ''' Reads the exit code a job script wrote '''
+
+    with open(exit_file, 'r') as f:
+        code = int(f.read().strip())
+
+
+    return code
+
+
+
+if __name__ == '__main__':
+
+    # Worker of a work queue: python -m Methods.Solver.execution_backend <queue_dir> [cores] [idle_timeout]
+    if len(sys.argv) < 2:
+        print('Usage: python -m Methods.Solver.execution_backend <queue_dir> [cores] [idle_timeout]')
+        sys.exit(1)
+
+    run_worker(sys.argv[1],
+               int(sys.argv[2]) if len(sys.argv) > 2 else 1,
+               idle_timeout=float(sys.argv[3]) if len(sys.argv) > 3 else None)
@@ -0,0 +1,265 @@
+# miscellaneous_solver.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Miscellaneous functions shared by the solver sweep scripts
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+import shutil
+import hashlib
+import numpy as np
+
+from Methods.Atmosphere.standard_atmosphere import standard_atmosphere
+
+
+def case_directory_name(Alt,Mach,AoA=None):
+
+    ''' Builds the name of a sweep case directory
+
+        Inputs:
+            Alt     - altitude [m]
+            Mach    - Mach number
+            AoA     - angle-of-attack [deg]. Omitted for solvers that sweep
+                      the angle-of-attack within one case (Xfoil)
+
+        Outputs:
+            new_direct - case directory name
+
+        Assumptions:
+            Negative angles-of-attack are written as '_AoA_' + abs(AoA)
+
+    '''
+
+    new_direct = 'Case_alt' + str("{:.2f}".format(Alt)) + '_Mach' + str("{:.2f}".format(Mach))
+
+    if AoA is not None:
+        if AoA < 0:
+            new_direct += '_AoA_' + str("{:.2f}".format(abs(AoA)))
+        else:
+            new_direct += '_AoA' + str("{:.2f}".format(AoA))
+
+
+    return new_direct
+
+
+def file_digest(filename):
+
+    ''' Computes the SHA-256 digest of a file in constant memory
+
+        Inputs:
+            filename    - file to hash
+
+        Outputs:
+            hex digest of the file contents
+
+        Assumptions:
+
+    '''
+
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+
+
+    return digest.hexdigest()
+
+
+def link_file(source,destination,mode='link'):
+
+    ''' Places a file into a case directory without copying its contents
+        when the file system allows it
+
+        Inputs:
+            source      - existing file
+            destination - new file path
+            mode        - 'link'     - hard link, then symbolic link, then copy
+                          'hardlink' - hard link, then copy
+                          'symlink'  - symbolic link, then copy
+                          'copy'    - always copy
+
+        Outputs:
+            bytes_avoided - size of the source file if it was linked, 0 if copied
+
+        Assumptions:
+            Linked files are only read by the solver
+
+    '''
+
+    if os.path.lexists(destination):
+        os.remove(destination)
+
+    if mode in ('link', 'hardlink'):
+        try:
+            os.link(source, destination)
+            return os.path.getsize(source)
+        except OSError:
+            pass
+
+    if mode in ('link', 'symlink'):
+        try:
+            os.symlink(os.path.abspath(source), destination)
+            return os.path.getsize(source)
+        except OSError:
+            pass
+
+    shutil.copyfile(source, destination)
+
+
+    return 0
+
+
+def reference_conditions(Alt,Mach,Length):
+
+    ''' Computes freestream reference conditions for a sweep case
+
+        Inputs:
+            Alt     - altitude [m]
+            Mach    - Mach number
+            Length  - reference length [m]
+
+        Outputs:
+            T_ref   - freestream temperature [K]
+            Re      - Reynolds number based on the reference length
+
+        Assumptions:
+            Standard atmosphere in SI units
+
+    '''
+
+    # Compute standard atmospheric and reference properties
+    p_ref, T_ref, mu_ref = standard_atmosphere(Alt)
+    rho_ref = p_ref/(287*T_ref)
+    a_ref   = np.sqrt(1.4*287*T_ref)
+    V_ref   = Mach * a_ref
+
+    # Calculate Reynolds number
+    Re = rho_ref * V_ref * Length / mu_ref
+
+
+    return T_ref, Re
+
+
+def warmstart_dependencies(AoA):
+
+    ''' Builds the warm-start graph of an angle-of-attack sweep. The sweep
+        starts at the angle nearest to zero and continues with two chains,
+        one towards higher and one towards lower angles
+
+        Inputs:
+            AoA     - angles-of-attack [deg]
+
+        Outputs:
+            parents - warm-start parent index of each angle (None for the start point)
+            depths  - number of warm-start steps from the start point
+
+        Assumptions:
+            The angles do not have to be sorted
+
+    '''
+
+    order = list(np.argsort(AoA, kind='stable'))
+    pivot = int(np.argmin(np.abs(AoA)))
+    p     = order.index(pivot)
+
+    parents = [None] * len(AoA)
+    depths  = [0] * len(AoA)
+    for step in range(1,len(order)):
+        if p + step < len(order):
+            parents[order[p+step]] = int(order[p+step-1])
+            depths[order[p+step]]  = step
+        if p - step >= 0:
+            parents[order[p-step]] = int(order[p-step+1])
+            depths[order[p-step]]  = step
+
+
+    return parents, depths
+
+
+def chain_order(chain):
+
+    ''' Orders the cases of a warm-start graph so that every chain is followed
+        to its end before the next one starts
+
+        Inputs:
+            chain   - dictionary of case index -> (parent index, depth), see
+                      warmstart_dependencies
+
+        Outputs:
+            order   - case indices, parents before their children
+
+        Assumptions:
+            Children of a case are followed in increasing index order
+
+    '''
+
+    children = {}
+    roots    = []
+    for k, (parent, depth) in chain.items():
+        if parent is None or parent not in chain:
+            roots.append(k)
+        else:
+            children.setdefault(parent, []).append(k)
+
+    order = []
+    stack = sorted(roots, reverse=True)
+    while stack:
+        k = stack.pop()
+        order.append(k)
+        stack.extend(sorted(children.get(k, []), reverse=True))
+
+
+    return order
+
+
+def write_altitude_sheet(workbook,Freestream,Cl,Cd,Cm,i):
+
+    ''' Writes Cl, Cd, Cm tables of one altitude into an Excel worksheet
+
+        Inputs:
+            workbook    - xlsxwriter workbook
+            Freestream  - Freestream conditions
+            Cl, Cd, Cm  - coefficient arrays [Altitude, Mach, AoA]
+            i           - altitude index
+
+        Outputs:
+
+        Assumptions:
+
+    '''
+
+    len_Mach = len(Freestream.Mach)
+    len_AoA  = len(Freestream.Angle_of_attack)
+
+    sheetname = 'Altitude ' + str(Freestream.Altitude[i]) + 'm'
+    worksheet = workbook.add_worksheet(name=sheetname)
+
+    # create the 2D table frame
+    worksheet.write(0, 0,"Cl")
+    worksheet.write(0, 2*len_Mach,"Cd")
+    worksheet.write(0, 3*len_Mach+2,"Cm")
+    worksheet.write(1, 0,"AoA\\Mach")
+    worksheet.write(1, 2*len_Mach,"AoA\\Mach")
+    worksheet.write(1, 3*len_Mach+2,"AoA\\Mach")
+    for j in range(len_Mach):
+        for k in range(len_AoA):
+            worksheet.write(1, j+1, Freestream.Mach[j])
+            worksheet.write(1, len_Mach + j+3, Freestream.Mach[j])
+            worksheet.write(1, 2*len_Mach + j+5, Freestream.Mach[j])
+            worksheet.write(k+2, 0, Freestream.Angle_of_attack[k])
+            worksheet.write(k+2, len_Mach+2, Freestream.Angle_of_attack[k])
+            worksheet.write(k+2, 2*len_Mach+4, Freestream.Angle_of_attack[k])
+
+            worksheet.write(k+2, j+1, Cl[i,j,k])
+            worksheet.write(k+2, len_Mach + j+3, Cd[i,j,k])
+            worksheet.write(k+2, 2*len_Mach + j+5, Cm[i,j,k])
+
+
+    return
@@ -0,0 +1,144 @@
+# rank_tuning.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Strong-scaling model of SU2 cases and the choice of MPI ranks per case
+    that maximizes the sweep throughput
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+import json
+import numpy as np
+
+
+
+def fit_scaling(ranks,times):
+
+    ''' Fits the time model t(p) = a + b/p + c*p to measured times
+
+        Inputs:
+            ranks       - MPI rank counts p
+            times       - measured times at the rank counts [s]
+
+        Outputs:
+            coefficients - [a, b, c]: serial part, parallel part, and
+                           communication overhead per rank
+
+        Assumptions:
+            The coefficients are non-negative (Amdahl's law with a linear
+            communication term)
+
+    '''
+
+    from scipy.optimize import nnls
+
+    ranks = np.asarray(ranks, dtype=float)
+    A     = np.column_stack((np.ones(len(ranks)), 1.0/ranks, ranks))
+    coefficients, _ = nnls(A, np.asarray(times, dtype=float))
+
+
+    return [float(c) for c in coefficients]
+
+
+
+def scaling_time(coefficients,ranks):
+
+    ''' Evaluates the time model of fit_scaling at rank counts '''
+
+    ranks = np.asarray(ranks, dtype=float)
+
+
+    return coefficients[0] + coefficients[1]/ranks + coefficients[2]*ranks
+
+
+
+def choose_ranks(model,core_budget,n_cases,chain_length,case_iterations,max_ranks=None):
+
+    ''' Chooses the MPI ranks per case with the shortest predicted sweep time
+
+        Inputs:
+            model["startup"]    - time model of the case startup (mesh reading, preprocessing)
+                 ["iteration"]  - time model of one solver iteration
+            core_budget         - cores shared by concurrent cases
+            n_cases             - number of cases in the sweep
+            chain_length        - number of cases in the longest warm-start chain
+            case_iterations     - expected iterations per case
+            max_ranks           - largest rank count considered, e.g. the largest one
+                                  measured (optional)
+
+        Outputs:
+            ranks               - MPI ranks per case
+            concurrent          - cases running at once
+            sweep_times         - predicted sweep time for every rank count [s]
+
+        Assumptions:
+            1. Cases of one chain run one after the other, so the sweep takes
+               at least chain_length case times
+            2. Ties go to the smaller rank count
+
+    '''
+
+    if max_ranks is None:
+        max_ranks = core_budget
+    candidates  = np.arange(1, max(1,int(min(core_budget, max_ranks))) + 1)
+    case_times  = scaling_time(model["startup"], candidates) + case_iterations*scaling_time(model["iteration"], candidates)
+    concurrent  = np.maximum(1, core_budget // candidates)
+    rounds      = np.maximum(np.ceil(n_cases / concurrent), chain_length)
+    sweep_times = rounds * case_times
+
+    best = int(np.argmin(sweep_times))
+
+
+    return int(candidates[best]), int(min(concurrent[best], n_cases)), dict(zip(candidates.tolist(), sweep_times.tolist()))
+
+
+
+def load_tuning(filename,key):
+
+    ''' Returns the stored tuning result of a mesh and solver setup, None if there is none '''
+
+    if not os.path.exists(filename):
+        return None
+
+    with open(filename, 'r') as f:
+        entries = json.load(f)
+
+
+    return entries.get(key)
+
+
+
+def save_tuning(filename,key,entry):
+
+    ''' Stores the tuning result of a mesh and solver setup
+
+        Inputs:
+            filename    - tuning file (JSON) with one entry per key
+            key         - hash of the mesh digest and solver setup
+            entry       - measured times and fitted models
+
+        Outputs:
+
+        Assumptions:
+
+    '''
+
+    entries = {}
+    if os.path.exists(filename):
+        with open(filename, 'r') as f:
+            entries = json.load(f)
+    entries[key] = entry
+
+    temp_file = filename + '.tmp'
+    with open(temp_file, 'w') as f:
+        json.dump(entries, f, indent=1, sort_keys=True)
+    os.replace(temp_file, filename)
+
+
+    return
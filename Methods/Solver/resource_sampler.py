@@ -0,0 +1,268 @@
+# resource_sampler.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Samples the process tree of a solver run and records its peak memory,
+    CPU time, core utilization, and disk I/O
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import time
+import threading
+
+
+
+class ResourceSampler():
+
+    def __init__(self,settings,cores=None):
+
+        ''' Initializes the sampler
+
+            Inputs:
+                settings["interval"]        - time between samples of the process tree [s]
+                        ["rss_warning"]     - peak RSS above which a warning is printed [bytes],
+                                              None for no warning
+                cores                       - cores reserved for the run, None if unknown
+
+            Outputs:
+
+            Assumptions:
+                psutil is imported once a run is sampled
+
+        '''
+
+        self.interval    = settings.get("interval", 1.0)
+        self.rss_warning = settings.get("rss_warning")
+        self.cores       = cores
+        self.usage       = None                 # Usage of the last sampled run
+        self.thread      = None
+
+
+    def start(self,job):
+
+        ''' Starts sampling a solver run in a background thread
+
+            Inputs:
+                job         - job returned by an execution backend
+
+            Outputs:
+
+            Assumptions:
+                Only local jobs, which expose the process id of the solver, are sampled
+
+        '''
+
+        self.usage  = None
+        self.thread = None
+        self.final  = None
+
+        pid = getattr(job, 'pid', None)
+        if pid is None:
+            print('Resource sampling needs local solver runs, ' + type(job).__name__ + ' is not sampled')
+            return
+
+        import psutil
+
+        self.psutil   = psutil
+        self.totals   = {}                      # pid -> [CPU time, bytes read, bytes written]
+        self.peak_rss = 0
+        self.samples  = 0
+        self.started  = time.perf_counter()
+        self.stopping = threading.Event()
+        try:
+            self.root = psutil.Process(pid)
+        except psutil.NoSuchProcess:
+            self.root = None
+
+        self.sample()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+        # Read the totals of the solver once it exited, before it is reaped
+        if hasattr(job, 'on_exit'):
+            job.on_exit = self.exited
+
+        return
+
+
+    def run(self):
+
+        ''' Samples the process tree until stop is called '''
+
+        while not self.stopping.wait(self.interval):
+            self.sample()
+
+        return
+
+
+    def sample(self):
+
+        ''' Reads the memory, CPU time, and I/O counters of every process of the tree
+
+            Assumptions:
+                1. The RSS of all processes is summed, so memory shared between
+                   them is counted more than once
+                2. I/O counters are skipped where the platform does not provide them
+
+        '''
+
+        if self.root is None:
+            return
+
+        try:
+            tree = [self.root] + self.root.children(recursive=True)
+        except (self.psutil.NoSuchProcess, self.psutil.ZombieProcess):
+            return
+
+        rss = 0
+        for process in tree:
+            try:
+                with process.oneshot():
+                    memory = process.memory_info().rss
+                    cpu    = process.cpu_times()
+                    if hasattr(process, 'io_counters'):
+                        io = process.io_counters()
+                    else:
+                        io = None
+            except (self.psutil.NoSuchProcess, self.psutil.ZombieProcess, self.psutil.AccessDenied):
+                continue
+
+            rss += memory
+            if io is None:
+                self.totals[process.pid] = [cpu.user + cpu.system, 0, 0]
+            else:
+                self.totals[process.pid] = [cpu.user + cpu.system, io.read_bytes, io.write_bytes]
+
+        self.peak_rss = max(self.peak_rss, rss)
+        self.samples += 1
+
+        return
+
+
+    def exited(self):
+
+        ''' Stops sampling and reads the totals of the exited solver process
+
+            Inputs:
+
+            Outputs:
+
+            Assumptions:
+                1. Called by the job once the solver exited and before it is reaped
+                2. The CPU time and I/O of an exited process include those of the
+                   children it waited for, so runs shorter than the sampling
+                   interval are measured as well
+
+        '''
+
+        if self.thread is None or self.root is None:
+            return
+
+        self.stopping.set()
+        self.thread.join()
+
+        try:
+            with self.root.oneshot():
+                cpu = self.root.cpu_times()
+                if hasattr(self.root, 'io_counters'):
+                    io = self.root.io_counters()
+                else:
+                    io = None
+        except (self.psutil.NoSuchProcess, self.psutil.AccessDenied):
+            return
+
+        cpu_seconds = cpu.user + cpu.system + getattr(cpu, 'children_user', 0.0) + getattr(cpu, 'children_system', 0.0)
+        if io is None:
+            self.final = [cpu_seconds, 0, 0]
+        else:
+            self.final = [cpu_seconds, io.read_bytes, io.write_bytes]
+
+        return
+
+
+    def stop(self):
+
+        ''' Stops sampling once the run ended
+
+            Inputs:
+
+            Outputs:
+                usage["peak_rss"]           - peak resident memory of the process tree [bytes]
+                     ["cpu_seconds"]        - CPU time of all processes [s]
+                     ["wall_seconds"]       - sampled wall time [s]
+                     ["mean_cores"]         - CPU time per wall time
+                     ["core_utilization"]   - mean cores per reserved core, NaN if unknown
+                     ["read_bytes"]         - bytes read from storage
+                     ["write_bytes"]        - bytes written to storage
+                     ["processes"]          - number of sampled processes
+                None if the run was not sampled
+
+            Assumptions:
+                CPU time and I/O are the larger of the sums over the last samples of
+                every process and the totals of the exited solver. Without the latter
+                up to one interval is missed for processes that exit
+
+        '''
+
+        if self.thread is None:
+            return self.usage
+
+        self.stopping.set()
+        self.thread.join()
+        self.thread = None
+
+        wall   = max(time.perf_counter() - self.started, 1e-9)
+        totals = [sum([values[n] for values in self.totals.values()]) for n in range(3)]
+        if self.final is not None:
+            totals = [max(total, final) for total, final in zip(totals, self.final)]
+        cpu    = totals[0]
+
+        self.usage = {"peak_rss"         : float(self.peak_rss),
+                      "cpu_seconds"      : cpu,
+                      "wall_seconds"     : wall,
+                      "mean_cores"       : cpu/wall,
+                      "core_utilization" : cpu/(wall*self.cores) if self.cores else float('nan'),
+                      "read_bytes"       : float(totals[1]),
+                      "write_bytes"      : float(totals[2]),
+                      "processes"        : len(self.totals)}
+
+
+        return self.usage
+
+
+    def report(self,case):
+
+        ''' Prints the usage of the last run and warns about a large peak RSS
+
+            Inputs:
+                case        - case name printed with the usage
+
+            Outputs:
+
+            Assumptions:
+
+        '''
+
+        usage = self.usage
+        if usage is None:
+            return
+
+        line = case + ': peak RSS ' + str("{:.2f}".format(usage["peak_rss"]/1e9)) + ' GB, ' + \
+               str("{:.1f}".format(usage["cpu_seconds"])) + ' CPU s, ' + \
+               str("{:.1f}".format(usage["mean_cores"])) + ' cores busy'
+        if self.cores:
+            line += ' of ' + str(self.cores)
+        line += ', ' + str("{:.1f}".format(usage["read_bytes"]/1e6)) + ' MB read, ' + \
+                str("{:.1f}".format(usage["write_bytes"]/1e6)) + ' MB written'
+        print(line)
+
+        if self.rss_warning is not None and usage["peak_rss"] > self.rss_warning:
+            print('WARNING: ' + case + ' used ' + str("{:.2f}".format(usage["peak_rss"]/1e9)) + ' GB of memory, more than ' + \
+                  str("{:.2f}".format(self.rss_warning/1e9)) + ' GB')
+
+        return
@@ -0,0 +1,173 @@
+# restart_index.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Persistent index of converged SU2 solutions used to pick the nearest
+    restart file for new sweep cases
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+import json
+import threading
+import numpy as np
+
+
+
+class RestartIndex():
+
+    def __init__(self,filename,setup,settings):
+
+        ''' Opens a restart index
+
+            Inputs:
+                filename    - index file (JSON). Entries of earlier sweeps are kept
+                setup       - identifier of the solver setup the restart files
+                              belong to (e.g. mesh digest and turbulence model)
+                settings["scales"]          - distance scales of "Mach", "Reynolds"
+                                              (decades), and "Angle_of_attack" [deg]
+                        ["max_distance"]    - largest distance a restart is taken from
+                        ["metric"]          - function(a, b) of two (Mach, Re, AoA)
+                                              tuples, None for the scaled distance
+
+            Outputs:
+
+            Assumptions:
+                1. Only entries of the same setup are used
+                2. The scaled distance is the Euclidean norm of the Mach, log10(Re),
+                   and angle-of-attack differences divided by their scales
+
+        '''
+
+        self.filename     = filename
+        self.setup        = setup
+        self.scales       = settings["scales"]
+        self.max_distance = settings["max_distance"]
+        self.metric       = settings.get("metric")
+        self.lock         = threading.Lock()
+        self.entries      = {}
+
+        if os.path.exists(filename):
+            with open(filename, 'r') as f:
+                self.entries = json.load(f).get("entries", {})
+
+
+    def add(self,case,conditions,restart_file,iterations,source=None):
+
+        ''' Adds a converged solution
+
+            Inputs:
+                case        - case directory name
+                conditions  - (Mach, Re, AoA) of the case
+                restart_file - restart file of the solution
+                iterations  - iterations the case took, None if unknown
+                source      - case the solution was restarted from, None for a cold start
+
+            Outputs:
+
+            Assumptions:
+
+        '''
+
+        with self.lock:
+            self.entries[case] = {
+                "setup"        : self.setup,
+                "conditions"   : [float(value) for value in conditions],
+                "restart_file" : restart_file,
+                "iterations"   : None if iterations is None else int(iterations),
+                "source"       : source,
+            }
+            self._write()
+
+        return
+
+
+    def remove(self,case):
+
+        ''' Removes the entry of a case that is run again '''
+
+        with self.lock:
+            if self.entries.pop(case, None) is not None:
+                self._write()
+
+        return
+
+
+    def nearest(self,case,conditions):
+
+        ''' Returns the closest converged solution
+
+            Inputs:
+                case        - case directory name, excluded from the search
+                conditions  - (Mach, Re, AoA) of the case
+
+            Outputs:
+                source      - case directory name of the solution, None if no
+                              solution lies within the maximum distance
+                restart_file - restart file of the solution
+                distance    - distance to the solution
+
+            Assumptions:
+                Entries whose restart file no longer exists are skipped
+
+        '''
+
+        with self.lock:
+            entries = [(name, entry) for name, entry in self.entries.items()
+                       if name != case and entry["setup"] == self.setup]
+
+        best = (None, None, np.inf)
+        for name, entry in entries:
+            d = self.distance(conditions, entry["conditions"])
+            if d < best[2] and d <= self.max_distance and os.path.exists(entry["restart_file"]):
+                best = (name, entry["restart_file"], d)
+
+
+        return best
+
+
+    def distance(self,a,b):
+
+        ''' Distance between two (Mach, Re, AoA) conditions '''
+
+        if self.metric is not None:
+            return float(self.metric(tuple(a), tuple(b)))
+
+        d_Mach = (a[0] - b[0]) / self.scales["Mach"]
+        d_Re   = (np.log10(a[1]) - np.log10(b[1])) / self.scales["Reynolds"]
+        d_AoA  = (a[2] - b[2]) / self.scales["Angle_of_attack"]
+
+
+        return float(np.sqrt(d_Mach**2 + d_Re**2 + d_AoA**2))
+
+
+    def cold_start_iterations(self):
+
+        ''' Returns the median iterations of cold-started solutions, None if there are none '''
+
+        with self.lock:
+            iterations = [entry["iterations"] for entry in self.entries.values()
+                          if entry["setup"] == self.setup and entry["source"] is None and entry["iterations"] is not None]
+
+        if len(iterations) == 0:
+            return None
+
+
+        return float(np.median(iterations))
+
+
+    def _write(self):
+
+        ''' Writes the index to disk. Must be called with the lock held '''
+
+        temp_file = self.filename + '.tmp'
+        with open(temp_file, 'w') as f:
+            json.dump({"entries": self.entries}, f, indent=1, sort_keys=True)
+        os.replace(temp_file, self.filename)
+
+        return
@@ -0,0 +1,185 @@
+# result_cache.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Content-addressed on-disk cache of solver case results
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+import json
+import shutil
+import hashlib
+import threading
+
+from Methods.Solver.miscellaneous_solver import link_file
+
+
+class ResultCache():
+
+    def __init__(self,directory,size_limit):
+
+        ''' Opens a result cache
+
+            Inputs:
+                directory   - cache directory, created if it does not exist
+                size_limit  - maximum size of the cache [bytes]
+
+            Outputs:
+
+            Assumptions:
+                Least recently used entries are evicted once the size limit
+                is exceeded. The access time is kept as the modification
+                time of the entry result file
+
+        '''
+
+        self.directory  = directory
+        self.size_limit = size_limit
+        self.lock       = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+
+
+    def key(self,*parts):
+
+        ''' Computes a cache key
+
+            Inputs:
+                parts       - strings or bytes defining the case (e.g. config
+                              file contents and the mesh file digest)
+
+            Outputs:
+                key         - hex digest
+
+            Assumptions:
+
+        '''
+
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode()
+            digest.update(hashlib.sha256(part).digest())
+
+
+        return digest.hexdigest()
+
+
+    def lookup(self,key,file_direct=None,mode='link'):
+
+        ''' Returns the results stored under a key
+
+            Inputs:
+                key         - cache key
+                file_direct - case directory into which the stored files
+                              (history, restart) are placed (optional)
+                mode        - 'link', 'symlink', or 'copy' (see link_file)
+
+            Outputs:
+                results     - dictionary of stored results, None on a miss
+
+            Assumptions:
+
+        '''
+
+        entry_direct = self._entry_directory(key)
+        result_file  = os.path.join(entry_direct,'result.json')
+
+        with self.lock:
+            if not os.path.exists(result_file):
+                return None
+
+            with open(result_file, 'r') as f:
+                results = json.load(f)
+
+            # Mark the entry as recently used
+            os.utime(result_file)
+
+            if file_direct is not None:
+                for filename in os.listdir(entry_direct):
+                    if filename != 'result.json':
+                        link_file(os.path.join(entry_direct,filename), os.path.join(file_direct,filename), mode)
+
+
+        return results
+
+
+    def store(self,key,results,files=()):
+
+        ''' Stores case results under a key and evicts old entries
+
+            Inputs:
+                key         - cache key
+                results     - JSON-serializable dictionary of results
+                files       - files stored with the results. Missing files are skipped
+
+            Outputs:
+
+            Assumptions:
+                Files are hard linked into the cache where possible
+
+        '''
+
+        entry_direct = self._entry_directory(key)
+        temp_direct  = entry_direct + '.tmp' + str(threading.get_ident())
+
+        if os.path.exists(temp_direct):
+            shutil.rmtree(temp_direct)
+        os.makedirs(temp_direct)
+
+        for filename in files:
+            if os.path.exists(filename):
+                link_file(filename, os.path.join(temp_direct,os.path.basename(filename)), 'hardlink')
+
+        with open(os.path.join(temp_direct,'result.json'), 'w') as f:
+            json.dump(results, f)
+
+        with self.lock:
+            if os.path.exists(entry_direct):
+                shutil.rmtree(entry_direct)
+            os.rename(temp_direct, entry_direct)
+            self._evict()
+
+        return
+
+
+    def _entry_directory(self,key):
+
+        ''' Returns the directory of a cache entry '''
+
+        return os.path.join(self.directory, key[:2], key)
+
+
+    def _evict(self):
+
+        ''' Removes least recently used entries above the size limit. Must be
+            called with the lock held '''
+
+        entries    = []
+        total_size = 0
+        for prefix in os.listdir(self.directory):
+            prefix_direct = os.path.join(self.directory, prefix)
+            if not os.path.isdir(prefix_direct):
+                continue
+            for key in os.listdir(prefix_direct):
+                entry_direct = os.path.join(prefix_direct, key)
+                result_file  = os.path.join(entry_direct, 'result.json')
+                if '.tmp' in key or not os.path.exists(result_file):
+                    continue
+                size = sum(os.path.getsize(os.path.join(entry_direct,filename)) for filename in os.listdir(entry_direct))
+                entries.append((os.path.getmtime(result_file), size, entry_direct))
+                total_size += size
+
+        for last_used, size, entry_direct in sorted(entries):
+            if total_size <= self.size_limit:
+                break
+            shutil.rmtree(entry_direct)
+            total_size -= size
+
+        return
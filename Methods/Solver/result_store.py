@@ -0,0 +1,225 @@
+# result_store.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Columnar store of sweep results written case by case as NPZ chunks
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+import json
+import threading
+import numpy as np
+import xlsxwriter
+
+from Core.Data import Data
+from Core.Trace import span
+from Methods.Solver.miscellaneous_solver import write_altitude_sheet
+
+
+
+class ResultStore():
+
+    def __init__(self,directory,axes):
+
+        ''' Creates an empty result store
+
+            Inputs:
+                directory   - store directory. Results of a previous sweep in it are removed
+                axes        - dictionary of sweep axis names and values in array order,
+                              e.g. {"Altitude": [...], "Mach": [...], "Angle_of_attack": [...]}
+
+            Outputs:
+
+            Assumptions:
+                1. Every appended case is written to its own chunk file, so the store can
+                   be read while the sweep is still running
+                2. consolidate() merges the chunks into results.npz
+
+        '''
+
+        self.directory = directory
+        self.lock      = threading.Lock()
+        self.count     = 0
+
+        os.makedirs(directory, exist_ok=True)
+        for filename in os.listdir(directory):
+            if filename.startswith('chunk_') or filename == 'results.npz':
+                os.remove(os.path.join(directory,filename))
+
+        with open(os.path.join(directory,'axes.json'), 'w') as f:
+            json.dump([[name, np.asarray(values).tolist()] for name, values in axes.items()], f)
+
+
+    def append(self,index,results):
+
+        ''' Appends the results of one case
+
+            Inputs:
+                index       - tuple of indices along the leading sweep axes
+                results     - dictionary of result fields. Values are scalars or arrays
+                              over the remaining axes, optionally followed by further
+                              dimensions. Nested dictionaries (e.g. residuals) are stored
+                              as separate fields, None values are skipped
+
+            Outputs:
+
+            Assumptions:
+
+        '''
+
+        fields = {}
+        for name, value in results.items():
+            if isinstance(value, dict):
+                for sub_name, sub_value in value.items():
+                    if sub_value is not None:
+                        fields[sub_name] = sub_value
+            elif value is not None:
+                fields[name] = value
+
+        with self.lock:
+            number      = self.count
+            self.count += 1
+
+        filename  = os.path.join(self.directory, 'chunk_' + str(number).zfill(6) + '.npz')
+        temp_file = filename + '.tmp'
+        with open(temp_file, 'wb') as f:
+            np.savez(f, index=np.asarray(index, dtype=int), names=np.asarray(list(fields.keys()), dtype=str),
+                     **{'field_' + str(n): np.asarray(value) for n, value in enumerate(fields.values())})
+        os.replace(temp_file, filename)
+
+        return
+
+
+    def consolidate(self):
+
+        ''' Merges all chunks into results.npz and removes them
+
+            Inputs:
+
+            Outputs:
+                data        - store contents (see read_result_store)
+
+            Assumptions:
+                No cases are appended while the store is consolidated
+
+        '''
+
+        data   = read_result_store(self.directory)
+        names  = list(data.fields)
+        arrays = {}
+        for n, name in enumerate(names):
+            values = data[name]
+            if values.dtype == object:
+                values = values.astype(str)
+            arrays['field_' + str(n)] = values
+
+        temp_file = os.path.join(self.directory,'results.npz.tmp')
+        with open(temp_file, 'wb') as f:
+            np.savez(f, names=np.asarray(names, dtype=str), **arrays)
+        os.replace(temp_file, os.path.join(self.directory,'results.npz'))
+
+        for filename in os.listdir(self.directory):
+            if filename.startswith('chunk_') and filename.endswith('.npz'):
+                os.remove(os.path.join(self.directory,filename))
+
+
+        return data
+
+
+
+def read_result_store(directory):
+
+    ''' Reads a result store, also while the sweep is running
+
+        Inputs:
+            directory   - store directory
+
+        Outputs:
+            data.axes   - sweep axis values by name
+                .fields - list of field names
+                [name]  - array of every field over all axes, followed by the dimensions
+                          of array-valued fields. Missing cases are NaN for numeric
+                          fields and empty strings for text fields
+
+        Assumptions:
+
+    '''
+
+    with open(os.path.join(directory,'axes.json'), 'r') as f:
+        axes = json.load(f)
+
+    data        = Data()
+    data.axes   = Data()
+    data.fields = []
+    for name, values in axes:
+        data.axes[name] = np.array(values)
+    shape = tuple(len(values) for name, values in axes)
+
+    def add(name,index,value):
+        value = np.asarray(value)
+        if name not in data.fields:
+            data.fields.append(name)
+
+            # Dimensions beyond the sweep axes (e.g. spanwise stations)
+            if index is Ellipsis:
+                extra = value.shape[len(shape):]
+            else:
+                extra = value.shape[len(shape)-len(index):]
+            if value.dtype.kind in 'biuf':
+                data[name] = np.full(shape + extra, np.nan)
+            else:
+                data[name] = np.full(shape + extra, '', dtype=object)
+        data[name][index] = value
+
+    # Consolidated results
+    results_file = os.path.join(directory,'results.npz')
+    if os.path.exists(results_file):
+        with np.load(results_file) as f:
+            for n, name in enumerate(f['names']):
+                add(str(name), Ellipsis, f['field_' + str(n)])
+
+    # Chunks appended since
+    chunks = sorted(filename for filename in os.listdir(directory) if filename.startswith('chunk_') and filename.endswith('.npz'))
+    for filename in chunks:
+        with np.load(os.path.join(directory,filename)) as f:
+            index = tuple(int(i) for i in f['index'])
+            for n, name in enumerate(f['names']):
+                add(str(name), index, f['field_' + str(n)])
+
+
+    return data
+
+
+
+def export_workbook(data,filename,fields=('Cl','Cd','Cm')):
+
+    ''' Writes Cl, Cd, Cm tables of a result store into an Excel workbook
+
+        Inputs:
+            data        - store contents (see read_result_store)
+            filename    - workbook file
+            fields      - names of the Cl, Cd, and Cm fields
+
+        Outputs:
+
+        Assumptions:
+            The store axes are Altitude, Mach, and Angle_of_attack
+
+    '''
+
+    Cl, Cd, Cm = [data[name] for name in fields]
+
+    with span('Workbook writing', file=os.path.basename(filename)):
+        workbook = xlsxwriter.Workbook(filename,{'nan_inf_to_errors': True})
+        for i in range(len(data.axes.Altitude)):
+            write_altitude_sheet(workbook,data.axes,Cl,Cd,Cm,i)
+        workbook.close()
+
+
+    return
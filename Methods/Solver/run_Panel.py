@@ -0,0 +1,435 @@
+import os
+import numpy as np
+
+from Core.Data                           import Data
+from Core.Trace                          import span
+from Methods.Solver.result_store         import ResultStore, export_workbook
+from Methods.Solver.sweep_result         import SweepResult
+
+def solve(self,Freestream,Mesh,Geometry,airfoil_filepath):
+
+        ''' Runs an inviscid linear-vortex panel method sweep for airfoils
+
+        Available sweeps:
+            Altitude
+            Mach
+            angle-of-attack
+
+
+        Inputs:
+            Freestream  - Freestream conditions
+            Mesh        - Mesh settings
+            Geometry    - Geometric settings
+            airfoil_filepath - directory of the airfoil coordinate files
+
+
+        Outputs:
+            Result      - SweepResult lookup table of Cl, Cd, Cm, also saved
+                          to working_dir/sweep_result.npz
+
+
+        Assumptions:
+            1. Reference axes:
+                2D:     X - horizontal (chordwise)
+                        Y - vertical
+            2. Inviscid incompressible flow with the Prandtl-Glauert correction,
+               so Cd is zero and the results do not depend on the altitude
+            3. The influence matrix is factored once and all angles-of-attack
+               are solved as one multi-right-hand-side system
+            4. Only single-element airfoils are supported
+            5. Moments are taken about Geometry.reference_values["Point"]
+            6. Results are written to the result store in working_dir/results.
+               arrays.xlsx is exported from it if Solver.export_workbook is True
+
+        '''
+
+
+        # Define inputs
+        #--------------------------------------------------------------------
+        len_Alt  = len(Freestream.Altitude)
+        len_Mach = len(Freestream.Mach)
+
+        x, y  = airfoil_coordinates(Geometry,airfoil_filepath)
+        chord = Geometry.reference_values["Length"]
+        x_ref = Geometry.reference_values["Point"][0]
+        y_ref = Geometry.reference_values["Point"][1]
+
+
+        # Solve the incompressible flow for all angles-of-attack at once
+        #--------------------------------------------------------------------
+        with span('Panel solution'):
+            Cl_inc, Cm_inc = panel_coefficients(x*chord,y*chord,Freestream.Angle_of_attack,x_ref,y_ref,chord)
+
+        store = ResultStore(os.path.join(self.working_dir,'results'),
+                            {"Altitude"        : Freestream.Altitude,
+                             "Mach"            : Freestream.Mach,
+                             "Angle_of_attack" : Freestream.Angle_of_attack})
+
+        for j in range(len_Mach):
+
+            # Prandtl-Glauert compressibility correction
+            beta = np.sqrt(1 - Freestream.Mach[j]**2)
+            for i in range(len_Alt):
+                store.append((i,j),{"Cl": Cl_inc/beta, "Cd": np.zeros_like(Cl_inc), "Cm": Cm_inc/beta})
+
+        # Gather results
+        data = store.consolidate()
+
+        # Write data into an Excel file
+        if self.export_workbook is True:
+            export_workbook(data,os.path.join(self.working_dir,'arrays.xlsx'))
+
+        print('CL:')
+        print(data.Cl)
+        print('CM:')
+        print(data.Cm)
+
+        Result = SweepResult(data.axes,{"Cl": data.Cl, "Cd": data.Cd, "Cm": data.Cm})
+        Result.save(os.path.join(self.working_dir,'sweep_result.npz'))
+
+
+        return Result
+
+
+
+def airfoil_coordinates(Geometry,airfoil_filepath):
+
+        ''' Returns the closed contour of the first airfoil segment
+
+            Inputs:
+                Geometry.Segments['section_1'].Airfoil.points - points from create_PARSEC_airfoil
+                                                                or create_CST_airfoil (optional)
+                                                  .files['merged'] - coordinate file used otherwise
+                airfoil_filepath    - directory of the airfoil coordinate files
+
+
+            Outputs:
+                x, y                - contour coordinates normalized by the chord, ordered
+                                      from the trailing edge along the lower surface to the
+                                      leading edge and along the upper surface back
+
+
+            Assumptions:
+                Coordinate files are in the Selig format with one title line
+
+        '''
+
+        Airfoil = Geometry.Segments['section_1'].Airfoil
+
+        if 'points' in Airfoil:
+            x, y = contour_from_points(Airfoil.points)
+        else:
+            coordinates = np.loadtxt(os.path.join(airfoil_filepath,Airfoil.files['merged']), skiprows=1)
+            x, y = coordinates[:,0], coordinates[:,1]
+
+            # Selig files run from the trailing edge along the upper surface
+            if y[1] > y[-2]:
+                x, y = x[::-1], y[::-1]
+
+
+        return x, y
+
+
+
+def contour_from_points(points):
+
+        ''' Builds the closed panel contour from generated airfoil points
+
+            Inputs:
+                points      - airfoil points returned by create_PARSEC_airfoil or create_CST_airfoil
+
+
+            Outputs:
+                x, y        - contour coordinates ordered from the trailing edge along the
+                              lower surface to the leading edge and along the upper surface back
+
+
+            Assumptions:
+                Single-element airfoils only
+
+        '''
+
+        if len(points.xx_fl_suc) != 0:
+            raise Exception('The panel solver supports single-element airfoils only')
+
+        # Order both surfaces from the leading to the trailing edge
+        x_up, y_up = np.asarray(points.xx_no_fl_suc, dtype=float), np.asarray(points.yy_no_fl_suc, dtype=float)
+        x_lo, y_lo = np.asarray(points.xx_no_fl_pre, dtype=float), np.asarray(points.yy_no_fl_pre, dtype=float)
+        if x_up[0] > x_up[-1]:
+            x_up, y_up = x_up[::-1], y_up[::-1]
+        if x_lo[0] > x_lo[-1]:
+            x_lo, y_lo = x_lo[::-1], y_lo[::-1]
+
+        # Drop the shared leading edge point
+        if np.hypot(x_up[0] - x_lo[0], y_up[0] - y_lo[0]) < 1e-12:
+            x_up, y_up = x_up[1:], y_up[1:]
+
+        x = np.concatenate((x_lo[::-1], x_up))
+        y = np.concatenate((y_lo[::-1], y_up))
+
+
+        return x, y
+
+
+
+def panel_coefficients(x,y,AoA,x_ref,y_ref,chord):
+
+        ''' Solves the linear-vortex panel method for a set of angles-of-attack
+
+            Inputs:
+                x, y        - contour nodes ordered clockwise from the lower trailing edge
+                AoA         - angles-of-attack [deg]
+                x_ref       - x-coordinate of the moment reference point
+                y_ref       - y-coordinate of the moment reference point
+                chord       - reference length
+
+
+            Outputs:
+                Cl, Cm      - incompressible lift and pitching moment coefficients
+
+
+            Assumptions:
+                1. Unit freestream velocity
+                2. Linear vortex strength along every panel with the Kutta condition
+                   gamma_first + gamma_last = 0 at the trailing edge
+                3. Zero normal velocity at the panel midpoints
+
+        '''
+
+        import scipy.linalg
+
+        alpha = np.radians(np.asarray(AoA, dtype=float))
+
+        # Influence matrices of the node strengths on the midpoint velocities
+        panels = panel_geometry(np.asarray(x, dtype=float)[None,:],np.asarray(y, dtype=float)[None,:])
+        A, A_tangent = influence_matrices(panels)
+
+        # Factor once, solve all angles-of-attack
+        lu_piv = scipy.linalg.lu_factor(A[0])
+        gamma  = scipy.linalg.lu_solve(lu_piv, freestream_rhs(panels,alpha)[0])
+
+        Cl, Cm = panel_loads(panels,A_tangent,gamma[None,:,:],alpha,x_ref,y_ref,chord)
+
+
+        return Cl[0], Cm[0]
+
+
+
+def batch_panel_coefficients(X,Y,AoA,x_ref=0.25,y_ref=0.0,chord=1.0,chunk_size=16):
+
+        ''' Solves the linear-vortex panel method for a stack of airfoils
+
+            Inputs:
+                X, Y        - contour nodes [n_airfoils, n_points], each row ordered clockwise
+                              from the lower trailing edge (see contour_from_points)
+                AoA         - angles-of-attack [deg]
+                x_ref       - x-coordinate of the moment reference point
+                y_ref       - y-coordinate of the moment reference point
+                chord       - reference length
+                chunk_size  - number of airfoils assembled and solved at once
+
+
+            Outputs:
+                Cl, Cm      - incompressible lift and pitching moment coefficients [n_airfoils, n_aoa]
+
+
+            Assumptions:
+                1. All airfoils have the same number of contour points
+                2. The influence matrices of a chunk are built as one 3-D array and
+                   solved with a batched numpy.linalg.solve. Memory use grows with
+                   chunk_size * n_points^2
+
+        '''
+
+        X     = np.asarray(X, dtype=float)
+        Y     = np.asarray(Y, dtype=float)
+        alpha = np.radians(np.atleast_1d(np.asarray(AoA, dtype=float)))
+
+        Cl = np.zeros((X.shape[0],len(alpha)))
+        Cm = np.zeros((X.shape[0],len(alpha)))
+        for start in range(0,X.shape[0],chunk_size):
+            chunk  = slice(start,start+chunk_size)
+            panels = panel_geometry(X[chunk],Y[chunk])
+
+            A, A_tangent = influence_matrices(panels)
+            gamma        = np.linalg.solve(A, freestream_rhs(panels,alpha))
+
+            Cl[chunk], Cm[chunk] = panel_loads(panels,A_tangent,gamma,alpha,x_ref,y_ref,chord)
+
+
+        return Cl, Cm
+
+
+
+def panel_geometry(x,y):
+
+        ''' Computes the panel geometry of a stack of contours
+
+            Inputs:
+                x, y        - contour nodes [n_airfoils, n_points]
+
+
+            Outputs:
+                panels.x, y           - nodes [n_airfoils, n_points]
+                      .length         - panel lengths [n_airfoils, n_panels]
+                      .t_x, t_y       - panel unit tangents
+                      .n_x, n_y       - panel unit normals pointing out of the airfoil
+                      .x_mid, y_mid   - panel midpoints
+
+
+            Assumptions:
+
+        '''
+
+        panels        = Data()
+        panels.x      = x
+        panels.y      = y
+        panels.length = np.hypot(np.diff(x,axis=-1), np.diff(y,axis=-1))
+        panels.t_x    = np.diff(x,axis=-1) / panels.length
+        panels.t_y    = np.diff(y,axis=-1) / panels.length
+        panels.n_x    = -panels.t_y
+        panels.n_y    = panels.t_x
+        panels.x_mid  = 0.5*(x[:,:-1] + x[:,1:])
+        panels.y_mid  = 0.5*(y[:,:-1] + y[:,1:])
+
+
+        return panels
+
+
+
+def freestream_rhs(panels,alpha):
+
+        ''' Right-hand sides of the panel system for all angles-of-attack
+
+            Inputs:
+                panels      - panel geometry (see panel_geometry)
+                alpha       - angles-of-attack [rad]
+
+
+            Outputs:
+                rhs         - [n_airfoils, n_panels + 1, n_aoa], one column per angle.
+                              The last row belongs to the Kutta condition
+
+        '''
+
+        n_airfoils, N = panels.length.shape
+
+        rhs = np.zeros((n_airfoils,N+1,len(alpha)))
+        rhs[:,:N,:] = -(panels.n_x[:,:,None]*np.cos(alpha) + panels.n_y[:,:,None]*np.sin(alpha))
+
+
+        return rhs
+
+
+
+def panel_loads(panels,A_tangent,gamma,alpha,x_ref,y_ref,chord):
+
+        ''' Computes the lift and pitching moment from the node vortex strengths
+
+            Inputs:
+                panels      - panel geometry (see panel_geometry)
+                A_tangent   - tangential velocity influence matrices
+                gamma       - node vortex strengths [n_airfoils, n_points, n_aoa]
+                alpha       - angles-of-attack [rad]
+                x_ref       - x-coordinate of the moment reference point
+                y_ref       - y-coordinate of the moment reference point
+                chord       - reference length
+
+
+            Outputs:
+                Cl, Cm      - [n_airfoils, n_aoa]
+
+
+            Assumptions:
+                Lift from the circulation, moment from the surface pressure
+
+        '''
+
+        length = panels.length[:,:,None]
+
+        # Lift from the circulation
+        circulation = np.sum(0.5*(gamma[:,:-1,:] + gamma[:,1:,:]) * length, axis=1)
+        Cl          = 2*circulation/chord
+
+        # Pitching moment from the surface pressure
+        V_t = panels.t_x[:,:,None]*np.cos(alpha) + panels.t_y[:,:,None]*np.sin(alpha) + A_tangent @ gamma
+        Cp  = 1 - V_t**2
+
+        force_x = -Cp * length * panels.n_x[:,:,None]
+        force_y = -Cp * length * panels.n_y[:,:,None]
+        moment  = np.sum((panels.x_mid - x_ref)[:,:,None]*force_y - (panels.y_mid - y_ref)[:,:,None]*force_x, axis=1)
+        Cm      = -moment/chord**2
+
+
+        return Cl, Cm
+
+
+
+def influence_matrices(panels):
+
+        ''' Computes the velocities induced at the panel midpoints by unit node
+            strengths of linear vortex panels
+
+            Inputs:
+                panels      - panel geometry (see panel_geometry)
+
+
+            Outputs:
+                A           - normal velocity influence matrices with the Kutta condition
+                              as the last row [n_airfoils, n_panels + 1, n_points]
+                A_tangent   - tangential velocity influence matrices [n_airfoils, n_panels, n_points]
+
+
+            Assumptions:
+                Clockwise-positive vortices. The self-induced velocity is taken on
+                the outer side of the panel
+
+        '''
+
+        n_airfoils, N = panels.length.shape
+
+        # Collocation points in the local coordinates of every panel [airfoil, collocation, panel]
+        t_x = panels.t_x[:,None,:]
+        t_y = panels.t_y[:,None,:]
+        n_x = panels.n_x[:,None,:]
+        n_y = panels.n_y[:,None,:]
+        S   = panels.length[:,None,:]
+
+        dx  = panels.x_mid[:,:,None] - panels.x[:,None,:-1]
+        dy  = panels.y_mid[:,:,None] - panels.y[:,None,:-1]
+        xi  = dx*t_x + dy*t_y
+        eta = dx*n_x + dy*n_y
+
+        self_panel = np.broadcast_to(np.eye(N, dtype=bool), eta.shape)
+        eta[self_panel] = 0.0
+
+        I0 = np.arctan2(eta, xi - S) - np.arctan2(eta, xi)
+        I0[self_panel] = np.pi
+        J0 = 0.5*np.log((xi**2 + eta**2)/((xi - S)**2 + eta**2))
+
+        I1 = xi*I0 - eta*J0
+        J1 = xi*J0 - S + eta*I0
+
+        # Local velocities of the start (a) and end (b) node strengths
+        u_b = (I1/S) / (2*np.pi)
+        u_a = I0/(2*np.pi) - u_b
+        v_b = -(J1/S) / (2*np.pi)
+        v_a = -J0/(2*np.pi) - v_b
+
+        A         = np.zeros((n_airfoils,N+1,N+1))
+        A_tangent = np.zeros((n_airfoils,N,N+1))
+        for u, v, offset in ((u_a, v_a, 0), (u_b, v_b, 1)):
+
+            # Global velocity components
+            vel_x = u*t_x + v*n_x
+            vel_y = u*t_y + v*n_y
+
+            A[:,:N,offset:offset+N]      += vel_x*panels.n_x[:,:,None] + vel_y*panels.n_y[:,:,None]
+            A_tangent[:,:,offset:offset+N] += vel_x*panels.t_x[:,:,None] + vel_y*panels.t_y[:,:,None]
+
+        # Kutta condition
+        A[:,N,0] = 1.0
+        A[:,N,N] = 1.0
+
+
+        return A, A_tangent
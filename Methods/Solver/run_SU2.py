@@ -1,15 +1,28 @@
-import subprocess
 import os
+import time
+import platform
 import numpy as np
-import os
-import sys
-import subprocess
 import shutil
-import xlsxwriter
-
-from Methods.Atmosphere.standard_atmosphere import standard_atmosphere
 
-def solve(self,Freestream,Mesh,Geometry):
+from Core.Data                           import Data
+from Core.Trace                          import span
+from Methods.Solver.case_scheduler       import CaseScheduler
+from Methods.Solver.convergence_monitor  import ConvergenceMonitor
+from Methods.Solver.resource_sampler     import ResourceSampler
+from Methods.Solver.result_cache         import ResultCache
+from Methods.Solver.result_store         import ResultStore, export_workbook
+from Methods.Solver.sweep_result         import SweepResult
+from Methods.Solver.sweep_journal        import SweepJournal, inputs_hash
+from Methods.Solver.su2_log              import read_log
+from Methods.Solver.su2_config           import SU2ConfigTemplate
+from Methods.Solver.su2_driver           import SU2Driver
+from Methods.Solver.restart_index        import RestartIndex
+from Methods.Solver.rank_tuning          import fit_scaling, choose_ranks, load_tuning, save_tuning
+from Methods.Solver.execution_backend    import execution_backend, LocalBackend
+from Methods.Solver.miscellaneous_solver import case_directory_name, file_digest, link_file, \
+                                                reference_conditions, warmstart_dependencies, chain_order
+
+def solve(self,Freestream,Mesh,Geometry,cases=None,raise_on_failure=True):
 
         ''' Runs the SU2 aerodynamic analysis sweep for airfoils, wings, and aircraft
         So far, the file uses a .cfg template and sets reference values and methods up
@@ -25,10 +38,16 @@ def solve(self,Freestream,Mesh,Geometry):
             Freestream  - Freestream conditions
             Mesh        - Mesh settings
             Geometry    - Geometric settings
+            cases       - (altitude, Mach, angle-of-attack) index tuples of the cases
+                          to run, None to run the full sweep
+            raise_on_failure - raise an exception after the sweep if any case failed.
+                          Otherwise failed cases, and the cases warm-started from
+                          them, are left NaN
             
 
         Outputs:
-            CL, CD, CM
+            Result      - SweepResult lookup table of Cl, Cd, Cm, also saved
+                          to working_dir/sweep_result.npz
 
 
         Assumptions:
@@ -40,6 +59,48 @@ def solve(self,Freestream,Mesh,Geometry):
             4. Boundary conditions name requirements:
                 far-field    - 'far-field'
                 body surface - 'wall'
+            5. Cases run concurrently within Solver.max_cores cores, each using
+               Solver.processors MPI ranks
+            6. Warm starts begin at the angle-of-attack nearest to zero and
+               run outwards towards higher and lower angles
+            7. Case status is kept in sweep_journal.json. With Solver.resume set
+               to True, cases completed with the same inputs are not rerun.
+               Cases stopped as diverged are journaled as 'diverged' and rerun
+            8. With Solver.cache_dir set, results of previously solved cases
+               are taken from the result cache
+            9. Mesh and restart files are linked into the case directories
+               according to Solver.case_file_mode
+            10. With Solver.monitor_convergence set to True, the history of every
+                case is followed while it runs and the solver is stopped once the
+                Solver.convergence_monitor criteria are met
+            11. Results are appended to the result store in working_dir/results after
+                every case. arrays.xlsx is exported from it if Solver.export_workbook is True
+            12. If cases are given, the other sweep points are not run and their results
+                are NaN. Warm starts chain the selected angles-of-attack of every
+                altitude and Mach number
+            13. The .cfg template is parsed once per sweep and the case configs are
+                rendered from it by option name, so any template layout can be used
+            14. With Solver.su2_driver set to 'pysu2', cases run one at a time through
+                the SU2 Python wrapper in this process. The mesh stays loaded along every
+                warm-start chain and each angle-of-attack continues from the flow state
+                of the previous one. The driver runs on one MPI rank
+            15. A CGNS mesh (see Mesh.convert_to_binary) is set with MESH_FORMAT= CGNS
+                in the case configs
+            16. With Solver.restart_index set to True, converged solutions are kept in
+                working_dir/restart_index.json keyed by (Mach, Re, AoA). Every case starts
+                from the nearest one under Solver.restart_selection, including solutions
+                of earlier sweeps, and its iteration savings are stored with its results.
+                The first cases of Solver.restart_selection["seed_pairs"] altitude and Mach
+                pairs run first, the other pairs then run side by side
+            17. With Solver.tune_processors set to True, the cases run with the rank count
+                of the shortest predicted sweep time (see tune_processors) instead of
+                Solver.processors, which is left unchanged
+            18. SU2_CFD runs are executed by Solver.execution_backend: local processes,
+                batch scheduler jobs, or a shared-filesystem work queue. The
+                PYAEROSWEEP_BACKEND environment variable overrides the setting
+            19. With Solver.sample_resources set to True, the peak RSS, CPU time, core
+                utilization, and disk I/O of every local SU2_CFD run are stored with
+                its results (requires psutil)
 
         '''
 
@@ -54,90 +115,454 @@ def solve(self,Freestream,Mesh,Geometry):
         len_Mach = len(Freestream.Mach)
         len_AoA  = len(Freestream.Angle_of_attack)
 
-        Cl = np.zeros((len_Alt,len_Mach,len_AoA))                               # Array of Cl
-        Cd = np.zeros((len_Alt,len_Mach,len_AoA))                               # Array of Cd
-        Cm = np.zeros((len_Alt,len_Mach,len_AoA))                               # Array of Cm
-
-        # Initialize the workbook
-        workbook  = xlsxwriter.Workbook('arrays.xlsx')
-
-        warstart_set = self.warmstart
+        # Schedule all cases within the core budget of the execution backend
+        backend = execution_backend(self.execution_backend,self.backend_settings,self.working_dir)
+        if backend.max_cores is not None:
+            core_budget = backend.max_cores
+        elif self.max_cores is None:
+            core_budget = self.processors
+        else:
+            core_budget = self.max_cores
+        scheduler = CaseScheduler(core_budget,raise_on_failure)
+
+        # Warm-started sweeps start at the angle-of-attack nearest to zero
+        # and run outwards in two chains with restart files handed along
+        if cases is not None:
+            cases = set(tuple(int(n) for n in case) for case in cases)
+        chains = {}
         for i in range(len_Alt):
             for j in range(len_Mach):
-                for k in range(len_AoA): 
+                selected = [k for k in range(len_AoA) if cases is None or (i,j,k) in cases]
+                if self.warmstart == 'YES' and len(selected) > 0:
+                    parents, depths = warmstart_dependencies(np.asarray(Freestream.Angle_of_attack)[selected])
+                    parents = [None if parent is None else selected[parent] for parent in parents]
+                else:
+                    parents = [None] * len(selected)
+                    depths  = [0] * len(selected)
+                chains[(i,j)] = dict(zip(selected, zip(parents, depths)))
+        max_depth = max([depth for chain in chains.values() for (parent, depth) in chain.values()], default=0)
+
+        # With a restart index, the first cases of a few seed pairs of altitude and Mach
+        # number run first. The first cases of the other pairs wait for those of the
+        # nearest seed pair and start from whatever solution is converged by then
+        column_after = {}
+        seeds        = []
+        if self.restart_index is True:
+            pairs = [(i,j) for i in range(len_Alt) for j in range(len_Mach)
+                     if any(parent is None for (parent, depth) in chains[(i,j)].values())]
+            n_seeds = min(len(pairs), max(1, int(self.restart_selection.get("seed_pairs", 1))))
+            seeds   = [pairs[int(n)] for n in np.round(np.linspace(0, len(pairs)-1, n_seeds))] if len(pairs) > 0 else []
+            for (i,j) in pairs:
+                if (i,j) in seeds:
+                    continue
+                seed  = min(seeds, key=lambda pair: abs(pair[0]-i) + abs(pair[1]-j))
+                roots = [k for k, (parent, depth) in chains[seed].items() if parent is None]
+                for k, (parent, depth) in chains[(i,j)].items():
+                    if parent is None:
+                        AoA_distance = [abs(Freestream.Angle_of_attack[k] - Freestream.Angle_of_attack[root]) for root in roots]
+                        column_after[(i,j,k)] = seed + (roots[int(np.argmin(AoA_distance))],)
+
+        # Open the sweep journal. Resumed sweeps reuse cases completed with the same inputs
+        Sweep             = Data()
+        Sweep.journal     = SweepJournal(os.path.join(self.working_dir,'sweep_journal.json'),self.resume)
+        with span('Mesh hashing'):
+            Sweep.mesh_digest = file_digest(os.path.join(self.working_dir,Mesh.filename))
+        Sweep.bytes_avoided = []
+        Sweep.template      = SU2ConfigTemplate(os.path.join(self.working_dir,self.config_file))
+        Sweep.launched      = []
+        Sweep.iteration_savings = []
+        Sweep.backend       = backend
+        Sweep.processors    = self.processors
+        if self.restart_index is True:
+            Sweep.restart_index = RestartIndex(os.path.join(self.working_dir,'restart_index.json'),
+                                               inputs_hash(Sweep.mesh_digest, self.dimensions, self.turbulence_model),
+                                               self.restart_selection)
+        else:
+            Sweep.restart_index = None
+        if self.cache_dir is None:
+            Sweep.cache = None
+        else:
+            Sweep.cache = ResultCache(self.cache_dir,self.cache_size_limit)
+        if self.su2_driver == 'pysu2':
+            Sweep.driver = SU2Driver(self.su2_python_module)
+        else:
+            Sweep.driver = None
+
+        # Results are appended to the result store after every case
+        Sweep.store = ResultStore(os.path.join(self.working_dir,'results'),
+                                  {"Altitude"        : Freestream.Altitude,
+                                   "Mach"            : Freestream.Mach,
+                                   "Angle_of_attack" : Freestream.Angle_of_attack})
+
+        sweep_setup = [file_digest(os.path.join(self.working_dir,self.config_file)), Sweep.mesh_digest,
+                       self.dimensions, self.symmetric, self.turbulence_model, self.max_iterations,
+                       self.tolerance, self.save_frequency, Geometry.reference_values]
+        case_hashes = {}
+
+        # Choose the MPI ranks per case from the measured strong scaling of the mesh
+        n_cases = sum([len(chain) for chain in chains.values()])
+        if self.tune_processors is True and Sweep.driver is None and n_cases > 0:
+            with span('Rank tuning'):
+                Sweep.processors = tune_processors(self,Freestream,Mesh,Geometry,core_budget,n_cases,max_depth+1,Sweep.mesh_digest)
+
+        # Add cases level by level so that all chains advance together
+        for depth in range(max_depth+1):
+            for i in range(len_Alt):
+                for j in range(len_Mach):
+                    for k, (parent, case_depth) in chains[(i,j)].items():
+                        if case_depth != depth:
+                            continue
+
+                        if parent is None:
+                            warmstart   = 'NO'
+                            depends_on  = ()
+                            parent_hash = None
+                            after       = (column_after.get((i,j,k)),)
+                        else:
+                            warmstart   = 'YES'
+                            depends_on  = ((i,j,parent),)
+                            parent_hash = case_hashes[(i,j,parent)]
+                            after       = ()
+
+                        case_hashes[(i,j,k)] = inputs_hash(sweep_setup, Freestream.Altitude[i], Freestream.Mach[j],
+                                                           Freestream.Angle_of_attack[k], parent_hash)
+
+                        # Reuse a completed case of an interrupted sweep
+                        new_direct = case_directory_name(Freestream.Altitude[i],Freestream.Mach[j],Freestream.Angle_of_attack[k])
+                        results    = Sweep.journal.completed(new_direct,case_hashes[(i,j,k)])
+                        if results is not None and os.path.isdir(os.path.join(self.working_dir,new_direct)):
+                            print('Reusing completed case ' + new_direct)
+                            case = (lambda index=(i,j,k), results=results: reuse_case(Sweep,index,results))
+                            scheduler.add_case((i,j,k),0,case,depends_on,after)
+                            continue
+
+                        # The index entry of a case that is run again is replaced once it completes
+                        if Sweep.restart_index is not None:
+                            Sweep.restart_index.remove(new_direct)
+
+                        case = (lambda i=i, j=j, k=k, warmstart=warmstart, prev_k=parent, case_hash=case_hashes[(i,j,k)]: \
+                                    run_case(self,Freestream,Mesh,Geometry,i,j,k,warmstart,prev_k,Sweep,case_hash))
+                        scheduler.add_case((i,j,k),Sweep.processors,case,depends_on,after)
+
+        if Sweep.driver is None:
+            scheduler.run()
+        else:
+            # The in-process driver runs one case at a time and follows every
+            # warm-start chain to its end so the flow state is handed along in memory
+            pairs = sorted([(i,j) for i in range(len_Alt) for j in range(len_Mach)], key=lambda pair: pair not in seeds)
+            order = [(i,j,k) for (i,j) in pairs for k in chain_order(chains[(i,j)])]
+            try:
+                scheduler.run_in_order(order)
+            finally:
+                Sweep.driver.close()
+            print('In-process driver loaded the mesh ' + str(Sweep.driver.loads) + ' times for ' + \
+                  str(Sweep.driver.solves) + ' solved cases')
+
+        if len(Sweep.iteration_savings) > 0:
+            print('Restarts from the nearest converged solutions saved ' + str(int(sum(Sweep.iteration_savings))) + \
+                  ' iterations over ' + str(len(Sweep.iteration_savings)) + ' cases')
+
+        # Mesh data not read by the mesh loads of a binary mesh
+        if len(Mesh.metadata) > 0:
+            if Sweep.driver is None:
+                loads = len(Sweep.launched)
+            else:
+                loads = Sweep.driver.loads
+            saved = Mesh.metadata["ascii_size"] - Mesh.metadata["binary_size"]
+            print('Binary mesh read ' + str("{:.1f}".format(saved/1e6)) + ' MB less per mesh load, ' + \
+                  str("{:.1f}".format(saved*loads/1e6)) + ' MB over ' + str(loads) + ' mesh loads')
 
-                        # Run the solution
+        if self.case_file_mode != 'copy':
+            print('Case setup avoided copying ' + str("{:.1f}".format(sum(Sweep.bytes_avoided)/1e6)) + ' MB')
 
-                        # Create a config file
-                        # Adjust settings for the warm start
-                        if (k == 0 and warstart_set== 'YES') or warstart_set == 'NO':
-                            self.warmstart = 'NO'
-                        else:
-                            self.warmstart = 'YES'
-                        filename = run_SU2_config(self,Freestream.Altitude[i],Freestream.Mach[j],Freestream.Angle_of_attack,\
-                                                        Geometry.reference_values,Mesh,k)
-
-                        # Run SU2
-                        new_direct  = 'Case_alt' + str("{:.2f}".format(Freestream.Altitude[i])) + '_Mach' + \
-                                                    str("{:.2f}".format(Freestream.Mach[j])) + '_AoA' + \
-                                                        str("{:.2f}".format(Freestream.Angle_of_attack[k]))
-                        file_direct = os.path.join(self.working_dir, new_direct)
-                        filename1 = os.path.join(file_direct, filename)
-
-                        os.chdir(file_direct)
-
-                        print('Running Solution ' + filename)
-                        with open('SU2_output.log', 'w') as f:
-                            #subprocess.call(['SU2_CFD', filename], stdout= f, stderr= None, stdin=subprocess.PIPE)
-                            subprocess.call(['mpiexec', '-n',str(self.processors),'SU2_CFD', filename], stdout= f, stderr= None, stdin=subprocess.PIPE)
-
-                        #run_SU2(self.processors,filename1)
-                        print('Solution ' + filename + ' Completed')
-
-                        # Read results
-                        Cl[i,j,k],Cd[i,j,k],Cm[i,j,k] = read_results('SU2_output.log')
-
-            # Write data into an Excel file 
-            os.chdir(self.working_dir)
-            sheetname = 'Altitude ' + str(Freestream.Altitude[i]) + 'm'
-            worksheet = workbook.add_worksheet(name=sheetname)
-
-            # create the 2D table frame
-            worksheet.write(0, 0,"Cl")
-            worksheet.write(0, 2*len_Mach,"Cd")
-            worksheet.write(0, 3*len_Mach+2,"Cm")
-            worksheet.write(1, 0,"AoA\Mach")
-            worksheet.write(1, 2*len_Mach,"AoA\Mach")
-            worksheet.write(1, 3*len_Mach+2,"AoA\Mach")
-            for j in range(len_Mach):
-                for k in range(len_AoA):
-                    worksheet.write(1, j+1, Freestream.Mach[j])
-                    worksheet.write(1, len_Mach + j+3, Freestream.Mach[j])
-                    worksheet.write(1, 2*len_Mach + j+5, Freestream.Mach[j])
-                    worksheet.write(k+2, 0, Freestream.Angle_of_attack[k])
-                    worksheet.write(k+2, len_Mach+2, Freestream.Angle_of_attack[k])
-                    worksheet.write(k+2, 2*len_Mach+4, Freestream.Angle_of_attack[k])
+        # Gather results
+        data = Sweep.store.consolidate()
+
+        # Write data into an Excel file 
+        if self.export_workbook is True:
+            export_workbook(data,os.path.join(self.working_dir,'arrays.xlsx'))
+
+        print(data.Cl)
+        print(data.Cd)
+        print(data.Cm)
+
+        Result = SweepResult(data.axes,{"Cl": data.Cl, "Cd": data.Cd, "Cm": data.Cm})
+        Result.save(os.path.join(self.working_dir,'sweep_result.npz'))
+
+
+        return Result
+
+
+
+def run_case(self,Freestream,Mesh,Geometry,i,j,k,warmstart,prev_k,Sweep=None,case_hash=None):
+
+        ''' Sets up, runs, and reads one case of the SU2 sweep
+        
+            Inputs:
+                Freestream      - Freestream conditions
+                Mesh            - Mesh settings
+                Geometry        - Geometric settings
+                i, j, k         - altitude, Mach, and angle-of-attack indices
+                warmstart       - 'YES' to start from the restart file of the case prev_k
+                prev_k          - angle-of-attack index of the warm-start case
+                Sweep.journal   - sweep journal to record the case status in (optional)
+                     .cache       - result cache, None if disabled
+                     .mesh_digest - digest of the mesh file
+                     .bytes_avoided - list collecting the bytes not copied during case setup
+                     .store       - result store the case results are appended to, None if disabled
+                     .template    - parsed config template, None to read it from working_dir
+                     .driver      - SU2Driver of in-process runs, None to launch SU2_CFD
+                     .launched    - list collecting the cases SU2_CFD was launched for
+                     .backend     - execution backend of the SU2_CFD runs, None for local processes
+                     .processors  - MPI ranks of the case, None for Solver.processors
+                     .restart_index - RestartIndex of converged solutions, None if disabled
+                     .iteration_savings - list collecting the iterations saved by restarts
+                case_hash       - hash of the case inputs stored in the journal
+
+
+            Outputs:
+                Cl, Cd, Cm
+
+
+            Assumptions:
+                1. Cached results are keyed by the case config file contents and the mesh digest
+                2. With a restart index, the case starts from the nearest converged solution
+                   instead of the warm-start case prev_k, unless the in-process driver holds
+                   the flow state of prev_k
+                3. Cases the convergence monitor stopped as diverged are not cached
+
+        '''
+
+        if Sweep is None:
+            Sweep               = Data()
+            Sweep.journal       = None
+            Sweep.cache         = None
+            Sweep.store         = None
+            Sweep.template      = None
+            Sweep.driver        = None
+            Sweep.restart_index = None
+            Sweep.bytes_avoided = []
+
+        processors = Sweep.get('processors')
+        if processors is None:
+            processors = self.processors
+
+        new_direct  = case_directory_name(Freestream.Altitude[i],Freestream.Mach[j],Freestream.Angle_of_attack[k])
+        file_direct = os.path.join(self.working_dir, new_direct)
+        if Sweep.journal is not None:
+            Sweep.journal.record(new_direct,'running',case_hash)
+
+        try:
+            # Start from the nearest converged solution of the restart index
+            # The in-process driver keeps the warm-start case it holds in memory
+            restart_file = None
+            source       = None
+            if warmstart == 'YES':
+                source = case_directory_name(Freestream.Altitude[i],Freestream.Mach[j],Freestream.Angle_of_attack[prev_k])
+            held = Sweep.get('driver') is not None and source is not None and Sweep.driver.case == source
+
+            if Sweep.restart_index is not None:
+                T_ref, Re  = reference_conditions(Freestream.Altitude[i],Freestream.Mach[j],Geometry.reference_values["Length"])
+                conditions = (Freestream.Mach[j], Re, Freestream.Angle_of_attack[k])
+                if held:
+                    distance = Sweep.restart_index.distance(conditions, (Freestream.Mach[j], Re, Freestream.Angle_of_attack[prev_k]))
+                else:
+                    source, restart_file, distance = Sweep.restart_index.nearest(new_direct,conditions)
+                if source is None:
+                    warmstart = 'NO'
+                else:
+                    warmstart = 'YES'
+                    print(new_direct + ' starts from ' + source + ' at a distance of ' + str("{:.2f}".format(distance)))
+
+            # Create a config file
+            with span('Config writing', case=new_direct):
+                filename = run_SU2_config(self,Freestream.Altitude[i],Freestream.Mach[j],Freestream.Angle_of_attack,\
+                                                Geometry.reference_values,Mesh,k,warmstart,prev_k,Sweep,restart_file)
+            if not os.path.exists(os.path.join(file_direct,'solution_flow.dat')):
+                source = None
+
+            # Look the case up in the result cache
+            results = None
+            if Sweep.cache is not None:
+                with open(os.path.join(file_direct,filename), 'r') as f:
+                    cache_key = Sweep.cache.key(f.read(),Sweep.mesh_digest)
+                results = Sweep.cache.lookup(cache_key,file_direct,self.case_file_mode)
+
+            if results is not None:
+                print('Solution ' + filename + ' found in the result cache')
+                Cl, Cd, Cm = results["Cl"], results["Cd"], results["Cm"]
+            elif Sweep.get('driver') is not None:
+                # Run SU2 in process, continuing from the flow state of the warm-start case
+                print('Running Solution ' + filename + ' in process')
+                with span('SU2 run', case=new_direct, driver='pysu2'):
+                    results = Sweep.driver.solve(filename,file_direct,new_direct,source,
+                                                 Freestream.Angle_of_attack[k])
+                print('Solution ' + filename + ' Completed')
+                Cl, Cd, Cm = results["Cl"], results["Cd"], results["Cm"]
+
+                if Sweep.cache is not None:
+                    Sweep.cache.store(cache_key,results,
+                                      [os.path.join(file_direct,'history.csv'),os.path.join(file_direct,'restart.dat')])
+            else:
+                # Run SU2
+                if self.monitor_convergence is True:
+                    monitor = ConvergenceMonitor(self.convergence_monitor)
+                else:
+                    monitor = None
+                if self.sample_resources is True:
+                    sampler = ResourceSampler(self.resource_sampling,processors)
+                else:
+                    sampler = None
+
+                print('Running Solution ' + filename)
+                if Sweep.get('launched') is not None:
+                    Sweep.launched.append(new_direct)
+                with span('SU2 run', case=new_direct, ranks=processors):
+                    status = launch_SU2(processors,filename,file_direct,monitor,Sweep.get('backend'),sampler)
+                print('Solution ' + filename + ' Completed')
+
+                # Read results
+                results = {}
+                if status is not None and status.stopped is True:
+                    # The solver was stopped before writing its final output
+                    print('Solution ' + filename + ' stopped by the convergence monitor: ' + status.stop_reason)
+                    Cl, Cd, Cm = status.CL, status.CD, status.CM
+                else:
+                    with span('Log parsing', case=new_direct):
+                        log = read_log(os.path.join(file_direct,'SU2_output.log'))
+                    Cl, Cd, Cm = log.CL, log.CD, log.CM
+                    results["iterations"] = log.iterations
+                    results["residuals"]  = log.residuals
+                if status is not None:
+                    results["iterations"]  = status.iterations
+                    results["stop_reason"] = status.stop_reason
+                if sampler is not None and sampler.usage is not None:
+                    sampler.report(new_direct)
+                    results["resources"] = sampler.usage
+                results.update({"Cl": Cl, "Cd": Cd, "Cm": Cm})
+
+                # Diverged solutions are not cached so they are run again
+                if Sweep.cache is not None and not diverged(results):
+                    Sweep.cache.store(cache_key,results,
+                                      [os.path.join(file_direct,'history.csv'),os.path.join(file_direct,'restart.dat')])
+
+        except Exception:
+            if Sweep.journal is not None:
+                Sweep.journal.record(new_direct,'failed',case_hash)
+            raise
+
+        if Sweep.restart_index is not None:
+            record_restart(Sweep,new_direct,file_direct,conditions,source,distance,results)
+
+        if Sweep.store is not None:
+            Sweep.store.append((i,j,k),results)
+        if Sweep.journal is not None:
+            if diverged(results):
+                # Resumed sweeps run diverged cases again
+                Sweep.journal.record(new_direct,'diverged',case_hash,results)
+            else:
+                Sweep.journal.record(new_direct,'completed',case_hash,results)
+
+
+        return Cl, Cd, Cm
 
-                    worksheet.write(k+2, j+1, Cl[i,j,k])
-                    worksheet.write(k+2, len_Mach + j+3, Cd[i,j,k])
-                    worksheet.write(k+2, 2*len_Mach + j+5, Cm[i,j,k])
 
 
+def record_restart(Sweep,new_direct,file_direct,conditions,source,distance,results):
 
-        workbook.close()
+        ''' Adds a completed case to the restart index and records its iteration savings
 
-        print(Cl)
-        print(Cd)
-        print(Cm)
+            Inputs:
+                Sweep.restart_index     - RestartIndex of converged solutions
+                     .iteration_savings - list collecting the iterations saved by restarts
+                new_direct      - case directory name
+                file_direct     - case directory
+                conditions      - (Mach, Re, AoA) of the case
+                source          - case the solution was restarted from, None for a cold start
+                distance        - distance to the restart source
+                results         - case results. The restart source, distance, and iteration
+                                  savings are added to them
+
+
+            Outputs:
+
+
+            Assumptions:
+                1. Savings are measured against the median iterations of the cold-started
+                   cases in the index and are NaN until one is available
+                2. Diverged cases and cases without a restart file are not added to the index
+
+        '''
+
+        iterations = results.get("iterations")
+        if iterations is not None:
+            iterations = int(np.max(iterations))
+        cold_start = Sweep.restart_index.cold_start_iterations()
+
+        results["restart_source"]    = '' if source is None else source
+        results["restart_distance"]  = np.nan if source is None else distance
+        results["iteration_savings"] = np.nan
+        if source is not None and cold_start is not None and iterations is not None:
+            results["iteration_savings"] = cold_start - iterations
+            Sweep.iteration_savings.append(results["iteration_savings"])
+
+        converged = results.get("Cl") is not None and np.isfinite(results["Cl"]) and not diverged(results)
+        if converged and os.path.exists(os.path.join(file_direct,'restart.dat')):
+            Sweep.restart_index.add(new_direct,conditions,os.path.join(file_direct,'restart.dat'),iterations,source)
 
 
         return
 
 
 
-def run_SU2_config(self,Alt,Mach,AoA,Ref_values,Mesh,k):
+def diverged(results):
+
+        ''' Returns True if the convergence monitor stopped the case as diverged
+
+            Inputs:
+                results         - case results
+
+            Outputs:
+                True or False
+
+            Assumptions:
+
+        '''
+
+
+        return str(results.get("stop_reason", '')).startswith('diverged')
+
+
+
+def reuse_case(Sweep,index,results):
+
+        ''' Returns the results of a case completed in an interrupted sweep
+        
+            Inputs:
+                Sweep.store     - result store the case results are appended to, None if disabled
+                index           - altitude, Mach, and angle-of-attack indices
+                results         - results stored in the sweep journal
+
+
+            Outputs:
+                Cl, Cd, Cm
+
+
+            Assumptions:
+
+        '''
+
+        if Sweep.store is not None:
+            Sweep.store.append(index,results)
+
+
+        return results["Cl"], results["Cd"], results["Cm"]
+
+
+
+def run_SU2_config(self,Alt,Mach,AoA,Ref_values,Mesh,k,warmstart=None,prev_k=None,Sweep=None,restart_file=None):
 
-        ''' Creates a 2D case SU2 config file for airfoils
+        ''' Creates the SU2 config file of a case from the template
         
             Inputs:
                 Solver          - solver settings
@@ -147,6 +572,11 @@ def run_SU2_config(self,Alt,Mach,AoA,Ref_values,Mesh,k):
                 AoA             - angle-of-attack [deg]
                 Ref_values      - reference values for aero forces nad moments
                 k               - angle-of-attack index
+                warmstart       - 'YES' or 'NO'. Solver.warmstart is used if not given
+                prev_k          - angle-of-attack index of the warm-start case. k-1 if not given
+                Sweep           - sweep data collecting the bytes not copied and holding
+                                  the parsed config template (optional)
+                restart_file    - restart file to start from instead of that of prev_k (optional)
 
 
             Outputs:
@@ -154,24 +584,21 @@ def run_SU2_config(self,Alt,Mach,AoA,Ref_values,Mesh,k):
 
 
             Assumptions:
+                Options are replaced by name. Options missing from the template
+                are appended to the case config
 
         '''
 
+        if warmstart is None:
+            warmstart = self.warmstart
+        if prev_k is None:
+            prev_k = k - 1
 
         # Compute standard atmospheric and reference properties
-        p_ref, T_ref, mu_ref = standard_atmosphere(Alt)
-        rho_ref = p_ref/(287*T_ref)
-        a_ref   = np.sqrt(1.4*287*T_ref)
-        V_ref   = Mach * a_ref
-
-        # Calculate Reynoldes number
-        Re = rho_ref * V_ref * Ref_values["Length"] / mu_ref               # Reynolcs number based on unit length
+        T_ref, Re = reference_conditions(Alt,Mach,Ref_values["Length"])
 
         # Create run directories and copy the case file there
-        if AoA[k] < 0:
-            new_direct  = 'Case_alt' + str("{:.2f}".format(Alt)) + '_Mach' + str("{:.2f}".format(Mach)) + '_AoA_' + str("{:.2f}".format(abs(AoA[k])))
-        else:    
-            new_direct  = 'Case_alt' + str("{:.2f}".format(Alt)) + '_Mach' + str("{:.2f}".format(Mach)) + '_AoA' + str("{:.2f}".format(AoA[k]))
+        new_direct  = case_directory_name(Alt,Mach,AoA[k])
         filename    = new_direct + '.cfg'
         file_direct = os.path.join(self.working_dir, new_direct)
 
@@ -179,118 +606,262 @@ def run_SU2_config(self,Alt,Mach,AoA,Ref_values,Mesh,k):
             shutil.rmtree(file_direct)
         os.mkdir(file_direct)
 
-        os.chdir(self.working_dir)
+        # Link the mesh file
+        bytes_avoided = link_file(os.path.join(self.working_dir,Mesh.filename), os.path.join(file_direct,Mesh.filename),
+                                  self.case_file_mode)
+
+        # Link the restart file
+        if warmstart == 'YES':
+            if restart_file is None:
+                restart_file = os.path.join(self.working_dir, case_directory_name(Alt,Mach,AoA[prev_k]), 'restart.dat')
+            prev_direct = os.path.basename(os.path.dirname(restart_file))
+            if not os.path.exists(restart_file):
+                # e.g. the warm-start case was stopped before its first solution output
+                print('No restart file in ' + prev_direct + ', ' + new_direct + ' starts from freestream')
+                warmstart = 'NO'
+
+        if warmstart == 'YES':
+            bytes_avoided   += link_file(restart_file, os.path.join(file_direct,'solution_flow.dat'),
+                                         self.case_file_mode)
+
+        if Sweep is not None:
+            Sweep.bytes_avoided.append(bytes_avoided)
             
-        shutil.copyfile(os.path.join(os.getcwd()+'/'+self.config_file), file_direct+'/'+filename) 
+        # Render the case config from the template by option name
+        if Sweep is not None and Sweep.get('template') is not None:
+            template = Sweep.template
+        else:
+            template = SU2ConfigTemplate(os.path.join(self.working_dir,self.config_file))
+
+        options = config_options(self,Mach,AoA[k],T_ref,Re,Ref_values,Mesh,warmstart)
+        template.write(os.path.join(file_direct,filename),options)
+
+
+        return filename
+
+
+
+def config_options(self,Mach,AoA,T_ref,Re,Ref_values,Mesh,warmstart):
+
+        ''' Returns the options set in the config template for a case
+
+            Inputs:
+                Solver          - solver settings
+                Mach            - mach number
+                AoA             - angle-of-attack [deg]
+                T_ref           - freestream temperature [K]
+                Re              - Reynolds number
+                Ref_values      - reference values for aero forces nad moments
+                Mesh            - mesh settings
+                warmstart       - 'YES' or 'NO'
+
+
+            Outputs:
+                options         - dictionary of SU2 option names and values
+
+
+            Assumptions:
+
+        '''
+
+        options = {"KIND_TURB_MODEL"        : self.turbulence_model,
+                   "MACH_NUMBER"            : Mach,
+                   "AOA"                    : AoA,
+                   "FREESTREAM_TEMPERATURE" : T_ref,
+                   "REYNOLDS_NUMBER"        : round(Re),
+                   "REYNOLDS_LENGTH"        : Ref_values["Length"],
+                   "REF_AREA"               : Ref_values["Area"],
+                   "REF_LENGTH"             : Ref_values["Length"],
+                   "REF_ORIGIN_MOMENT_X"    : Ref_values["Point"][2],
+                   "ITER"                   : self.max_iterations,
+                   "CONV_CAUCHY_EPS"        : self.tolerance,
+                   "MESH_FILENAME"          : Mesh.filename,
+                   "RESTART_SOL"            : warmstart,
+                   "OUTPUT_WRT_FREQ"        : self.save_frequency}
+        if self.dimensions == "3d" and self.symmetric is True:
+            # The case if a symmetry BC is used
+            options["MARKER_SYM"] = '( symmetry )'
+        if os.path.splitext(Mesh.filename)[1].lower() == '.cgns':
+            options["MESH_FORMAT"] = 'CGNS'
+
+
+        return options
+
+
+
+def tune_processors(self,Freestream,Mesh,Geometry,core_budget,n_cases,chain_length,mesh_digest):
+
+        ''' Chooses the MPI ranks per case that maximize the sweep throughput
+
+            Inputs:
+                Freestream      - Freestream conditions
+                Mesh            - Mesh settings
+                Geometry        - Geometric settings
+                core_budget     - cores shared by concurrent cases
+                n_cases         - number of cases in the sweep
+                chain_length    - number of cases in the longest warm-start chain
+                mesh_digest     - digest of the mesh file
 
-        # Copy the mesh file
-        if Mesh.operating_system == "WINDOWS":
-            shutil.copy(self.working_dir + '\\' + Mesh.filename, file_direct + '\\' + Mesh.filename)                               # copies the mesh file from the reference folder to the target one
+
+            Outputs:
+                processors      - MPI ranks per case
+
+
+            Assumptions:
+                1. The startup and per-iteration times of the mesh are measured once per
+                   mesh, solver setup, and machine and kept in working_dir/rank_tuning.json
+                2. Cases take Solver.processor_tuning["case_iterations"] iterations,
+                   Solver.max_iterations if it is None
+                3. Rank counts above the largest benchmarked one are not considered
+
+        '''
+
+        settings = self.processor_tuning
+        ranks    = sorted(set([int(p) for p in settings["rank_counts"] if p <= core_budget]))
+        if len(ranks) == 0:
+            ranks = [int(core_budget)]
+
+        key      = inputs_hash(mesh_digest, self.dimensions, self.turbulence_model, ranks,
+                               settings["iterations"], platform.node())
+        filename = os.path.join(self.working_dir,'rank_tuning.json')
+        model    = load_tuning(filename,key)
+        if model is None:
+            model = benchmark_ranks(self,Freestream,Mesh,Geometry,ranks,settings["iterations"])
+            save_tuning(filename,key,model)
         else:
-            shutil.copy(self.working_dir + '/' + Mesh.filename, file_direct + '/' + Mesh.filename)         
+            print('Using the stored rank tuning of ' + Mesh.filename)
 
-        # Copy the restart file
-        if self.warmstart == 'YES':
-            if AoA[k] < 0:
-                prev_direct  = 'Case_alt' + str("{:.2f}".format(Alt)) + '_Mach' + str("{:.2f}".format(Mach)) + '_AoA_' + str("{:.2f}".format(abs(AoA[k-1])))
-            else:    
-                prev_direct  = 'Case_alt' + str("{:.2f}".format(Alt)) + '_Mach' + str("{:.2f}".format(Mach)) + '_AoA' + str("{:.2f}".format(AoA[k-1]))
-            prev_file_direct = os.path.join(self.working_dir, prev_direct)
-            shutil.copyfile(prev_file_direct+'/restart.dat', file_direct+'/solution_flow.dat')        
+        case_iterations = settings["case_iterations"]
+        if case_iterations is None:
+            case_iterations = self.max_iterations
 
+        processors, concurrent, sweep_times = choose_ranks(model,core_budget,n_cases,chain_length,case_iterations,max(ranks))
 
-        os.chdir(file_direct)
-            
-        # Modify the reference config file
-        f = open(filename, 'r+')
-        cfg_data = f.readlines()
-        f.close()
-
-        if self.dimensions == "2d":
-            # Creates inputs according to the 2d airfoil template
-            cfg_data[3]   = 'KIND_TURB_MODEL= ' + self.turbulence_model + '\n'
-            cfg_data[8]   = 'MACH_NUMBER= ' + str(Mach) + '\n'
-            cfg_data[9]   = 'AOA= ' + str(AoA[k]) + '\n'
-            cfg_data[12]  = 'FREESTREAM_TEMPERATURE= ' + str(T_ref) + '\n'
-            cfg_data[13]  = 'REYNOLDS_NUMBER= ' + str(round(Re)) + '\n'
-            cfg_data[14]  = 'REYNOLDS_LENGTH= ' + str(Ref_values["Length"] ) + '\n'
-            cfg_data[18]  = 'REF_AREA= ' + str(Ref_values["Area"]) + '\n'
-            cfg_data[19]  = 'REF_LENGTH= ' + str(Ref_values["Length"] ) + '\n'
-            cfg_data[20]  = 'REF_ORIGIN_MOMENT_X= ' + str(Ref_values["Point"][2]) + '\n'
-            cfg_data[81]  = 'ITER= ' + str(self.max_iterations) + '\n'
-            cfg_data[95]  = 'CONV_CAUCHY_EPS= ' + str(self.tolerance) + '\n'
-            cfg_data[100] = 'MESH_FILENAME= ' + Mesh.filename + '\n'
-            cfg_data[102] = 'RESTART_SOL= ' + self.warmstart + '\n'
-            cfg_data[104] = 'OUTPUT_WRT_FREQ= ' + str(self.save_frequency) + '\n'
-        elif self.dimensions == "3d":
-            # Creates inputs according to the 3d airfoil template
-            cfg_data[19] = 'KIND_TURB_MODEL= ' + self.turbulence_model + '\n'
-            cfg_data[30] = 'MACH_NUMBER= ' + str(Mach) + '\n'
-            cfg_data[33] = 'AOA= ' + str(AoA[k]) + '\n'
-            cfg_data[39] = 'FREESTREAM_TEMPERATURE= ' + str(T_ref) + '\n'
-            cfg_data[42] = 'REYNOLDS_NUMBER= ' + str(round(Re)) + '\n'
-            cfg_data[45] = 'REYNOLDS_LENGTH= ' + str(Ref_values["Length"]) + '\n'
-            cfg_data[93] = 'REF_ORIGIN_MOMENT_X= ' + str(Ref_values["Point"][2]) + '\n'
-            cfg_data[98] = 'REF_LENGTH= ' + str(Ref_values["Length"]) + '\n'
-            cfg_data[101] = 'REF_AREA= ' + str(Ref_values["Area"]) + '\n'
-            if self.symmetric is True:
-                # The case if a symmetry BC is used
-                cfg_data[112] = 'MARKER_SYM= ( symmetry ) \n'
-                cfg_data[139] = 'ITER= ' + str(self.max_iterations) + '\n'
-                cfg_data[226] = 'CONV_CAUCHY_EPS= ' + str(self.tolerance) + '\n'
-                cfg_data[238] = 'MESH_FILENAME= ' + Mesh.filename + '\n'
-                cfg_data[25 ] = 'RESTART_SOL= ' + self.warmstart + '\n'
-                cfg_data[281] = 'OUTPUT_WRT_FREQ= ' + str(self.save_frequency) + '\n'
-            else:
-                cfg_data[216] = 'ITER= ' + str(self.max_iterations) + '\n'
-                cfg_data[230] = 'CONV_CAUCHY_EPS= ' + str(self.tolerance) + '\n'
-                cfg_data[236] = 'MESH_FILENAME= ' + Mesh.filename + '\n'
-                cfg_data[239] = 'RESTART_SOL= ' + self.warmstart + '\n'
-                cfg_data[240] = 'OUTPUT_WRT_FREQ= ' + str(self.save_frequency) + '\n'
-                            
-        f = open(filename, 'w')
-        for item in cfg_data:
-                f.write(item)
-        f.close()
+        print('Rank tuning: ' + str(processors) + ' ranks per case, ' + str(concurrent) + ' cases at once. Predicted sweep time ' + \
+              str("{:.0f}".format(sweep_times[processors])) + ' s')
+        if self.processors in sweep_times:
+            print('Predicted sweep time with ' + str(self.processors) + ' ranks per case: ' + \
+                  str("{:.0f}".format(sweep_times[self.processors])) + ' s')
 
 
-        return filename
+        return processors
+
+
+
+def benchmark_ranks(self,Freestream,Mesh,Geometry,ranks,iterations):
+
+        ''' Times short SU2 runs of the sweep mesh at several rank counts
+
+            Inputs:
+                Freestream      - Freestream conditions
+                Mesh            - Mesh settings
+                Geometry        - Geometric settings
+                ranks           - MPI rank counts
+                iterations      - two iteration counts. The time difference between
+                                  them gives the time per iteration
 
 
+            Outputs:
+                model           - measured times and the fitted "startup" and
+                                  "iteration" time models (see fit_scaling)
 
-def launch_SU2(processors,filename):
+
+            Assumptions:
+                1. The runs use the first altitude and Mach number and the angle-of-attack
+                   nearest to zero, started from freestream in working_dir/Rank_tuning
+                2. Convergence criteria are disabled so every run takes all its iterations
+
+        '''
+
+        bench_direct = os.path.join(self.working_dir,'Rank_tuning')
+        if os.path.exists(bench_direct):
+            shutil.rmtree(bench_direct)
+        os.mkdir(bench_direct)
+        link_file(os.path.join(self.working_dir,Mesh.filename), os.path.join(bench_direct,Mesh.filename), self.case_file_mode)
+
+        Alt  = Freestream.Altitude[0]
+        Mach = Freestream.Mach[0]
+        AoA  = Freestream.Angle_of_attack[int(np.argmin(np.abs(Freestream.Angle_of_attack)))]
+        T_ref, Re = reference_conditions(Alt,Mach,Geometry.reference_values["Length"])
+        template  = SU2ConfigTemplate(os.path.join(self.working_dir,self.config_file))
+
+        n_low  = int(min(iterations))
+        n_high = int(max(iterations))
+        times  = {n_low: [], n_high: []}
+        for p in ranks:
+            for n in times.keys():
+                options = config_options(self,Mach,AoA,T_ref,Re,Geometry.reference_values,Mesh,'NO')
+                options.update({"ITER"                 : n,
+                                "OUTPUT_WRT_FREQ"      : n,
+                                "CONV_CAUCHY_EPS"      : 1e-30,
+                                "CONV_RESIDUAL_MINVAL" : -30})
+                filename = 'ranks_' + str(p) + '_iter_' + str(n) + '.cfg'
+                template.write(os.path.join(bench_direct,filename),options)
+
+                print('Rank tuning: ' + str(n) + ' iterations on ' + str(p) + ' ranks')
+                start = time.perf_counter()
+                launch_SU2(p,filename,bench_direct)
+                times[n].append(time.perf_counter() - start)
+
+        t_low  = np.array(times[n_low])
+        t_high = np.array(times[n_high])
+        if n_high > n_low:
+            iteration = np.maximum((t_high - t_low) / (n_high - n_low), 0.0)
+        else:
+            iteration = t_high / n_high
+        startup = np.maximum(t_low - n_low*iteration, 0.0)
+
+        shutil.rmtree(bench_direct)
+
+        model = {"ranks"          : ranks,
+                 "iterations"     : [n_low, n_high],
+                 "times"          : [t_low.tolist(), t_high.tolist()],
+                 "startup"        : fit_scaling(ranks, startup),
+                 "iteration"      : fit_scaling(ranks, iteration)}
+
+
+        return model
+
+
+
+def launch_SU2(processors,filename,file_direct,monitor=None,backend=None,sampler=None):
 
     ''' Runs SU2
             
         Inputs:
-            SU2_settings     - Array of SU2 prescribed settings
+            processors       - number of MPI ranks
             filename         - Generated journal filename
+            file_direct      - case directory
+            monitor          - ConvergenceMonitor that may stop the solver early (optional)
+            backend          - execution backend, None to run SU2 as a local process
+            sampler          - ResourceSampler of the run (optional)
 
         Outputs:
-                    
+            status           - monitor status (stop reason, iterations, last coefficients),
+                               None if the case ran without a monitor
 
         Assumptions:
+            The solver output is written to SU2_output.log in the case directory
 
     '''
 
-    # Run SU2
-    #, stdin=subprocess.PIPE
-
-    f = open('SU2_output.log', 'w')
-    f.write('here')
+    command = ['mpiexec', '-n',str(processors),'SU2_CFD', filename]
+    if backend is None:
+        backend = LocalBackend()
 
-    print(os.getcwd())
-    print(['mpiexec', '-n',str(processors),'SU2_CFD', filename])
-    print(' '.join(['mpiexec', '-n',str(processors),'SU2_CFD', filename]))
-
-    subprocess.call(['mpiexec', '-n',str(processors),'SU2_CFD', filename], stdout= f, stderr= None, stdin=subprocess.PIPE)
+    # Run SU2
+    if monitor is not None:
+        return monitor.run(command,file_direct,'SU2_output.log',backend,processors,sampler)
 
-    f.close()    
-    #with open('SU2_output.log', 'w') as f:
-        #subprocess.call(['mpiexec', '-n',str(processors),'SU2_CFD', filename], stdout= f, stderr= None, stdin=subprocess.PIPE)
+    job = backend.submit(command,file_direct,'SU2_output.log',processors)
+    if sampler is not None:
+        sampler.start(job)
+    job.wait()
+    if sampler is not None:
+        sampler.stop()
 
 
-    return
+    return None
 
 
 def read_results(output_file):
@@ -303,20 +874,12 @@ def read_results(output_file):
                 Cl, Cd, Cm
 
             Assumptions:
+                The final coefficient table row is found by its contents (see read_log)
 
     '''
 
-        # Read results 
-    with open(output_file, 'r') as f:
-        last_line = f.readlines()[-37]
-
-    results_array = last_line.split('|')
-
-    Cl = float(results_array[-4])
-    Cd = float(results_array[-5])
-    Cm = float(results_array[-3])
-
-
-    return Cl, Cd, Cm
+    # Read results 
+    results = read_log(output_file)
 
 
+    return results.CL, results.CD, results.CM
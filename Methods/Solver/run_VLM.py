@@ -0,0 +1,428 @@
+import os
+import numpy as np
+
+from Core.Data                           import Data
+from Core.Trace                          import span
+from Methods.Solver.result_store         import ResultStore, export_workbook
+from Methods.Solver.sweep_result         import SweepResult
+
+def solve(self,Freestream,Mesh,Geometry):
+
+        ''' Runs a vortex-lattice sweep for wings
+
+        Available sweeps:
+            Altitude
+            Mach
+            angle-of-attack
+
+
+        Inputs:
+            Freestream  - Freestream conditions
+            Mesh        - Mesh settings
+            Geometry    - Geometric settings
+
+
+        Outputs:
+            Result      - SweepResult lookup table of Cl, Cd (induced drag CDi), and Cm,
+                          also saved to working_dir/sweep_result.npz
+
+
+        Assumptions:
+            1. Reference axes as in Geometry.create_wing_geometry:
+                3D:     X - chordwise
+                        Y - vertical
+                        Z - spanwise
+            2. Inviscid potential flow with the Prandtl-Glauert correction, so the
+               results do not depend on the altitude
+            3. The lattice is built from the segment chords, spanwise locations,
+               sweep, dihedral, and incidence. Airfoil camber is included through
+               the normals if the segment airfoils were generated (Airfoil.points)
+            4. The wing is mirrored about the root plane if Solver.symmetric is True.
+               Forces are integrated over the modelled half, as in SU2
+            5. The influence matrix is factored once per Mach number and all
+               angles-of-attack are solved as one multi-right-hand-side system
+            6. Induced drag is computed in the Trefftz plane
+            7. Moments are taken about Geometry.reference_values["Point"]
+            8. Results are written to the result store in working_dir/results together
+               with the spanwise loading (cl_span at span_location). arrays.xlsx is
+               exported from it if Solver.export_workbook is True
+
+        '''
+
+
+        # Define inputs
+        #--------------------------------------------------------------------
+        len_Alt  = len(Freestream.Altitude)
+        len_Mach = len(Freestream.Mach)
+
+        with span('Lattice generation'):
+            lattice = vortex_lattice(Geometry,self.vlm_chordwise_panels,self.vlm_spanwise_panels)
+
+        store = ResultStore(os.path.join(self.working_dir,'results'),
+                            {"Altitude"        : Freestream.Altitude,
+                             "Mach"            : Freestream.Mach,
+                             "Angle_of_attack" : Freestream.Angle_of_attack})
+
+        for j in range(len_Mach):
+
+            # Solve all angles-of-attack at once
+            with span('VLM solution', Mach=float(Freestream.Mach[j])):
+                results = vlm_coefficients(lattice,Freestream.Angle_of_attack,Freestream.Mach[j],
+                                           Geometry.reference_values,self.symmetric)
+            results["span_location"] = np.tile(lattice.span_location,(len(Freestream.Angle_of_attack),1))
+
+            for i in range(len_Alt):
+                store.append((i,j),results)
+
+        # Gather results
+        data = store.consolidate()
+
+        # Write data into an Excel file
+        if self.export_workbook is True:
+            export_workbook(data,os.path.join(self.working_dir,'arrays.xlsx'))
+
+        print('CL:')
+        print(data.Cl)
+        print('CDi:')
+        print(data.Cd)
+        print('CM:')
+        print(data.Cm)
+
+        Result = SweepResult(data.axes,{"Cl": data.Cl, "Cd": data.Cd, "Cm": data.Cm})
+        Result.save(os.path.join(self.working_dir,'sweep_result.npz'))
+
+
+        return Result
+
+
+
+def vortex_lattice(Geometry,n_chord,n_span):
+
+        ''' Builds the horseshoe vortex lattice of a wing
+
+            Inputs:
+                Geometry.Segments   - wing sections (chord, spanwise_location, leading_edge_sweep,
+                                      dihedral, incidence, Airfoil.points)
+                n_chord             - number of chordwise panels
+                n_span              - number of spanwise panels per wing segment
+
+
+            Outputs:
+                lattice.A, B            - outboard and inboard ends of the bound vortices
+                                          at the panel quarter-chords [n_panels, 3]
+                       .collocation     - collocation points at the panel three-quarter chords
+                       .normal          - panel normals including the camber slope
+                       .strip_edges     - trailing edge points of the strip edges [n_strips + 1, 3]
+                       .strip_chord     - mean chords of the strips [n_strips]
+                       .span_location   - spanwise locations of the strip midpoints [n_strips]
+                       .n_chord         - number of chordwise panels
+
+
+            Assumptions:
+                1. Sections are placed as in Geometry.create_wing_geometry: the leading
+                   edge follows the sweep and dihedral of the inboard section and the
+                   chord is rotated by the incidence about the leading edge
+                2. Panels are uniform in the chordwise direction and follow a cosine
+                   distribution within every segment
+                3. Panels are numbered chordwise first, strip by strip from the root
+
+        '''
+
+        num_segm = len(Geometry.Segments.keys())
+        if num_segm < 2:
+            raise Exception('The vortex-lattice solver needs at least two wing segments')
+
+        # Section leading and trailing edges
+        LE     = np.zeros((num_segm,3))
+        TE     = np.zeros((num_segm,3))
+        camber = np.zeros((num_segm,n_chord))
+        xc_col = (np.arange(n_chord) + 0.75)/n_chord
+        for i in range(num_segm):
+            Segment = Geometry.Segments[i]
+            if i > 0:
+                dZ = Segment.spanwise_location - Geometry.Segments[i-1].spanwise_location
+                LE[i,0] = LE[i-1,0] + dZ * np.tan(np.radians(Geometry.Segments[i-1].leading_edge_sweep))
+                LE[i,1] = LE[i-1,1] + dZ * np.tan(np.radians(Geometry.Segments[i-1].dihedral))
+            LE[i,2] = Segment.spanwise_location
+
+            incidence = np.radians(Segment.incidence)
+            TE[i]     = LE[i] + Segment.chord * np.array([np.cos(incidence), -np.sin(incidence), 0.0])
+            camber[i] = camber_slope(Segment.Airfoil,xc_col)
+
+        # Spanwise stations as fractional section indices
+        eta      = 0.5*(1 - np.cos(np.linspace(0,np.pi,n_span+1)))
+        stations = np.concatenate([[0.0]] + [i + eta[1:] for i in range(num_segm-1)])
+
+        def interpolate(values,u):
+            i0 = np.minimum(np.floor(u).astype(int), num_segm-2)
+            w  = (u - i0).reshape((-1,) + (1,)*(values.ndim-1))
+            return (1 - w)*values[i0] + w*values[i0+1]
+
+        LE_s = interpolate(LE,stations)
+        TE_s = interpolate(TE,stations)
+
+        # Lattice nodes [n_strips + 1, n_chord + 1, 3]
+        xc    = np.linspace(0,1,n_chord+1)
+        nodes = LE_s[:,None,:] + xc[None,:,None]*(TE_s - LE_s)[:,None,:]
+
+        p1 = nodes[:-1,:-1]         # leading edge, inboard
+        p2 = nodes[1:,:-1]          # leading edge, outboard
+        p3 = nodes[1:,1:]           # trailing edge, outboard
+        p4 = nodes[:-1,1:]          # trailing edge, inboard
+
+        lattice = Data()
+        lattice.A           = (p2 + 0.25*(p3 - p2)).reshape(-1,3)
+        lattice.B           = (p1 + 0.25*(p4 - p1)).reshape(-1,3)
+        lattice.collocation = (0.5*(p1 + 0.75*(p4 - p1) + p2 + 0.75*(p3 - p2))).reshape(-1,3)
+
+        normal  = np.cross(p3 - p1, p4 - p2)
+        normal /= np.linalg.norm(normal,axis=-1,keepdims=True)
+        chordwise  = 0.5*(p3 + p4 - p1 - p2)
+        chordwise /= np.linalg.norm(chordwise,axis=-1,keepdims=True)
+
+        # Tilt the normals by the camber slope at the collocation points
+        delta = np.arctan(interpolate(camber,0.5*(stations[:-1] + stations[1:])))[:,:,None]
+        lattice.normal = (np.cos(delta)*normal - np.sin(delta)*chordwise).reshape(-1,3)
+
+        chords = np.linalg.norm(TE_s - LE_s,axis=-1)
+        lattice.strip_edges   = TE_s
+        lattice.strip_chord   = 0.5*(chords[:-1] + chords[1:])
+        lattice.span_location = 0.5*(LE_s[:-1,2] + LE_s[1:,2])
+        lattice.n_chord       = n_chord
+
+
+        return lattice
+
+
+
+def camber_slope(Airfoil,xc):
+
+        ''' Returns the camber line slope of a generated airfoil
+
+            Inputs:
+                Airfoil.points  - points from create_PARSEC_airfoil or create_CST_airfoil
+                xc              - chord fractions
+
+
+            Outputs:
+                slope           - camber line slope at xc, zero if the airfoil has no points
+
+
+            Assumptions:
+                The camber line of flapped airfoils is taken from the main element
+
+        '''
+
+        if 'points' not in Airfoil:
+            return np.zeros(len(xc))
+
+        points = Airfoil.points
+
+        # Order both surfaces from the leading to the trailing edge
+        x_up, y_up = np.asarray(points.xx_no_fl_suc, dtype=float), np.asarray(points.yy_no_fl_suc, dtype=float)
+        x_lo, y_lo = np.asarray(points.xx_no_fl_pre, dtype=float), np.asarray(points.yy_no_fl_pre, dtype=float)
+        if x_up[0] > x_up[-1]:
+            x_up, y_up = x_up[::-1], y_up[::-1]
+        if x_lo[0] > x_lo[-1]:
+            x_lo, y_lo = x_lo[::-1], y_lo[::-1]
+
+        x      = np.linspace(0,1,201)
+        camber = 0.5*(np.interp(x,x_up,y_up) + np.interp(x,x_lo,y_lo))
+
+
+        return np.interp(xc,x,np.gradient(camber,x))
+
+
+
+def vlm_coefficients(lattice,AoA,Mach,reference_values,symmetric):
+
+        ''' Solves the vortex lattice for a set of angles-of-attack
+
+            Inputs:
+                lattice             - vortex lattice (see vortex_lattice)
+                AoA                 - angles-of-attack [deg]
+                Mach                - Mach number
+                reference_values    - Geometry.reference_values (Area, Length, Point)
+                symmetric           - mirror the wing about the root plane
+
+
+            Outputs:
+                results.Cl, Cd, Cm  - lift, induced drag, and pitching moment coefficients [n_aoa]
+                       .cl_span     - section lift coefficients of the strips [n_aoa, n_strips]
+
+
+            Assumptions:
+                1. Unit freestream velocity and density. The wake trails parallel to X
+                2. The Prandtl-Glauert transformation stretches the lattice by 1/beta in X.
+                   The boundary conditions and forces use the physical geometry
+                3. Lift and moment from the Kutta-Joukowski theorem on the bound vortices
+
+        '''
+
+        import scipy.linalg
+
+        alpha = np.radians(np.atleast_1d(np.asarray(AoA, dtype=float)))
+        beta  = np.sqrt(1 - Mach**2)
+
+        area  = reference_values["Area"]
+        chord = reference_values["Length"]
+        point = np.asarray(reference_values["Point"], dtype=float)
+
+        # Influence matrix of the Prandtl-Glauert stretched lattice
+        stretch  = np.array([1/beta, 1.0, 1.0])
+        velocity = horseshoe_velocity(lattice.collocation*stretch,lattice.A*stretch,lattice.B*stretch)
+        if symmetric is True:
+            mirror    = np.array([1.0, 1.0, -1.0])
+            velocity += horseshoe_velocity(lattice.collocation*stretch,lattice.B*stretch*mirror,lattice.A*stretch*mirror)
+        velocity[:,:,0] /= beta
+
+        AIC = np.einsum('ijk,ik->ij', velocity, lattice.normal)
+
+        # Freestream normal velocities of all angles-of-attack
+        V_inf = np.column_stack((np.cos(alpha), np.sin(alpha), np.zeros(len(alpha))))
+        rhs   = -lattice.normal @ V_inf.T
+
+        # Factor once, solve all angles-of-attack
+        lu_piv = scipy.linalg.lu_factor(AIC)
+        gamma  = scipy.linalg.lu_solve(lu_piv, rhs)
+
+        # Kutta-Joukowski forces of the bound vortices [n_panels, n_aoa, 3]
+        bound  = lattice.B - lattice.A
+        force  = gamma[:,:,None] * np.cross(V_inf[None,:,:], bound[:,None,:])
+        lift   = force[:,:,0]*(-np.sin(alpha)) + force[:,:,1]*np.cos(alpha)
+
+        arm    = 0.5*(lattice.A + lattice.B) - point
+        moment = arm[:,None,0]*force[:,:,1] - arm[:,None,1]*force[:,:,0]
+
+        results    = Data()
+        results.Cl = np.sum(lift,axis=0)/(0.5*area)
+        results.Cd = trefftz_drag(lattice,gamma,symmetric)/(0.5*area)
+        results.Cm = -np.sum(moment,axis=0)/(0.5*area*chord)
+
+        # Spanwise loading
+        n_strips   = len(lattice.strip_chord)
+        strip_lift = lift.reshape(n_strips,lattice.n_chord,len(alpha)).sum(axis=1)
+        strip_edge = lattice.strip_edges[:,1:]
+        width      = np.linalg.norm(np.diff(strip_edge,axis=0),axis=-1)
+        results.cl_span = (strip_lift/(0.5*lattice.strip_chord*width)[:,None]).T
+
+
+        return results
+
+
+
+def trefftz_drag(lattice,gamma,symmetric):
+
+        ''' Computes the induced drag in the Trefftz plane
+
+            Inputs:
+                lattice     - vortex lattice (see vortex_lattice)
+                gamma       - horseshoe vortex strengths [n_panels, n_aoa]
+                symmetric   - mirror the wing about the root plane
+
+
+            Outputs:
+                drag        - induced drag of the modelled wing [n_aoa]
+
+
+            Assumptions:
+                The trailing vortices leave the strip edges at the trailing edge and
+                are straight lines in the Trefftz plane (Y-Z)
+
+        '''
+
+        n_strips = len(lattice.strip_chord)
+
+        # Strip circulations and trailing vortex strengths at the strip edges
+        circulation = gamma.reshape(n_strips,lattice.n_chord,-1).sum(axis=1)
+        shed        = np.zeros((n_strips+1,circulation.shape[1]))
+        shed[:-1]  += circulation
+        shed[1:]   -= circulation
+
+        # Strip midpoints, widths, and normals in the Trefftz plane
+        edges  = lattice.strip_edges[:,1:]
+        middle = 0.5*(edges[:-1] + edges[1:])
+        side   = np.diff(edges,axis=0)
+        width  = np.linalg.norm(side,axis=-1)
+        normal = np.column_stack((side[:,1], -side[:,0]))/width[:,None]
+
+        # Normal velocities induced by unit 2D vortices at the strip edges
+        def normalwash(edges):
+            r  = middle[:,None,:] - edges[None,:,:]
+            r2 = np.sum(r**2,axis=-1)
+            return (-r[:,:,1]*normal[:,None,0] + r[:,:,0]*normal[:,None,1])/(2*np.pi*r2)
+
+        wash = normalwash(edges)
+        if symmetric is True:
+            wash -= normalwash(edges*np.array([1.0, -1.0]))
+
+
+        return -0.5*np.sum(circulation*(wash @ shed)*width[:,None],axis=0)
+
+
+
+def horseshoe_velocity(points,A,B):
+
+        ''' Velocities induced by unit-strength horseshoe vortices
+
+            Inputs:
+                points      - evaluation points [n, 3]
+                A, B        - bound vortex ends [m, 3]. The vortex trails from +X infinity
+                              to A, runs from A to B, and trails from B to +X infinity
+
+
+            Outputs:
+                velocity    - [n, m, 3]
+
+
+            Assumptions:
+                Points on a vortex line induce no velocity
+
+        '''
+
+        r1 = points[:,None,:] - A[None,:,:]
+        r2 = points[:,None,:] - B[None,:,:]
+
+
+        return segment_velocity(r1,r2) + trailing_velocity(r2) - trailing_velocity(r1)
+
+
+
+def segment_velocity(r1,r2):
+
+        ''' Biot-Savart law of a finite vortex segment from r1 to r2, relative to the point '''
+
+        r0    = r1 - r2
+        cross = np.cross(r1,r2)
+        c2    = np.sum(cross**2,axis=-1)
+        n1    = np.linalg.norm(r1,axis=-1)
+        n2    = np.linalg.norm(r2,axis=-1)
+
+        core = c2 <= 1e-12*np.sum(r0**2,axis=-1)**2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            factor = np.sum(r0*(r1/n1[...,None] - r2/n2[...,None]),axis=-1)/(4*np.pi*c2)
+        factor[core] = 0.0
+
+
+        return factor[...,None]*cross
+
+
+
+def trailing_velocity(r):
+
+        ''' Biot-Savart law of a semi-infinite vortex line from the point r away to +X infinity '''
+
+        h2   = r[...,1]**2 + r[...,2]**2
+        norm = np.linalg.norm(r,axis=-1)
+
+        core = h2 <= 1e-12*norm**2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            factor = (1 + r[...,0]/norm)/(4*np.pi*h2)
+        factor[core] = 0.0
+
+        velocity = np.zeros(r.shape)
+        velocity[...,1] = -factor*r[...,2]
+        velocity[...,2] =  factor*r[...,1]
+
+
+        return velocity
@@ -1,12 +1,16 @@
-import subprocess
 import os
 import numpy as np
-import os
-import subprocess
 import shutil
-import xlsxwriter
 
-from Methods.Atmosphere.standard_atmosphere import standard_atmosphere
+from Core.Trace                          import span
+from Methods.Solver.case_scheduler       import CaseScheduler
+from Methods.Solver.display_server       import DisplayServer
+from Methods.Solver.result_cache         import ResultCache
+from Methods.Solver.result_store         import ResultStore, export_workbook
+from Methods.Solver.sweep_result         import SweepResult
+from Methods.Solver.execution_backend    import execution_backend, LocalBackend
+from Methods.Solver.resource_sampler     import ResourceSampler
+from Methods.Solver.miscellaneous_solver import case_directory_name, link_file, reference_conditions
 
 def solve(self,Freestream,Mesh,Geometry,airfoil_filepath):
 
@@ -25,7 +29,8 @@ def solve(self,Freestream,Mesh,Geometry,airfoil_filepath):
             
 
         Outputs:
-            CL, CD, CM
+            Result      - SweepResult lookup table of Cl, Cd, Cm, also saved
+                          to working_dir/sweep_result.npz
 
 
         Assumptions:
@@ -33,6 +38,24 @@ def solve(self,Freestream,Mesh,Geometry,airfoil_filepath):
                 2D:     X - horizontal (chordwise)
                         Y - vertical
             7. Standard atmosphere in SI units is used
+            8. Up to Solver.parallel_workers Xfoil sessions run at once, each
+               in its own case directory
+            9. With Solver.cache_dir set, polars of previously solved cases are
+               taken from the result cache
+            10. Each Xfoil session runs up to Solver.xfoil_batch_size (Altitude, Mach)
+                pairs, loading and repaneling the airfoil once
+            11. Solver.xfoil_display selects the X display of the sessions: a new
+                Xvfb per session ('xvfb-run'), one Xvfb shared by the sweep ('shared'),
+                or no display with the graphics switched off ('none')
+            12. Polars are appended to the result store in working_dir/results after
+                every session. arrays.xlsx is exported from it if Solver.export_workbook is True
+            13. Xfoil sessions are executed by Solver.execution_backend (see run_SU2.solve).
+                With a batch or work-queue backend up to max_cores of the backend settings
+                run at once, and the 'shared' display is not reachable from other nodes
+            14. With Solver.sample_resources set to True, the resource usage of every
+                local Xfoil session is stored with the results of all its pairs
+            15. Polar points are matched to the sweep by angle-of-attack. Angles-of-attack
+                that Xfoil did not converge are NaN
 
         '''
 
@@ -45,79 +68,169 @@ def solve(self,Freestream,Mesh,Geometry,airfoil_filepath):
         #--------------------------------------------------------------------
         len_Alt  = len(Freestream.Altitude)
         len_Mach = len(Freestream.Mach)
-        len_AoA  = len(Freestream.Angle_of_attack)
 
-        Cl = np.zeros((len_Alt,len_Mach,len_AoA))                               # Array of Cl
-        Cd = np.zeros((len_Alt,len_Mach,len_AoA))                               # Array of Cd
-        Cm = np.zeros((len_Alt,len_Mach,len_AoA))                               # Array of Cm
+        if self.cache_dir is None:
+            cache = None
+        else:
+            cache = ResultCache(self.cache_dir,self.cache_size_limit)
+
+        # Polars are appended to the result store after every session
+        store = ResultStore(os.path.join(self.working_dir,'results'),
+                            {"Altitude"        : Freestream.Altitude,
+                             "Mach"            : Freestream.Mach,
+                             "Angle_of_attack" : Freestream.Angle_of_attack})
+
+        # Run the (Altitude, Mach) pairs in batches of Solver.xfoil_batch_size conditions
+        # per Xfoil session and the sessions in a pool of workers
+        pairs      = [(i,j) for i in range(len_Alt) for j in range(len_Mach)]
+        batch_size = max(1,int(self.xfoil_batch_size))
+
+        backend = execution_backend(self.execution_backend,self.backend_settings,self.working_dir)
+        if backend.max_cores is None:
+            scheduler = CaseScheduler(self.parallel_workers)
+        else:
+            scheduler = CaseScheduler(backend.max_cores)
 
-        # Initialize the workbook
-        workbook  = xlsxwriter.Workbook('arrays.xlsx')
+        # The sessions share the display opened for the sweep
+        with DisplayServer(self.xfoil_display) as display:
+            for b in range(0,len(pairs),batch_size):
+                batch = pairs[b:b+batch_size]
+                case  = (lambda batch=batch: run_case(self,Freestream,Mesh,Geometry,airfoil_filepath,batch,cache,display,store,backend))
+                scheduler.add_case(b//batch_size,1,case)
 
-        for i in range(len_Alt):
-            for j in range(len_Mach):
+            scheduler.run()
 
-                # Run the solution
+        # Gather results
+        data = store.consolidate()
 
-                # Create an Xfoil
-                filename = run_Xfoil_config(self,Freestream.Altitude[i],Freestream.Mach[j], \
-                                         Freestream.Angle_of_attack,Geometry,Mesh,airfoil_filepath)
+        # Write data into an Excel file 
+        if self.export_workbook is True:
+            export_workbook(data,os.path.join(self.working_dir,'arrays.xlsx'))
 
-                # Run Xfoil
-                new_direct  = 'Case_alt' + str("{:.2f}".format(Freestream.Altitude[i])) + '_Mach' + \
-                                                    str("{:.2f}".format(Freestream.Mach[j])) 
-                file_direct = os.path.join(self.working_dir, new_direct)
-                filename1   = os.path.join(file_direct, filename)
+        print('CL:')
+        print(data.Cl)
+        print('CD:')
+        print(data.Cd)
+        print('CM:')
+        print(data.Cm)
 
-                os.chdir(file_direct)
+        Result = SweepResult(data.axes,{"Cl": data.Cl, "Cd": data.Cd, "Cm": data.Cm})
+        Result.save(os.path.join(self.working_dir,'sweep_result.npz'))
 
-                print('Running Solution ' + filename)
-                with open('Xfoil_output.log', 'w') as f:
-                    subprocess.run(["xvfb-run", "-a", "xfoil", "-n"], stdin=open(filename, "r"), stdout= f, stderr= None)
 
-                print('Solution ' + filename + ' Completed')
+        return Result
 
-                # Read results
-                Cl[i,j,:],Cd[i,j,:],Cm[i,j,:] = read_results('polar.dat',len_AoA)
 
-            # Write data into an Excel file 
-            os.chdir(self.working_dir)
-            sheetname = 'Altitude ' + str(Freestream.Altitude[i]) + 'm'
-            worksheet = workbook.add_worksheet(name=sheetname)
 
-            # create the 2D table frame
-            worksheet.write(0, 0,"Cl")
-            worksheet.write(0, 2*len_Mach,"Cd")
-            worksheet.write(0, 3*len_Mach+2,"Cm")
-            worksheet.write(1, 0,"AoA\Mach")
-            worksheet.write(1, 2*len_Mach,"AoA\Mach")
-            worksheet.write(1, 3*len_Mach+2,"AoA\Mach")
-            for j in range(len_Mach):
-                for k in range(len_AoA):
-                    worksheet.write(1, j+1, Freestream.Mach[j])
-                    worksheet.write(1, len_Mach + j+3, Freestream.Mach[j])
-                    worksheet.write(1, 2*len_Mach + j+5, Freestream.Mach[j])
-                    worksheet.write(k+2, 0, Freestream.Angle_of_attack[k])
-                    worksheet.write(k+2, len_Mach+2, Freestream.Angle_of_attack[k])
-                    worksheet.write(k+2, 2*len_Mach+4, Freestream.Angle_of_attack[k])
+def run_case(self,Freestream,Mesh,Geometry,airfoil_filepath,batch,cache=None,display=None,store=None,backend=None):
 
-                    worksheet.write(k+2, j+1, Cl[i,j,k])
-                    worksheet.write(k+2, len_Mach + j+3, Cd[i,j,k])
-                    worksheet.write(k+2, 2*len_Mach + j+5, Cm[i,j,k])
+        ''' Sets up, runs, and reads the polars of a batch of (Altitude, Mach) pairs
+            in one Xfoil session
+        
+            Inputs:
+                Freestream          - Freestream conditions
+                Mesh                - Mesh settings
+                Geometry            - Geometric settings
+                airfoil_filepath    - directory of the airfoil coordinate files
+                batch               - list of (altitude, Mach) index pairs
+                cache               - result cache, None if disabled
+                display             - DisplayServer of the sweep, None for xvfb-run
+                store               - result store the polars are appended to, None if disabled
+                backend             - execution backend of the session, None for a local process
 
 
+            Outputs:
+                results             - dictionary of (Cl, Cd, Cm) arrays over the
+                                      angle-of-attack sweep for every index pair
 
-        workbook.close()
 
-        print('CL:')
-        print(Cl)
-        print('CD:')
-        print(Cd)
-        print('CM:')
-        print(Cm)
+            Assumptions:
+                1. Cached results are keyed by the single-condition command script and
+                   the airfoil file contents, so they do not depend on the batch size
+                2. The session runs in the case directory of the first pair not found
+                   in the cache and writes every polar into its own case directory
+
+        '''
+
+        airfoil_file = Geometry.Segments['section_1'].Airfoil['files']['merged']
+
+        results    = {}
+        pending    = []
+        cache_keys = {}
+        for (i,j) in batch:
+            Alt  = Freestream.Altitude[i]
+            Mach = Freestream.Mach[j]
+
+            # Create the case directory
+            new_direct  = case_directory_name(Alt,Mach)
+            file_direct = os.path.join(self.working_dir, new_direct)
+            if os.path.exists(file_direct) and os.path.isdir(file_direct):
+                shutil.rmtree(file_direct)
+            os.mkdir(file_direct)
+
+            link_file(os.path.join(airfoil_filepath,airfoil_file), os.path.join(file_direct,airfoil_file), self.case_file_mode)
+
+            # Look the case up in the result cache
+            if cache is not None:
+                commands = xfoil_commands(self,Mesh,airfoil_file,Freestream.Angle_of_attack,[(Alt,Mach,'polar.dat')],Geometry)
+                with open(os.path.join(file_direct,airfoil_file), 'rb') as f:
+                    cache_keys[(i,j)] = cache.key(commands,f.read())
+
+                cached = cache.lookup(cache_keys[(i,j)],file_direct,self.case_file_mode)
+                if cached is not None:
+                    print('Solution ' + new_direct + ' found in the result cache')
+                    results[(i,j)] = np.array(cached["Cl"]), np.array(cached["Cd"]), np.array(cached["Cm"])
+                    if store is not None:
+                        store.append((i,j),cached)
+                    continue
+
+            pending.append((i,j))
+
+        if len(pending) == 0:
+            return results
+
+        # Create an Xfoil command script for all pairs not found in the cache
+        Alt  = [Freestream.Altitude[i] for (i,j) in pending]
+        Mach = [Freestream.Mach[j] for (i,j) in pending]
+        with span('Config writing', pairs=len(pending)):
+            filename = run_Xfoil_config(self,Alt,Mach,Freestream.Angle_of_attack,Geometry,Mesh,airfoil_filepath)
+
+        file_direct = os.path.join(self.working_dir, case_directory_name(Alt[0],Mach[0]))
+
+        # Run Xfoil
+        if self.sample_resources is True:
+            sampler = ResourceSampler(self.resource_sampling,1)
+        else:
+            sampler = None
+
+        print('Running Solution ' + filename)
+        with span('Xfoil run', pairs=len(pending)):
+            launch_Xfoil(filename,file_direct,display,backend,sampler)
+        print('Solution ' + filename + ' Completed')
+
+        usage = None
+        if sampler is not None:
+            sampler.report(filename)
+            usage = sampler.usage
 
+        # Read results
+        for (i,j) in pending:
+            case_direct = os.path.join(self.working_dir, case_directory_name(Freestream.Altitude[i],Freestream.Mach[j]))
+            with span('Polar parsing'):
+                Cl, Cd, Cm, converged = read_polar(os.path.join(case_direct,'polar.dat'),Freestream.Angle_of_attack)
+            if not np.all(converged):
+                print(case_directory_name(Freestream.Altitude[i],Freestream.Mach[j]) + ': Xfoil did not converge at ' + \
+                      str(int(np.sum(~converged))) + ' angle(s)-of-attack')
+            results[(i,j)] = Cl, Cd, Cm
+            if store is not None:
+                store.append((i,j),{"Cl": Cl, "Cd": Cd, "Cm": Cm, "resources": usage})
 
-        return
+            if cache is not None:
+                cache.store(cache_keys[(i,j)],{"Cl": Cl.tolist(), "Cd": Cd.tolist(), "Cm": Cm.tolist()},
+                            [os.path.join(case_direct,'polar.dat')])
+
+
+        return results
 
 
 
@@ -127,8 +240,8 @@ def run_Xfoil_config(self,Alt,Mach,AoA,Geometry,Mesh,airfoil_filepath):
         
             Inputs:
                 Solver          - solver settings
-                Alt             - altitudes [m]
-                Mach            - mach number
+                Alt             - altitude or list of altitudes of the session [m]
+                Mach            - mach number or list of Mach numbers of the session
                 AoA             - angles-of-attack [deg]
                 Ref_values      - reference values for aero forces nad moments
 
@@ -139,11 +252,71 @@ def run_Xfoil_config(self,Alt,Mach,AoA,Geometry,Mesh,airfoil_filepath):
 
 
             Assumptions:
+                1. The script is written into the case directory of the first condition,
+                   which has to contain the airfoil file
+                2. The polar of every condition is written to polar.dat in its own
+                   case directory
+
+        '''
+
+        Alt  = np.atleast_1d(Alt)
+        Mach = np.atleast_1d(Mach)
+
+        airfoil_file_xfoil = Geometry.Segments['section_1'].Airfoil['files']['merged']
+
+        # Output polar of every condition relative to the first case directory
+        first_direct = case_directory_name(Alt[0],Mach[0])
+        conditions   = []
+        for Alt_i, Mach_i in zip(Alt,Mach):
+            new_direct = case_directory_name(Alt_i,Mach_i)
+            if new_direct == first_direct:
+                output_polar = 'polar.dat'
+            else:
+                output_polar = '../' + new_direct + '/polar.dat'
+            conditions.append((Alt_i,Mach_i,output_polar))
+
+        filename    = first_direct + '.txt'
+        file_direct = os.path.join(self.working_dir, first_direct)
+
+        with open(os.path.join(file_direct,filename), 'w') as f:
+            if self.xfoil_display == 'none':
+                # Switch the graphics off so that Xfoil does not open an X display
+                f.write('PLOP\nG\n\n')
+            f.write(xfoil_commands(self,Mesh,airfoil_file_xfoil,AoA,conditions,Geometry))
+
+
+
+        return filename
+
+
+
+def xfoil_commands(self,Mesh,airfoil_file_xfoil,AoA,conditions,Geometry):
+
+        ''' Generates the Xfoil command script of one session
+        
+            Inputs:
+                Mesh                - Mesh settings
+                airfoil_file_xfoil  - airfoil coordinate file
+                AoA                 - angles-of-attack [deg]
+                conditions          - list of (altitude [m], Mach, output polar file)
+                Geometry            - Geometric settings
+
+
+            Outputs:
+                commands            - Xfoil command script
+
+
+            Assumptions:
+                1. The airfoil is loaded and repaneled once per session
+                2. Viscous mode is switched on by the first condition, later
+                   conditions change the Reynolds number with RE and reinitialize
+                   the boundary layer
+                3. PACC is toggled on and off around every condition so that each
+                   condition writes its own polar file
 
         '''
 
         # Unpack inputs
-        output_polar = 'polar.dat'              # Output filename        
         Ncrit        = self.e_n
         max_iter     = self.max_iterations      # Max iterations for convergence
 
@@ -153,61 +326,14 @@ def run_Xfoil_config(self,Alt,Mach,AoA,Geometry,Mesh,airfoil_filepath):
         refined_ratio = Mesh.airfoil_mesh_settings["LE_spacing"]
         x_ref_top     = " ".join([f"{num}" for num in Mesh.airfoil_mesh_settings["refine_xc_top"]])
         x_ref_bot     = " ".join([f"{num}" for num in Mesh.airfoil_mesh_settings["refine_xc_bottom"]])
-        airfoil_file  = Geometry.Segments[0].Airfoil.files['main'] 
-
-
-        # Compute standard atmospheric and reference properties
-        p_ref, T_ref, mu_ref = standard_atmosphere(Alt)
-        rho_ref = p_ref/(287*T_ref)
-        a_ref   = np.sqrt(1.4*287*T_ref)
-        V_ref   = Mach * a_ref
 
-        # Calculate Reynoldes number
-        Re = rho_ref * V_ref * Geometry.reference_values["Length"] / mu_ref               # Reynolds number based on unit length
-
-        # Create run directories and copy the case file there
-        new_direct  = 'Case_alt' + str("{:.2f}".format(Alt)) + '_Mach' + str("{:.2f}".format(Mach))
-
-        filename    = new_direct + '.txt'
-        file_direct = os.path.join(self.working_dir, new_direct)
-
-        if os.path.exists(file_direct) and os.path.isdir(file_direct):
-            shutil.rmtree(file_direct)
-        os.mkdir(file_direct)
-
-        os.chdir(self.working_dir)
-
-        airfoil_file_xfoil = Geometry.Segments['section_1'].Airfoil['files']['merged']
-            
-        shutil.copyfile(os.path.join(airfoil_filepath+'/'+  \
-                            Geometry.Segments['section_1'].Airfoil['files']['merged']), \
-                                file_direct+'/'+ airfoil_file_xfoil) 
-
-        os.chdir(file_direct)
-            
-        # Create a config file for Xfoil
         if len(AoA) == 1:
             AoA_exec = f'ALFA {AoA[0]}'
         else:
             AoA_exec = f'ASeq {AoA[0]} {AoA[-1]} {(AoA[-1] - AoA[0])/(len(AoA)-1)}'
 
-        xfoil_commands = f"""
-        NACA 2412
-        OPER
-        VISC 1e6      ! Reynolds number = 1,000,000
-        VPAR          ! Viscous parameters
-        N             ! Use default Ncrit (e^9)
-        XTR           ! Transition settings
-        T T           ! Force top/bottom transition (use 'X X' for free transition)
-        ITER 200      ! Max iterations for convergence
-        PACC          ! Enable polar output
-        naca2412_viscous_polar.txt  ! Output file
-        ALFA 0.0 10.0 1.0  ! Alpha sweep (0° to 10°, step 1°)
-        """
-
-        with open(filename, 'w') as f:
-            # Generate XFOIL commands
-            xfoil_commands1 = f"""
+        # Generate XFOIL commands
+        commands = f"""
 LOAD {airfoil_file_xfoil }
 PPAR
 N {Nnodes} \n
@@ -219,10 +345,14 @@ XB {x_ref_bot} \n\n
 OPER
 """
 
-            f.write(xfoil_commands1)
+        for n, (Alt, Mach, output_polar) in enumerate(conditions):
+
+            # Compute standard atmospheric and reference properties
+            T_ref, Re = reference_conditions(Alt,Mach,Geometry.reference_values["Length"])
 
             if self.viscous is True:
-                xfoil_commands2 = f"""VISC {Re}
+                if n == 0:
+                    commands += f"""VISC {Re}
 VPAR
 N {Ncrit}           ! Set Ncrit (e.g., 9 for default, 4 for early transition)
 XTR
@@ -231,72 +361,95 @@ XTR
 
 Mach
 {Mach}
+"""
+                else:
+                    commands += f"""RE {Re}
+Mach
+{Mach}
+INIT
 """
 
-                f.write(xfoil_commands2)
+            if n == 0:
+                commands += f"""ITER {max_iter}
+"""
 
-            xfoil_commands3 = f"""ITER {max_iter}
-PACC
+            commands += f"""PACC
 {output_polar}\n
 {AoA_exec}
 dump
 
-QUIT
+"""
+            if n < len(conditions) - 1:
+                commands += """PACC
 """
 
-            f.write(xfoil_commands3)
-
+        commands += """QUIT
+"""
 
 
-        return filename
+        return commands
 
 
 
-def launch_Xfoil(processors,filename):
+def launch_Xfoil(filename,file_direct,display=None,backend=None,sampler=None):
 
     ''' Runs Xfoil
             
         Inputs:
             filename         - Generated journal filename
+            file_direct      - case directory
+            display          - DisplayServer to run on, None to run through xvfb-run
+            backend          - execution backend, None to run Xfoil as a local process
+            sampler          - ResourceSampler of the session (optional)
 
         Outputs:
                     
 
         Assumptions:
+            The solver output is written to Xfoil_output.log in the case directory
 
     '''
 
-    # Run Xfoil
-    #, stdin=subprocess.PIPE
-
-    f = open('Xfoil_output.log', 'w')
-
-    #subprocess.run(["xfoil.exe"], stdin=open("xfoil_input.txt", "r"), text=True)
-    subprocess.run(["xfoil.exe"], stdin=open("xfoil_input.txt", "r"), stdout= f, stderr= None)
-
-    f.close()    
+    if display is None:
+        display = DisplayServer()
+    command, env = display.command(["xfoil", "-n"])
+    if backend is None:
+        backend = LocalBackend()
 
+    # Run Xfoil
+    job = backend.submit(command,file_direct,'Xfoil_output.log',1,filename,env)
+    if sampler is not None:
+        sampler.start(job)
+    job.wait()
+    if sampler is not None:
+        sampler.stop()
 
 
     return
 
 
-def read_results(output_file,len_AoA):
-    ''' Read output Xfoil results 
+def read_polar(output_file,AoA):
+    ''' Reads an Xfoil polar and matches its points to the requested angles-of-attack
             
             Inputs:
                 output_file     - Xfoil polar file with airfoil aerodynamic outputs
+                AoA             - requested angles-of-attack [deg]
 
             Outputs:
-                Cl, Cd, Cm
+                Cl, Cd, Cm      - NaN at angles-of-attack that are missing in the polar
+                converged       - True at angles-of-attack found in the polar
 
             Assumptions:
+                Xfoil only writes converged points to the polar
 
     '''
 
-    Cl = np.zeros(len_AoA)
-    Cd = np.zeros(len_AoA)
-    Cm = np.zeros(len_AoA)
+    AoA = np.asarray(AoA, dtype=float)
+
+    Cl = np.full(len(AoA), np.nan)
+    Cd = np.full(len(AoA), np.nan)
+    Cm = np.full(len(AoA), np.nan)
+    converged = np.zeros(len(AoA), dtype=bool)
 
     # Read results 
     with open(output_file, 'r') as f:
@@ -304,18 +457,15 @@ def read_results(output_file,len_AoA):
 
     data_lines = [line.strip() for line in lines if line.strip() and not line.startswith('---')]
 
-    i = 0
     for line in data_lines:
 
         parts = line.split()
 
-        Cl[i] = float(parts[1])
-        Cd[i] = float(parts[2])
-        Cm[i] = float(parts[4])
-
-        i += 1
-
-
-    return Cl, Cd, Cm
+        match = np.abs(AoA - float(parts[0])) < 1e-3
+        Cl[match] = float(parts[1])
+        Cd[match] = float(parts[2])
+        Cm[match] = float(parts[4])
+        converged[match] = True
 
 
+    return Cl, Cd, Cm, converged
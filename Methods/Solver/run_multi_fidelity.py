@@ -0,0 +1,442 @@
+import os
+import copy
+import numpy as np
+
+from Core.Trace                          import span
+from Methods.Solver                      import run_SU2, run_Xfoil, run_Panel, run_VLM
+from Methods.Solver.result_store         import ResultStore, export_workbook
+from Methods.Solver.sweep_result         import SweepResult
+
+def solve(self,Freestream,Mesh,Geometry,airfoil_filepath):
+
+        ''' Runs a multi-fidelity sweep: a low-fidelity solver evaluates the full sweep
+        and SU2 is run at selected points to correct it
+
+        Available sweeps:
+            Altitude
+            Mach
+            angle-of-attack
+
+
+        Inputs:
+            Freestream  - Freestream conditions
+            Mesh        - Mesh settings
+            Geometry    - Geometric settings
+            airfoil_filepath - directory of the airfoil coordinate files
+
+
+        Outputs:
+            Result      - SweepResult lookup table of the corrected Cl, Cd, Cm, also
+                          saved to working_dir/sweep_result.npz
+
+
+        Assumptions:
+            1. The low-fidelity sweep (Solver.multi_fidelity_settings["low_fidelity_solver"])
+               runs in working_dir/low_fidelity
+            2. Solver.multi_fidelity_settings["case_fraction"] of the sweep points are run
+               with SU2 in two rounds. The first round covers the sweep and prefers
+               points near the low-fidelity stall, transonic points, and points where
+               the low-fidelity solver failed. The second round prefers regions where
+               the correction of the first round has large leave-one-out errors and
+               keeps the sweep journal records of the first round
+            3. The correction is an additive RBF model of the SU2 minus low-fidelity
+               coefficients over the normalized sweep axes. Where the low-fidelity
+               solver failed, the SU2 coefficients are interpolated directly
+            4. The corrected table and the SU2 point mask are written to the result
+               store in working_dir/multi_fidelity. arrays.xlsx is exported from it
+               if Solver.export_workbook is True
+
+        '''
+
+
+        settings = self.multi_fidelity_settings
+        axes     = {"Altitude"        : Freestream.Altitude,
+                    "Mach"            : Freestream.Mach,
+                    "Angle_of_attack" : Freestream.Angle_of_attack}
+        shape    = (len(Freestream.Altitude), len(Freestream.Mach), len(Freestream.Angle_of_attack))
+
+        # Low-fidelity sweep
+        #--------------------------------------------------------------------
+        with span('Low-fidelity sweep'):
+            low_fidelity = run_low_fidelity(self,Freestream,Mesh,Geometry,airfoil_filepath)
+
+        # Select and run the SU2 cases
+        #--------------------------------------------------------------------
+        points   = normalized_points(axes)
+        priority = case_priority(low_fidelity,Freestream,settings["transonic_mach"])
+        n_cases  = min(int(np.ceil(settings["case_fraction"]*points.shape[0])), points.shape[0])
+        n_first  = max(1, int(np.ceil(settings["first_round_fraction"]*n_cases)))
+
+        high_fidelity = {name: np.full(shape, np.nan) for name in ('Cl', 'Cd', 'Cm')}
+        selected      = np.zeros(points.shape[0], dtype=bool)
+
+        first = select_cases(points,priority,selected,n_first)
+        with span('SU2 round', cases=len(first)):
+            run_high_fidelity(self,Freestream,Mesh,Geometry,first,shape,high_fidelity,self.resume)
+        selected[first] = True
+
+        if n_cases > n_first:
+            with span('Correction check'):
+                error  = loo_error(points,selected,low_fidelity,high_fidelity,settings)
+            second = select_cases(points,priority,selected,n_cases - n_first,error)
+            with span('SU2 round', cases=len(second)):
+                run_high_fidelity(self,Freestream,Mesh,Geometry,second,shape,high_fidelity,True)
+            selected[second] = True
+
+        # Correct the low-fidelity sweep
+        #--------------------------------------------------------------------
+        store = ResultStore(os.path.join(self.working_dir,'multi_fidelity'),axes)
+        results = {"high_fidelity": selected.reshape(shape).astype(float)}
+        for name in ('Cl', 'Cd', 'Cm'):
+            with span('Correction', field=name):
+                results[name]      = corrected_table(points,low_fidelity[name],high_fidelity[name],settings)
+            results[name + '_low'] = low_fidelity[name]
+        store.append((),results)
+        data = store.consolidate()
+
+        print(str(np.sum(selected)) + ' of ' + str(points.shape[0]) + ' sweep points were run with SU2')
+
+        # Write data into an Excel file
+        if self.export_workbook is True:
+            export_workbook(data,os.path.join(self.working_dir,'arrays.xlsx'))
+
+        print(data.Cl)
+        print(data.Cd)
+        print(data.Cm)
+
+        Result = SweepResult(data.axes,{"Cl": data.Cl, "Cd": data.Cd, "Cm": data.Cm})
+        Result.save(os.path.join(self.working_dir,'sweep_result.npz'))
+
+
+        return Result
+
+
+
+def run_low_fidelity(self,Freestream,Mesh,Geometry,airfoil_filepath):
+
+        ''' Runs the low-fidelity sweep in working_dir/low_fidelity
+
+            Inputs:
+                Freestream, Mesh, Geometry, airfoil_filepath - see solve
+
+
+            Outputs:
+                low_fidelity    - Cl, Cd, Cm arrays [Altitude, Mach, AoA]
+
+
+            Assumptions:
+
+        '''
+
+        Solver             = copy.copy(self)
+        Solver.name        = self.multi_fidelity_settings["low_fidelity_solver"]
+        Solver.working_dir = os.path.join(self.working_dir,'low_fidelity')
+        os.makedirs(Solver.working_dir, exist_ok=True)
+
+        if Solver.name == 'Xfoil':
+            Result = run_Xfoil.solve(Solver,Freestream,Mesh,Geometry,airfoil_filepath)
+        elif Solver.name == 'Panel':
+            Result = run_Panel.solve(Solver,Freestream,Mesh,Geometry,airfoil_filepath)
+        elif Solver.name == 'VLM':
+            Result = run_VLM.solve(Solver,Freestream,Mesh,Geometry)
+        else:
+            raise Exception('Unknown low-fidelity solver ' + str(Solver.name))
+
+        # Back to the sweep order of Freestream
+        order = [np.argsort(np.argsort(values, kind='stable'), kind='stable') for values in
+                 (Freestream.Altitude, Freestream.Mach, Freestream.Angle_of_attack)]
+
+
+        return {name: Result.fields[name][np.ix_(*order)] for name in ('Cl', 'Cd', 'Cm')}
+
+
+
+def run_high_fidelity(self,Freestream,Mesh,Geometry,cases,shape,high_fidelity,resume):
+
+        ''' Runs SU2 at selected sweep points
+
+            Inputs:
+                Freestream, Mesh, Geometry - see solve
+                cases           - flat indices of the sweep points
+                shape           - sweep shape [Altitude, Mach, AoA]
+                high_fidelity   - Cl, Cd, Cm arrays the results are written into
+                resume          - keep the sweep journal records of earlier rounds
+
+
+            Outputs:
+
+
+            Assumptions:
+                Cases that fail, and the cases warm-started from them, stay NaN
+
+        '''
+
+        Solver        = copy.copy(self)
+        Solver.resume = resume
+
+        index  = [tuple(int(n) for n in np.unravel_index(case,shape)) for case in cases]
+        Result = run_SU2.solve(Solver,Freestream,Mesh,Geometry,index,raise_on_failure=False)
+
+        order = [np.argsort(np.argsort(values, kind='stable'), kind='stable') for values in
+                 (Freestream.Altitude, Freestream.Mach, Freestream.Angle_of_attack)]
+        for name in ('Cl', 'Cd', 'Cm'):
+            values = Result.fields[name][np.ix_(*order)]
+            for case in index:
+                high_fidelity[name][case] = values[case]
+
+
+        return
+
+
+
+def normalized_points(axes):
+
+        ''' Returns the sweep points scaled to the unit cube
+
+            Inputs:
+                axes        - sweep axis values by name
+
+
+            Outputs:
+                points      - [n_points, n_axes] in the flat order of the sweep arrays
+
+
+            Assumptions:
+                Axes with a single value are left out
+
+        '''
+
+        grids  = np.meshgrid(*[np.asarray(values, dtype=float) for values in axes.values()], indexing='ij')
+        points = []
+        for grid in grids:
+            span = np.max(grid) - np.min(grid)
+            if span > 0:
+                points.append(((grid - np.min(grid))/span).ravel())
+
+        if len(points) == 0:
+            return np.zeros((grids[0].size,1))
+
+
+        return np.column_stack(points)
+
+
+
+def case_priority(low_fidelity,Freestream,transonic_mach):
+
+        ''' Scores the sweep points that are likely to need a high-fidelity solution
+
+            Inputs:
+                low_fidelity    - low-fidelity Cl, Cd, Cm
+                Freestream      - Freestream conditions
+                transonic_mach  - Mach number from which points count as transonic
+
+
+            Outputs:
+                priority        - number of criteria met by every sweep point (flat)
+
+
+            Assumptions:
+                1. Stall: the low-fidelity lift maximum of an angle-of-attack sweep and its
+                   neighbours, unless the maximum is at the end of the sweep
+                2. Failure: the low-fidelity solver gave no result
+                3. Transonic: Mach number of at least transonic_mach
+
+        '''
+
+        Cl       = low_fidelity["Cl"]
+        order    = np.argsort(Freestream.Angle_of_attack, kind='stable')
+        priority = np.zeros(Cl.shape)
+
+        for i in range(Cl.shape[0]):
+            for j in range(Cl.shape[1]):
+                cl = Cl[i,j,order]
+                if np.all(np.isnan(cl)):
+                    continue
+                n_max = int(np.nanargmax(cl))
+                if 0 < n_max < len(cl) - 1 or np.any(np.isnan(cl[n_max:])):
+                    stall = order[max(n_max-1,0):n_max+2]
+                    priority[i,j,stall] += 1
+
+        priority += np.isnan(Cl) | np.isnan(low_fidelity["Cd"]) | np.isnan(low_fidelity["Cm"])
+        priority += (np.asarray(Freestream.Mach) >= transonic_mach)[None,:,None]
+
+
+        return priority.ravel()
+
+
+
+def select_cases(points,priority,selected,n_cases,error=None):
+
+        ''' Greedily picks sweep points far from the points already selected
+
+            Inputs:
+                points      - normalized sweep points [n_points, n_axes]
+                priority    - priority of every point (see case_priority)
+                selected    - mask of the points already run
+                n_cases     - number of points to pick
+                error       - relative correction error at the selected points (optional)
+
+
+            Outputs:
+                cases       - flat indices of the picked points
+
+
+            Assumptions:
+                The distance to the nearest selected point is weighted by (1 + priority)
+                and by (1 + error) of that nearest point. Without selected points the
+                distance to the centre of the sweep is used
+
+        '''
+
+        chosen   = selected.copy()
+        weight   = 1 + priority
+        distance = np.full(len(points), np.inf)
+        nearest  = np.zeros(len(points), dtype=int)
+        cases    = []
+
+        def update(case):
+            d = np.linalg.norm(points - points[case],axis=-1)
+            closer = d < distance
+            distance[closer] = d[closer]
+            nearest[closer]  = case
+
+        for case in np.flatnonzero(chosen):
+            update(case)
+
+        for n in range(min(n_cases, int(np.sum(~chosen)))):
+            if np.any(chosen):
+                score = distance * weight
+                if error is not None:
+                    score = score * (1 + error[nearest])
+            else:
+                score = (np.linalg.norm(points - 0.5,axis=-1) + 1e-9) * weight
+            score[chosen] = -np.inf
+
+            case = int(np.argmax(score))
+            chosen[case] = True
+            cases.append(case)
+            update(case)
+
+
+        return cases
+
+
+
+def correction_model(points,values,settings):
+
+        ''' Fits an RBF model through scattered values
+
+            Inputs:
+                points      - normalized sweep points [n, n_axes]
+                values      - values at the points [n]
+                settings    - Solver.multi_fidelity_settings (rbf_kernel, rbf_smoothing)
+
+
+            Outputs:
+                model       - function of the normalized points [m, n_axes]
+
+
+            Assumptions:
+                A linear trend is added if there are enough points, otherwise a constant
+
+        '''
+
+        from scipy.interpolate import RBFInterpolator
+
+        if len(values) == 1:
+            return lambda x: np.full(len(x), values[0])
+
+        degree = 1 if len(values) > points.shape[1] + 1 else 0
+        try:
+            return RBFInterpolator(points,values,kernel=settings["rbf_kernel"],
+                                   smoothing=settings["rbf_smoothing"],degree=degree)
+        except np.linalg.LinAlgError:
+            # e.g. all points on one line with a linear trend in two dimensions
+            return RBFInterpolator(points,values,kernel=settings["rbf_kernel"],
+                                   smoothing=settings["rbf_smoothing"],degree=0)
+
+
+
+def loo_error(points,selected,low_fidelity,high_fidelity,settings):
+
+        ''' Leave-one-out errors of the correction model at the selected points
+
+            Inputs:
+                points          - normalized sweep points [n_points, n_axes]
+                selected        - mask of the points run with SU2
+                low_fidelity    - low-fidelity Cl, Cd, Cm
+                high_fidelity   - SU2 Cl, Cd, Cm
+                settings        - Solver.multi_fidelity_settings
+
+
+            Outputs:
+                error           - error relative to the mean error, summed over Cl, Cd, Cm.
+                                  Zero at points that were not selected
+
+
+            Assumptions:
+
+        '''
+
+        error = np.zeros(len(points))
+
+        for name in ('Cl', 'Cd', 'Cm'):
+            delta = (high_fidelity[name] - low_fidelity[name]).ravel()
+            known = np.flatnonzero(selected & np.isfinite(delta))
+            if len(known) < 3:
+                continue
+
+            loo = np.zeros(len(known))
+            for n in range(len(known)):
+                train  = np.delete(known,n)
+                model  = correction_model(points[train],delta[train],settings)
+                loo[n] = abs(model(points[known[n]][None,:])[0] - delta[known[n]])
+
+            if np.mean(loo) > 0:
+                error[known] += loo/np.mean(loo)
+
+
+        return error
+
+
+
+def corrected_table(points,low_fidelity,high_fidelity,settings):
+
+        ''' Corrects a low-fidelity table with the high-fidelity points
+
+            Inputs:
+                points          - normalized sweep points [n_points, n_axes]
+                low_fidelity    - low-fidelity values [Altitude, Mach, AoA]
+                high_fidelity   - high-fidelity values, NaN where not run
+                settings        - Solver.multi_fidelity_settings
+
+
+            Outputs:
+                corrected       - corrected values [Altitude, Mach, AoA]
+
+
+            Assumptions:
+                High-fidelity values are kept where they exist
+
+        '''
+
+        low   = low_fidelity.ravel()
+        high  = high_fidelity.ravel()
+        delta = high - low
+
+        corrected = low.copy()
+
+        known = np.isfinite(delta)
+        if np.any(known):
+            corrected = low + correction_model(points[known],delta[known],settings)(points)
+
+        # Interpolate the high-fidelity values where the low-fidelity solver failed
+        failed = ~np.isfinite(low)
+        if np.any(failed) and np.any(np.isfinite(high)):
+            direct = np.isfinite(high)
+            corrected[failed] = correction_model(points[direct],high[direct],settings)(points[failed])
+
+        corrected[np.isfinite(high)] = high[np.isfinite(high)]
+
+
+        return corrected.reshape(low_fidelity.shape)
@@ -0,0 +1,166 @@
+# su2_config.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    SU2 config template parsed once per sweep and rendered by option name
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+
+
+
+class SU2ConfigTemplate():
+
+    def __init__(self,filename):
+
+        ''' Parses an SU2 .cfg template
+
+            Inputs:
+                filename    - template .cfg file
+
+            Outputs:
+
+            Assumptions:
+                1. Lines starting with % and blank lines are kept as they are
+                2. Options are written as KEY= value, optionally followed by an
+                   inline % comment that is kept when the value is replaced
+                3. A value ending with a backslash continues on the next line
+                4. Option names are case insensitive and must be unique
+
+        '''
+
+        self.filename = filename
+        self.blocks   = []                  # Template text, one block per line or option
+        self.options  = {}                  # Option name -> [block index, value, inline comment]
+
+        with open(filename, 'r') as f:
+            lines = f.read().splitlines()
+
+        n = 0
+        while n < len(lines):
+            line = lines[n]
+            n   += 1
+
+            content, comment = split_comment(line)
+            if '=' not in content:
+                self.blocks.append(line + '\n')
+                continue
+
+            # Join continuation lines
+            block = [line]
+            value = content
+            while value.rstrip().endswith('\\') and n < len(lines):
+                next_content, next_comment = split_comment(lines[n])
+                block.append(lines[n])
+                value    = value.rstrip()[:-1] + ' ' + next_content
+                comment  = comment if next_comment is None else next_comment
+                n       += 1
+
+            key, value = value.split('=', 1)
+            key        = key.strip().upper()
+            if key in self.options:
+                raise Exception('Option ' + key + ' is set twice in ' + filename)
+
+            self.options[key] = [len(self.blocks), ' '.join(value.split()), comment]
+            self.blocks.append('\n'.join(block) + '\n')
+
+
+    def value(self,key):
+
+        ''' Returns the template value of an option, None if it is not set '''
+
+        key = key.upper()
+        if key not in self.options:
+            return None
+
+        return self.options[key][1]
+
+
+    def render(self,options):
+
+        ''' Returns the config text with options replaced
+
+            Inputs:
+                options     - dictionary of option names and values. Values are
+                              converted with str
+
+            Outputs:
+                text        - config file contents
+
+            Assumptions:
+                Options missing from the template are appended at the end
+
+        '''
+
+        blocks   = list(self.blocks)
+        appended = []
+        for key, value in options.items():
+            key  = key.upper()
+            line = key + '= ' + str(value)
+            if key in self.options:
+                index, _, comment = self.options[key]
+                if comment is not None:
+                    line = line + ' %' + comment
+                blocks[index] = line + '\n'
+            else:
+                appended.append(line + '\n')
+
+        if len(appended) > 0:
+            blocks.append('\n% Options not found in the template\n')
+            blocks.extend(appended)
+
+
+        return ''.join(blocks)
+
+
+    def write(self,filename,options):
+
+        ''' Writes the config file with options replaced
+
+            Inputs:
+                filename    - output .cfg file
+                options     - see render
+
+            Outputs:
+                text        - config file contents
+
+            Assumptions:
+
+        '''
+
+        text = self.render(options)
+        with open(filename, 'w') as f:
+            f.write(text)
+
+
+        return text
+
+
+
+def split_comment(line):
+
+    ''' Splits an SU2 config line into its content and inline comment
+
+        Inputs:
+            line        - config line
+
+        Outputs:
+            content     - text before the first %
+            comment     - text after the first %, None if there is none
+
+        Assumptions:
+
+    '''
+
+    if '%' not in line:
+        return line, None
+
+    content, comment = line.split('%', 1)
+
+
+    return content, comment
@@ -0,0 +1,150 @@
+# su2_driver.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    In-process SU2 driver that keeps the mesh and flow state loaded along
+    warm-start chains of angle-of-attack points
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+import importlib
+
+from Core.Data                          import Data
+from Methods.Solver.convergence_monitor import HistoryReader
+
+
+
+class SU2Driver():
+
+    def __init__(self,module='pysu2',history_file='history.csv'):
+
+        ''' Loads the SU2 Python wrapper
+
+            Inputs:
+                module      - name of the wrapper module. A stand-in module with
+                              the same interface can be used in place of SU2
+                history_file - history file name set in the case configs (CONV_FILENAME)
+
+            Outputs:
+
+            Assumptions:
+                1. The module provides CSinglezoneDriver(config_file, n_zones, comm)
+                   with the SU2 wrapper methods Preprocess, Run, Postprocess,
+                   Update, Monitor, Output, Finalize, SetAngleOfAttack,
+                   Get_LiftCoeff, Get_DragCoeff, and Get_MzCoeff
+                2. The driver runs on one MPI rank. Every rank of a script started
+                   with mpirun would run the whole sweep and write the same case
+                   files, so more than one rank is rejected. mpi4py is used for the
+                   communicator if it is installed
+
+        '''
+
+        try:
+            from mpi4py import MPI
+            self.comm = MPI.COMM_WORLD
+        except ImportError:
+            self.comm = None
+        if self.comm is not None and self.comm.Get_size() > 1:
+            raise Exception('The in-process SU2 driver runs on one MPI rank, the script was started with ' + \
+                            str(self.comm.Get_size()) + ". Use Solver.su2_driver = 'mpiexec' to run SU2 in parallel")
+
+        self.module       = importlib.import_module(module)
+        self.history_file = history_file
+        self.driver       = None            # Driver of the loaded case
+        self.history      = None            # HistoryReader of the history file of the loaded case
+        self.case         = None            # Case whose flow state the driver holds
+        self.loads        = 0               # Number of times a mesh was loaded
+        self.solves       = 0               # Number of cases solved
+
+
+    def solve(self,filename,file_direct,case,parent,AoA):
+
+        ''' Solves one case
+
+            Inputs:
+                filename        - case config file in file_direct
+                file_direct     - case directory
+                case            - case key, e.g. (altitude, Mach, angle-of-attack) indices
+                parent          - key of the warm-start case, None to start from the config
+                AoA             - angle-of-attack of the case [deg]
+
+            Outputs:
+                results         - Cl, Cd, Cm, the number of iterations, and the last residuals
+
+            Assumptions:
+                1. If the driver holds the flow state of the parent, only the
+                   angle-of-attack is changed and the solution continues from it.
+                   Otherwise the driver is created from the case config, which
+                   loads the mesh and the restart file set in it
+                2. The case is steady, so one Run performs all inner iterations
+                   up to ITER or the convergence criteria of the config
+                3. Output files are written to the case directory. SU2 keeps
+                   appending the history to the file opened when the case was
+                   loaded, so the iterations and residuals are read from the rows
+                   added during the run (one row per iteration)
+
+        '''
+
+        cwd = os.getcwd()
+        os.chdir(file_direct)
+
+        try:
+            if self.driver is None or parent is None or parent != self.case:
+                self.close()
+                self.driver  = self.module.CSinglezoneDriver(filename, 1, self.comm)
+                self.history = HistoryReader(os.path.join(file_direct,self.history_file),1)
+                self.loads  += 1
+            else:
+                self.driver.SetAngleOfAttack(AoA)
+            self.case = None
+
+            self.history.update()
+            rows = self.history.count
+
+            self.driver.Preprocess(0)
+            self.driver.Run()
+            self.driver.Postprocess()
+            self.driver.Update()
+            self.driver.Monitor(0)
+            self.driver.Output(0)
+
+            self.history.update()
+            results = {"Cl"         : self.driver.Get_LiftCoeff(),
+                       "Cd"         : self.driver.Get_DragCoeff(),
+                       "Cm"         : self.driver.Get_MzCoeff(),
+                       "iterations" : self.history.count - rows,
+                       "residuals"  : Data(self.history.residuals)}
+
+        except Exception:
+            # The flow state of a failed case is not reused
+            self.close()
+            raise
+
+        finally:
+            os.chdir(cwd)
+
+        self.case    = case
+        self.solves += 1
+
+
+        return results
+
+
+    def close(self):
+
+        ''' Releases the loaded case '''
+
+        if self.driver is not None:
+            driver       = self.driver
+            self.driver  = None
+            self.history = None
+            self.case    = None
+            driver.Finalize()
+
+        return
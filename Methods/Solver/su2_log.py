@@ -0,0 +1,168 @@
+# su2_log.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Reads the final convergence table row of an SU2 log without loading the
+    whole file into memory
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+
+from Core.Data import Data
+
+
+
+def read_log(output_file,block_size=65536):
+
+    ''' Reads the final results of an SU2 run from its screen output log
+
+        Inputs:
+            output_file     - SU2 log file with output
+            block_size      - size of the blocks read backwards from the end of the file [bytes]
+
+        Outputs:
+            results.CL, CD, CM  - coefficients of the last printed iteration
+                   .iterations  - last printed iteration
+                   .residuals   - last printed residuals (rms[...] columns)
+                   .columns     - table header
+
+        Assumptions:
+            1. The convergence table header is the first table row that contains an
+               iteration column (Inner_Iter, Outer_Iter, or Time_Iter)
+            2. The last table row with numeric fields only is the final iteration
+            3. The moment coefficient is taken from CMz, CMy, or CMx, in this order.
+               It is NaN if the table has no moment column
+            4. Without a header, the columns are taken at the positions of the
+               default 2D screen output (..., CD, CL, CMz, LinSolRes)
+
+    '''
+
+    columns = read_table_header(output_file)
+
+    row = None
+    with open(output_file, 'rb') as f:
+        for line in reverse_lines(f,block_size):
+            values = parse_table_row(line.decode(errors='replace'))
+            if values is None:
+                continue
+            try:
+                values = [float(value) for value in values]
+            except ValueError:
+                continue
+            if columns is None or len(values) == len(columns):
+                row = values
+                break
+
+    if row is None:
+        raise Exception('No convergence table row found in ' + output_file)
+
+    results = Data()
+    results.columns   = columns
+    results.residuals = Data()
+
+    if columns is None:
+        results.CL         = row[-3]
+        results.CD         = row[-4]
+        results.CM         = row[-2]
+        results.iterations = int(row[0])
+        return results
+
+    record = dict(zip(columns, row))
+
+    results.CL = record.get('CL', float('nan'))
+    results.CD = record.get('CD', float('nan'))
+    results.CM = float('nan')
+    for name in ['CMz', 'CMy', 'CMx']:
+        if name in record:
+            results.CM = record[name]
+            break
+
+    results.iterations = None
+    for name in ['Inner_Iter', 'Outer_Iter', 'Time_Iter']:
+        if name in record:
+            results.iterations = int(record[name])
+            break
+
+    for name in columns:
+        if name.startswith('rms['):
+            results.residuals[name] = record[name]
+
+
+    return results
+
+
+def read_table_header(output_file):
+
+    ''' Finds the convergence table header near the start of an SU2 log
+
+        Inputs:
+            output_file     - SU2 log file with output
+
+        Outputs:
+            columns         - list of column names, None if there is no header
+
+        Assumptions:
+            The file is read line by line until the header is found
+
+    '''
+
+    with open(output_file, 'r', errors='replace') as f:
+        for line in f:
+            fields = parse_table_row(line)
+            if fields is not None and any(name in fields for name in ['Inner_Iter', 'Outer_Iter', 'Time_Iter']):
+                return fields
+
+
+    return None
+
+
+def parse_table_row(line):
+
+    ''' Splits a '|'-delimited table row into stripped fields, None for other lines '''
+
+    line = line.strip()
+    if len(line) < 2 or not line.startswith('|') or not line.endswith('|'):
+        return None
+
+
+    return [field.strip() for field in line[1:-1].split('|')]
+
+
+def reverse_lines(f,block_size=65536):
+
+    ''' Yields the lines of a binary file from the last to the first
+
+        Inputs:
+            f           - file opened in binary mode
+            block_size  - size of the blocks read from the end of the file [bytes]
+
+        Outputs:
+            lines (bytes) without line endings
+
+        Assumptions:
+            Only the current block and one partial line are kept in memory
+
+    '''
+
+    f.seek(0, os.SEEK_END)
+    position = f.tell()
+    partial  = b''
+
+    while position > 0:
+        size      = min(block_size, position)
+        position -= size
+        f.seek(position)
+        lines     = (f.read(size) + partial).split(b'\n')
+        partial   = lines[0]
+        for line in reversed(lines[1:]):
+            yield line.rstrip(b'\r')
+
+    yield partial.rstrip(b'\r')
+
+    return
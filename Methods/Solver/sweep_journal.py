@@ -0,0 +1,141 @@
+# sweep_journal.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Persistent record of the sweep case status used to resume interrupted sweeps
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+import json
+import time
+import hashlib
+import threading
+
+
+
+class SweepJournal():
+
+    def __init__(self,filename,resume=False):
+
+        ''' Opens a sweep journal
+
+            Inputs:
+                filename    - journal file (JSON)
+                resume      - True keeps the records of a previous sweep,
+                              False starts an empty journal
+
+            Outputs:
+
+            Assumptions:
+                The journal is rewritten atomically after every update so it
+                stays readable if the sweep is killed
+
+        '''
+
+        self.filename = filename
+        self.lock     = threading.Lock()
+        self.cases    = {}
+
+        if resume is True and os.path.exists(filename):
+            with open(filename, 'r') as f:
+                self.cases = json.load(f).get("cases", {})
+
+        with self.lock:
+            self._write()
+
+
+    def record(self,case,status,inputs_hash,results=None):
+
+        ''' Records the status of a case
+
+            Inputs:
+                case        - case directory name
+                status      - 'running', 'completed', 'diverged', or 'failed'
+                inputs_hash - hash of the case inputs
+                results     - dictionary of parsed results of a completed case
+
+            Outputs:
+
+            Assumptions:
+
+        '''
+
+        with self.lock:
+            entry = {
+                "status"      : status,
+                "inputs_hash" : inputs_hash,
+                "updated"     : time.strftime('%Y-%m-%d %H:%M:%S'),
+            }
+            if results is not None:
+                entry["results"] = results
+            self.cases[case] = entry
+            self._write()
+
+        return
+
+
+    def completed(self,case,inputs_hash):
+
+        ''' Returns the stored results of a case completed with the same inputs
+
+            Inputs:
+                case        - case directory name
+                inputs_hash - hash of the case inputs
+
+            Outputs:
+                results     - dictionary of parsed results, None if the case
+                              has to be run
+
+            Assumptions:
+                Diverged and failed cases are run again
+
+        '''
+
+        with self.lock:
+            entry = self.cases.get(case)
+
+        if entry is None or entry["status"] != 'completed' or entry["inputs_hash"] != inputs_hash:
+            return None
+
+
+        return entry.get("results")
+
+
+    def _write(self):
+
+        ''' Writes the journal to disk. Must be called with the lock held '''
+
+        temp_file = self.filename + '.tmp'
+        with open(temp_file, 'w') as f:
+            json.dump({"cases": self.cases}, f, indent=1, sort_keys=True)
+        os.replace(temp_file, self.filename)
+
+        return
+
+
+
+def inputs_hash(*inputs):
+
+    ''' Computes a hash of the case inputs
+
+        Inputs:
+            inputs      - JSON-serializable values defining a case
+
+        Outputs:
+            hash string
+
+        Assumptions:
+            Numpy scalars are converted through their string representation
+
+    '''
+
+    text = json.dumps(inputs, sort_keys=True, default=str)
+
+
+    return hashlib.sha256(text.encode()).hexdigest()
@@ -0,0 +1,217 @@
+# sweep_result.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Labeled N-D lookup table of sweep results with vectorized interpolation
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import itertools
+import numpy as np
+
+
+
+class SweepResult():
+
+    def __init__(self,axes,fields):
+
+        ''' Creates a lookup table
+
+            Inputs:
+                axes        - dictionary of axis names and values in array order,
+                              e.g. {"Altitude": [...], "Mach": [...], "Angle_of_attack": [...]}
+                fields      - dictionary of field names and arrays over all axes (Cl, Cd, Cm, ...)
+
+            Outputs:
+
+            Assumptions:
+                Axes are sorted into ascending order and the field arrays with them
+
+        '''
+
+        self.axis_names = [str(name) for name in axes.keys()]
+        self.axes       = {}
+        self.fields     = {}
+        self._splines   = {}
+
+        order = []
+        for name, values in axes.items():
+            values = np.asarray(values, dtype=float)
+            order.append(np.argsort(values, kind='stable'))
+            self.axes[str(name)] = values[order[-1]]
+
+        shape = tuple(len(values) for values in self.axes.values())
+        for name, values in fields.items():
+            values = np.asarray(values, dtype=float)
+            if values.shape != shape:
+                raise Exception('Field ' + str(name) + ' has shape ' + str(values.shape) + ', expected ' + str(shape))
+            self.fields[str(name)] = values[np.ix_(*order)]
+
+
+    def interpolate(self,field,*coordinates,method='linear'):
+
+        ''' Interpolates a field at arbitrary points
+
+            Inputs:
+                field       - field name (e.g. 'Cl')
+                coordinates - one array of coordinates per axis, in axis order. The
+                              arrays are broadcast against each other
+                method      - 'linear' (multilinear) or 'cubic' (cubic spline)
+
+            Outputs:
+                values      - interpolated values with the broadcast coordinate shape
+
+            Assumptions:
+                1. Points outside the table are clamped to its bounds
+                2. Axes with a single value are ignored
+                3. Cubic splines are of lower order along axes with fewer than 4 values
+
+        '''
+
+        if len(coordinates) != len(self.axis_names):
+            raise Exception('Expected ' + str(len(self.axis_names)) + ' coordinate arrays (' + ', '.join(self.axis_names) + ')')
+
+        coordinates = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in coordinates])
+        shape       = coordinates[0].shape
+        points      = [x.ravel() for x in coordinates]
+
+        if method == 'linear':
+            values = self._multilinear(self.fields[field], points)
+        elif method == 'cubic':
+            values = self._spline(field, points)
+        else:
+            raise Exception('Unknown interpolation method ' + str(method))
+
+
+        return values.reshape(shape)
+
+
+    def _multilinear(self,table,points):
+
+        ''' Multilinear interpolation over the 2^d corners of the enclosing cells '''
+
+        lower   = []
+        weights = []
+        for values, x in zip(self.axes.values(), points):
+            if len(values) == 1:
+                lower.append(np.zeros(len(x), dtype=int))
+                weights.append(np.zeros(len(x)))
+                continue
+            x = np.clip(x, values[0], values[-1])
+            n = np.clip(np.searchsorted(values, x, side='right') - 1, 0, len(values) - 2)
+            lower.append(n)
+            weights.append((x - values[n]) / (values[n+1] - values[n]))
+
+        result = np.zeros(len(points[0]))
+        for corner in itertools.product((0, 1), repeat=len(points)):
+            index  = []
+            weight = np.ones(len(points[0]))
+            for d, c in enumerate(corner):
+                if c == 0:
+                    weight = weight * (1.0 - weights[d])
+                    index.append(lower[d])
+                else:
+                    weight = weight * weights[d]
+                    index.append(np.minimum(lower[d] + 1, table.shape[d] - 1))
+            result += weight * table[tuple(index)]
+
+
+        return result
+
+
+    def _spline(self,field,points):
+
+        ''' Tensor-product spline interpolation through scipy. The spline coefficients are built once per field
+
+            Assumptions:
+                The spline order along an axis with n values is min(3, n-1), so short
+                axes are interpolated linearly (2 values) or quadratically (3 values)
+
+        '''
+
+        from scipy.interpolate import make_interp_spline, BSpline
+
+        active = [d for d, values in enumerate(self.axes.values()) if len(values) > 1]
+        grid   = [list(self.axes.values())[d] for d in active]
+
+        if field not in self._splines:
+            coefficients = self.fields[field].reshape([len(values) for values in grid])
+            knots        = []
+            for n, values in enumerate(grid):
+                spline       = make_interp_spline(values, coefficients, k=min(3, len(values) - 1), axis=n)
+                coefficients = np.moveaxis(spline.c, 0, n)
+                knots.append((spline.t, spline.k))
+            self._splines[field] = (knots, coefficients)
+
+        knots, coefficients = self._splines[field]
+
+        # Contract the coefficients with the B-spline basis of every axis at the points
+        result = coefficients
+        for n, d in enumerate(active):
+            t, k  = knots[n]
+            x     = np.clip(points[d], grid[n][0], grid[n][-1])
+            basis = BSpline(t, np.eye(len(grid[n])), k)(x)
+            if n == 0:
+                result = np.tensordot(basis, result, axes=(1, 0))
+            else:
+                result = np.einsum('mi...,mi->m...', result, basis)
+
+        if len(active) == 0:
+            result = np.full(len(points[0]), float(coefficients.ravel()[0]))
+
+
+        return result
+
+
+    def save(self,filename):
+
+        ''' Writes the table to an uncompressed .npz file
+
+            Inputs:
+                filename    - output file
+
+            Outputs:
+
+            Assumptions:
+
+        '''
+
+        arrays = {}
+        for n, name in enumerate(self.axis_names):
+            arrays['axis_' + str(n)] = self.axes[name]
+        for n, name in enumerate(self.fields):
+            arrays['field_' + str(n)] = self.fields[name]
+
+        with open(filename, 'wb') as f:
+            np.savez(f, axis_names=np.asarray(self.axis_names, dtype=str),
+                     field_names=np.asarray(list(self.fields.keys()), dtype=str), **arrays)
+
+        return
+
+
+    @staticmethod
+    def load(filename):
+
+        ''' Reads a table written by save
+
+            Inputs:
+                filename    - .npz file
+
+            Outputs:
+                SweepResult
+
+            Assumptions:
+
+        '''
+
+        with np.load(filename) as f:
+            axes   = {str(name): f['axis_' + str(n)] for n, name in enumerate(f['axis_names'])}
+            fields = {str(name): f['field_' + str(n)] for n, name in enumerate(f['field_names'])}
+
+
+        return SweepResult(axes, fields)
@@ -4,6 +4,7 @@
 # -----------------------------------------
 
 from . import Atmosphere
+from . import Dataset
 from . import Geometry
 from . import Mesh
 from . import Solver
@@ -14,6 +14,11 @@ Capabilities:
     1. Generation of PARSEC/CST airfoils for clean and flapped configurations
     2. Airfoil/Wing automaitc meshing using Pointwise
     3. Execution of SU2 for given meshes using RANS with available turbulence models
+    4. Inviscid airfoil sweeps with a built-in panel method for early screening
+    5. Vortex-lattice wing sweeps for pre-screening 3D cases
+    6. Multi-fidelity sweeps that correct a low-fidelity sweep with selected SU2 cases
+    7. One-time conversion of SU2 meshes to the binary CGNS format
+    8. Timing traces of the pipeline stages (Chrome trace format)
 
 Compatibility: 
     The tool is compatible for both Windows and Linux systems
@@ -37,7 +42,9 @@ import subprocess
 import numpy as np
 from Methods.Mesh.mesh_pre_process_2D     import mesh_pre_process_2D
 from Methods.Mesh.mesh_pre_process_3D     import WingMeshPreProcess                
-from Methods.Solver                       import run_SU2, run_Xfoil
+from Methods.Mesh.mesh_conversion         import convert_mesh
+from Methods.Solver                       import run_SU2, run_Xfoil, run_Panel, run_VLM, run_multi_fidelity
+from Core.Trace                           import span, start_trace, stop_trace
 
 
 def run_aerodynamic_analysis(Input):
@@ -52,7 +59,7 @@ def run_aerodynamic_analysis(Input):
 
 
         Outputs:
-           
+            Result           - SweepResult lookup table of the sweep
 
         Assumptions:
 
@@ -65,78 +72,108 @@ def run_aerodynamic_analysis(Input):
     Freestream = Input.Freestream
     Mesh       = Input.Mesh
  
-    # Run the airfoil/wing generation script in a separate directory
-    file_path = os.path.join(Solver.working_dir, 'Geometry_files/')
-    if Geometry.generate is True:
-        if os.path.exists(file_path):
-            shutil.rmtree(file_path)
-        os.mkdir(file_path)
-        os.chdir(file_path)
-        num_segm = len(Geometry.Segments.keys())
-        for i in range(num_segm):
-            if len(Geometry.Segments[i].Airfoil.PARSEC) != 0:
-                airfoil_points = Geometry.Segments[i].create_PARSEC_airfoil()
-            elif len(Geometry.Segments[i].Airfoil.CST) != 0:
-                airfoil_points = Geometry.Segments[i].create_CST_airfoil()
-
-
-        # Create a wing using pygeo if a 3D case is defined 
-        if Solver.dimensions == '3d':  
-            Geometry.create_wing_geometry()
-
-         
-    # Mesh the geometry
-    if Mesh.meshing is True:
-
-        # Calculate mesh step size based on Y+
-        Mesh.calculate_initstepsize(max(Freestream.Mach), min(Freestream.Altitude), Geometry.reference_values["Length"], Mesh.Yplus)
-
-        # Assign a flag for an inviscid solver
-        if Solver.turbulence_model == 'Inviscid':
-            Inviscid_flag = True
-        else:
-            Inviscid_flag = False
-
-        # Update the Glyph script depending on the geometry 
-        if  Solver.dimensions == '2d':
-            mesh_pre_process_2D(Solver.working_dir,Geometry,Mesh)
-            if  Geometry.Segments[0].TrailingEdgeDevice.type == 'Slotted': 
-                # Update the Glyph script - Slotted flap airfoil                               
-                from Methods.Mesh.glyph_updater_flapped   import update_glyph_script_fl    
-                update_glyph_script_fl(Mesh,Solver.working_dir) 
+    # Record a timing trace of the run
+    if Solver.trace is True:
+        start_trace(os.path.join(Solver.working_dir, 'trace.json'))
+
+    try:
+        # Run the airfoil/wing generation script in a separate directory
+        file_path = os.path.join(Solver.working_dir, 'Geometry_files/')
+        if Geometry.generate is True:
+            with span('Geometry generation'):
+                if os.path.exists(file_path):
+                    shutil.rmtree(file_path)
+                os.mkdir(file_path)
+                os.chdir(file_path)
+                num_segm = len(Geometry.Segments.keys())
+                for i in range(num_segm):
+                    with span('Airfoil generation', segment=i):
+                        if len(Geometry.Segments[i].Airfoil.PARSEC) != 0:
+                            airfoil_points = Geometry.Segments[i].create_PARSEC_airfoil()
+                        elif len(Geometry.Segments[i].Airfoil.CST) != 0:
+                            airfoil_points = Geometry.Segments[i].create_CST_airfoil()
+                        else:
+                            continue
+                    Geometry.Segments[i].Airfoil.points = airfoil_points
+
+
+                # Create a wing using pygeo if a 3D case is defined. The vortex-lattice
+                # solver builds its planform from the segments directly
+                if Solver.dimensions == '3d' and Solver.name != 'VLM':  
+                    with span('Wing geometry'):
+                        Geometry.create_wing_geometry()
+
+             
+        # Mesh the geometry
+        if Mesh.meshing is True:
+
+            # Calculate mesh step size based on Y+
+            Mesh.calculate_initstepsize(max(Freestream.Mach), min(Freestream.Altitude), Geometry.reference_values["Length"], Mesh.Yplus)
+
+            # Assign a flag for an inviscid solver
+            if Solver.turbulence_model == 'Inviscid':
+                Inviscid_flag = True
             else:
-                # Update the Glyph script - clean Airfoil or one with a plain flap 
-                from Methods.Mesh.glyph_updater_clean     import update_glyph_script_cl
-                update_glyph_script_cl(Mesh,Solver.working_dir)
-
-        elif Solver.dimensions == '3d':
-            wing_meshing = WingMeshPreProcess()
-            wing_meshing.write_glyph_file(Solver.working_dir,Geometry,Mesh,Solver,Inviscid_flag)
-        else:
-            print("Specify 2d or 3d solver dimensions")
-        
-
-        # Run Pointwise glyph script to generate the mesh
-        os.chdir(Mesh.tclsh_directory)
-        if Mesh.operating_system == "WINDOWS":
-            working_dir_change = Solver.working_dir.replace('/','\\')
-            full_glyph_path    = working_dir_change + "\\" + Mesh.glyph_file 
-            p = subprocess.call(['tclsh ',full_glyph_path], stderr= None, stdin=subprocess.PIPE)    
-        else:
-            full_glyph_path = Solver.working_dir + "/" + Mesh.glyph_file 
-            p = subprocess.call('./pointwise ' + '-b ' + full_glyph_path, shell = True, stdin=subprocess.PIPE)
-
-
-    # Run CFD solution
-    if Solver.name == 'SU2':
-        run_SU2.solve(Solver,Freestream,Mesh,Geometry)
-    elif Solver.name == 'Xfoil':
-        run_Xfoil.solve(Solver,Freestream,Mesh,Geometry,file_path)
-    else:
-        sys.exit("ERROR: Set the right solver name in the Input setting")
+                Inviscid_flag = False
+
+            # Update the Glyph script depending on the geometry 
+            with span('Glyph writing'):
+                if  Solver.dimensions == '2d':
+                    mesh_pre_process_2D(Solver.working_dir,Geometry,Mesh)
+                    if  Geometry.Segments[0].TrailingEdgeDevice.type == 'Slotted': 
+                        # Update the Glyph script - Slotted flap airfoil                               
+                        from Methods.Mesh.glyph_updater_flapped   import update_glyph_script_fl    
+                        update_glyph_script_fl(Mesh,Solver.working_dir) 
+                    else:
+                        # Update the Glyph script - clean Airfoil or one with a plain flap 
+                        from Methods.Mesh.glyph_updater_clean     import update_glyph_script_cl
+                        update_glyph_script_cl(Mesh,Solver.working_dir)
+
+                elif Solver.dimensions == '3d':
+                    wing_meshing = WingMeshPreProcess()
+                    wing_meshing.write_glyph_file(Solver.working_dir,Geometry,Mesh,Solver,Inviscid_flag)
+                else:
+                    print("Specify 2d or 3d solver dimensions")
+            
+
+            # Run Pointwise glyph script to generate the mesh
+            with span('Pointwise'):
+                os.chdir(Mesh.tclsh_directory)
+                if Mesh.operating_system == "WINDOWS":
+                    working_dir_change = Solver.working_dir.replace('/','\\')
+                    full_glyph_path    = working_dir_change + "\\" + Mesh.glyph_file 
+                    p = subprocess.call(['tclsh ',full_glyph_path], stderr= None, stdin=subprocess.PIPE)    
+                else:
+                    full_glyph_path = Solver.working_dir + "/" + Mesh.glyph_file 
+                    p = subprocess.call('./pointwise ' + '-b ' + full_glyph_path, shell = True, stdin=subprocess.PIPE)
+
+
+        # Convert the SU2 mesh once to a binary format read faster by every case
+        if Solver.name == 'SU2' and Mesh.convert_to_binary is True:
+            with span('Mesh conversion'):
+                convert_mesh(Solver.working_dir,Mesh)
+
+
+        # Run CFD solution
+        with span('Solver sweep', solver=Solver.name):
+            if Solver.name == 'SU2' and Solver.multi_fidelity is True:
+                Result = run_multi_fidelity.solve(Solver,Freestream,Mesh,Geometry,file_path)
+            elif Solver.name == 'SU2':
+                Result = run_SU2.solve(Solver,Freestream,Mesh,Geometry)
+            elif Solver.name == 'Xfoil':
+                Result = run_Xfoil.solve(Solver,Freestream,Mesh,Geometry,file_path)
+            elif Solver.name == 'Panel':
+                Result = run_Panel.solve(Solver,Freestream,Mesh,Geometry,file_path)
+            elif Solver.name == 'VLM':
+                Result = run_VLM.solve(Solver,Freestream,Mesh,Geometry)
+            else:
+                sys.exit("ERROR: Set the right solver name in the Input setting")
+
+    finally:
+        stop_trace()
     
 
     print("Analysis completed")
 
 
-    return
+    return Result
@@ -0,0 +1,130 @@
+
+import os
+import numpy as np
+from Core.Data                          import Data
+from Components.Solver                  import Solver
+from Components.Geometry                import Geometry
+from Components.Geometry.Wing.Segment   import Segment
+from Components.Mesh                    import Mesh
+from Components.Dataset                 import Dataset
+
+from Methods.Dataset import generate_airfoil_dataset
+
+
+def Input_data():
+
+
+# ------------------------------- SOLVER SETTINGS ----------------------------------------------------------- #
+#
+
+    Solver_settings = Solver()
+
+    Solver_settings.working_dir = os.path.dirname(os.path.abspath(__file__))        # A standard line to get the file directory
+
+    Solver_settings.name = 'Panel'                # Panel or Xfoil
+
+    Solver_settings.viscous = True                # Viscous or inviscid solutions (Xfoil only)
+
+    Solver_settings.max_iterations = 200
+
+    Solver_settings.xfoil_display = 'none'        # Xfoil runs without graphics
+
+
+# ------------------------------- FREESTREAM SETTINGS ------------------------------------------------------- #
+#
+    Freestream = Data()
+    Freestream.Mach             = np.array([0.1,0.2,0.4])
+    Freestream.Altitude         = np.array([0])                         # in meters
+    Freestream.Angle_of_attack  = np.array([-2.0,0.0,2.0,4.0,6.0])      # in degrees. 
+                                                                        # For Xfoil, make sure to put equally spaced values
+
+
+# ------------------------------- GEOMETRY SETTINGS --------------------------------------------------------- #
+#
+    Geometry_data = Geometry()
+
+    # Reference values
+    Geometry_data.reference_values = {
+        "Length" : 1.0,
+        "Point"  : [0.25,0,0]                   # reference point about which the moment is taken
+    }
+
+    # Template airfoil. Parameters that are not sampled are kept at these values
+    segment = Segment()
+    segment.tag                = 'section_1'
+    segment.spanwise_location  = 0 
+    segment.chord              = 1.0
+    segment.Airfoil.PARSEC     = {
+                                    "rle"        : 0.0084,                      # Main airfoil LE radius
+                                    "x_pre"      : 0.458080577545180,           # x-location of the crest on the pressure side
+                                    "y_pre"      : -0.04553160030118,           # y-location of the crest on the pressure side  
+                                    "d2ydx2_pre" : 0.554845554794938,           # curvature of the crest on the pressure side  
+                                    "th_pre"     : -9.649803736,                # trailing edge angle on the pressure side [deg]
+                                    "x_suc"      : 0.46036604,                  # x-location of the crest on the suction side 
+                                    "y_suc"      : 0.06302395539,               # y-location of the crest on the suction side
+                                    "d2ydx2_suc" : -0.361421420,                # curvature of the crest on the suction side
+                                    "th_suc"     : -12.391677695858,            # trailing edge angle on the suction side [deg]
+                                    "yte upper" : 0.002,
+                                    "yte lower" : -0.002
+    }
+    Geometry_data.Segments.append(segment)
+
+
+# ------------------------------- MESH SETTINGS ---------------------------------------------------------------- #
+#
+
+    # In Xfoil, only airfoil surface panel distribution can be changed
+
+    Mesh_data = Mesh()
+
+    Mesh_data.airfoil_mesh_settings = {
+        "clustering_coefficient" : 1.0,           # a spacing coefficient that defines LE and TE clustering          
+        "LETE_spacing"           : 0.15,          # LE/TE panel density ratio
+        "connector dimensions"   : 160,           # in this case, a total number of panel nodes in Xfoil
+        "LE_spacing"             : 0.2,           # defines density at the leadinge edge 
+        "refine_xc_top"          : [1, 1],        # defines a region where the mesh is refined. [1, 1] means 'disabled'
+        "refine_xc_bottom"       : [1, 1]         # defines a region where the mesh is refined. [1, 1] means 'disabled'    
+    }
+
+
+# ------------------------------- DATASET SETTINGS ------------------------------------------------------------- #
+#
+
+    Dataset_settings = Dataset()
+
+    Dataset_settings.directory       = os.path.join(Solver_settings.working_dir,'dataset')
+    Dataset_settings.parametrization = 'PARSEC'
+    Dataset_settings.bounds          = {
+                                    "rle"        : [0.005, 0.02],
+                                    "x_suc"      : [0.30, 0.50],
+                                    "y_suc"      : [0.03, 0.10],
+                                    "th_suc"     : [-20.0, -5.0],
+                                    "x_pre"      : [0.30, 0.50],
+                                    "y_pre"      : [-0.08, -0.01],
+                                    "th_pre"     : [-15.0, 0.0]
+    }
+    Dataset_settings.sampling        = 'sobol'
+    Dataset_settings.n_samples       = 4096
+    Dataset_settings.shard_size      = 256
+    Dataset_settings.workers         = 4
+
+
+# ----------------------------------------------------------------------------------------------------------------------------- #
+#
+    # Pack all inputs
+    Input = Data()
+    Input.Solver        = Solver_settings
+    Input.Freestream    = Freestream
+    Input.Geometry      = Geometry_data
+    Input.Mesh          = Mesh_data
+    Input.Dataset       = Dataset_settings
+
+
+    return Input
+
+
+if __name__ == '__main__':
+
+    Input = Input_data()
+    for shard in generate_airfoil_dataset(Input.Dataset,Input.Solver,Input.Freestream,Input.Mesh,Input.Geometry):
+        pass
@@ -36,6 +36,10 @@ def Input_data():
     # Number of processors
     Solver_settings.processors = 4
 
+    # Total number of cores shared by cases running at once
+    # (default None runs one case at a time), e.g. on a 16-core machine:
+    # Solver_settings.max_cores = 16
+
     # Cauchy convergence criteria
     # Could be either LIFT or DRAG
     Solver_settings.monitor          = "LIFT"
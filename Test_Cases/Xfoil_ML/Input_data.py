@@ -32,6 +32,12 @@ def Input_data():
 
     Solver_settings.e_n = 9                       # The factor N for the e^N method
 
+    # Number of Xfoil sessions running at once
+    Solver_settings.parallel_workers = 4
+
+    # Number of (Altitude, Mach) pairs run in one Xfoil session
+    Solver_settings.xfoil_batch_size = 3
+
 
 # ------------------------------- FREESTREAM SETTINGS ------------------------------------------------------- #
 #
@@ -0,0 +1,93 @@
+# fake_pysu2.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Stand-in for the SU2 Python wrapper with the CSinglezoneDriver interface
+    used by Methods.Solver.su2_driver. It converges in a fixed number of
+    iterations, writes the history like SU2, and fails on request
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+
+
+COLD_ITERATIONS = 50                    # Iterations of a case started from the freestream
+WARM_ITERATIONS = 10                    # Iterations of a case continued from a flow state
+FAIL_AOA        = []                    # Angles-of-attack whose Run raises an exception
+
+drivers = []                            # All created drivers
+
+
+
+class CSinglezoneDriver():
+
+    def __init__(self,config_file,n_zones,comm):
+
+        ''' Reads the config and opens the history file like SU2 '''
+
+        options = {}
+        with open(config_file, 'r') as f:
+            for line in f:
+                key, _, value = line.split('%')[0].partition('=')
+                options[key.strip()] = value.strip()
+
+        self.config_file = config_file
+        self.directory   = os.getcwd()
+        self.AoA         = float(options["AOA"])
+        self.warm        = options.get("RESTART_SOL") == 'YES'
+        self.iteration   = 0
+        self.finalized   = False
+        self.history     = open(options.get("CONV_FILENAME", 'history') + '.csv', 'w')
+        self.history.write('"Inner_Iter","rms[Rho]","rms[RhoE]","CL","CD","CMz"\n')
+        drivers.append(self)
+
+
+    def SetAngleOfAttack(self,AoA):
+        self.AoA  = AoA
+        self.warm = True
+
+    def Preprocess(self,iteration):
+        pass
+
+    def Run(self):
+        if self.AoA in FAIL_AOA:
+            raise RuntimeError('Solution diverged at AoA ' + str(self.AoA))
+        iterations = WARM_ITERATIONS if self.warm else COLD_ITERATIONS
+        for n in range(iterations):
+            self.history.write(str(n) + ', ' + str(-1.0 - 0.1*n) + ', ' + str(-2.0 - 0.1*n) + ', ' + \
+                               str(self.Get_LiftCoeff()) + ', ' + str(self.Get_DragCoeff()) + ', -0.05\n')
+        self.history.flush()
+        self.iteration += iterations
+
+    def Postprocess(self):
+        pass
+
+    def Update(self):
+        pass
+
+    def Monitor(self,iteration):
+        return True
+
+    def Output(self,iteration):
+        with open('restart.dat', 'w') as f:
+            f.write(str(self.AoA))
+
+    def Get_LiftCoeff(self):
+        return 0.11*self.AoA + 0.2
+
+    def Get_DragCoeff(self):
+        return 0.01 + 0.001*self.AoA**2
+
+    def Get_MzCoeff(self):
+        return -0.05
+
+    def Finalize(self):
+        if self.finalized:
+            raise RuntimeError('Driver finalized twice')
+        self.finalized = True
+        self.history.close()
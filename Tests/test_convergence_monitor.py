@@ -0,0 +1,53 @@
+# test_convergence_monitor.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Tests of the stopping criteria of the SU2 convergence monitor
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+import sys
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(TESTS_DIR)]
+
+from Methods.Solver.convergence_monitor import ConvergenceMonitor, HistoryReader
+
+
+
+class TestConvergenceMonitor(unittest.TestCase):
+
+    def history(self,CL,CM,iterations=20):
+
+        ''' Builds a history of coefficients oscillating around CL and CM '''
+
+        history = HistoryReader('history.csv', 10)
+        history.parse_line('"Inner_Iter","rms[Rho]","CL","CD","CMz"\n')
+        for n in range(iterations):
+            history.parse_line(str(n) + ', -5.0, ' + str(CL + 3e-9*(-1)**n) + ', 0.01, ' + str(CM + 2e-9*(-1)**n) + '\n')
+
+        return history
+
+    def test_cauchy_converges_near_zero_lift(self):
+        monitor = ConvergenceMonitor({"window": 10, "min_iterations": 0})
+        self.assertTrue(monitor.check(self.history(1e-6, 0.0)).startswith('converged: Cauchy'))
+
+    def test_cauchy_relative_to_large_coefficients(self):
+        monitor = ConvergenceMonitor({"window": 10, "min_iterations": 0, "cauchy_floor": 1e-3})
+        history = HistoryReader('history.csv', 10)
+        history.parse_line('"Inner_Iter","rms[Rho]","CL","CD","CMz"\n')
+        for n in range(20):
+            history.parse_line(str(n) + ', -5.0, ' + str(0.5 + 1e-4*(-1)**n) + ', 0.01, -0.05\n')
+        self.assertIsNone(monitor.check(history))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
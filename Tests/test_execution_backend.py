@@ -0,0 +1,78 @@
+# test_execution_backend.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Tests of the batch scheduler backend with the stand-in Slurm commands of Tests/fakes/bin
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(TESTS_DIR)]
+
+from Methods.Solver.execution_backend import BatchBackend
+
+FAKE_BIN = os.path.join(TESTS_DIR, 'fakes', 'bin')
+
+
+
+class TestBatchBackend(unittest.TestCase):
+
+    def setUp(self):
+        self.working_dir = tempfile.mkdtemp()
+        self.saved_dir   = os.environ.get('FAKE_SLURM_DIR')
+        os.environ['FAKE_SLURM_DIR'] = os.path.join(self.working_dir, 'jobs')
+        self.backend = BatchBackend({"submit"        : os.path.join(FAKE_BIN, 'sbatch'),
+                                     "queue"         : os.path.join(FAKE_BIN, 'squeue'),
+                                     "cancel"        : os.path.join(FAKE_BIN, 'scancel'),
+                                     "directives"    : ['--time=00:05:00'],
+                                     "setup"         : ['export CASE_SETUP=loaded'],
+                                     "poll_interval" : 0.1})
+
+    def tearDown(self):
+        if self.saved_dir is None:
+            del os.environ['FAKE_SLURM_DIR']
+        else:
+            os.environ['FAKE_SLURM_DIR'] = self.saved_dir
+        shutil.rmtree(self.working_dir)
+
+    def test_submit_poll_exit_code(self):
+        command = [sys.executable, '-c', 'import os, sys; print(os.environ["CASE_SETUP"], os.environ["CASE_NAME"]); sys.exit(3)']
+        env     = dict(os.environ, CASE_NAME='case 1')
+        job     = self.backend.submit(command, self.working_dir, 'solver.log', 2, env=env)
+
+        self.assertEqual(job.job_id, '1000')
+        self.assertEqual(job.wait(timeout=60), 3)
+        self.assertEqual(job.poll(), 3)
+
+        with open(os.path.join(self.working_dir, 'solver.log'), 'r') as f:
+            self.assertEqual(f.read().strip(), 'loaded case 1')
+        with open(os.path.join(self.working_dir, 'solver.job.sh'), 'r') as f:
+            script = f.read()
+        self.assertIn('#SBATCH --ntasks=2', script)
+        self.assertIn('#SBATCH --time=00:05:00', script)
+
+    def test_queued_while_running(self):
+        job = self.backend.submit(['sleep', '30'], self.working_dir, 'solver.log')
+
+        self.assertIsNone(job.poll())
+        self.assertTrue(self.backend.queued(job.job_id))
+
+        job.terminate()
+        self.assertEqual(job.wait(timeout=60), 1)
+        self.assertFalse(self.backend.queued(job.job_id))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
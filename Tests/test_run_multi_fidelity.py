@@ -0,0 +1,138 @@
+# test_run_multi_fidelity.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Tests of the multi-fidelity sweep: the low-fidelity polars it starts from and
+    the SU2 rounds with the fake_pysu2 stand-in module
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(TESTS_DIR), os.path.join(TESTS_DIR, 'fakes')]
+
+import fake_pysu2
+
+from Core.Data                         import Data
+from Components.Solver.Solver          import Solver
+from Components.Mesh.Mesh              import Mesh
+from Methods.Solver.run_multi_fidelity import run_high_fidelity, case_priority
+from Methods.Solver.run_Xfoil          import read_polar
+
+TEMPLATE = os.path.join(os.path.dirname(TESTS_DIR), 'Test_Cases', 'Only_RANS', 'Run_airfoil_template.cfg')
+
+# Xfoil polar of a sweep from -2 to 6 deg that did not converge at 2 deg
+POLAR = '''
+       XFOIL         Version 6.99
+
+ Calculated polar for: airfoil
+
+ 1 1 Reynolds number fixed          Mach number fixed
+
+ xtrf =   1.000 (top)        1.000 (bottom)
+ Mach =   0.200     Re =     3.000 e 6     Ncrit =   9.000
+
+   alpha    CL        CD       CDp       CM     Top_Xtr  Bot_Xtr
+  ------ -------- --------- --------- -------- -------- --------
+  -2.000  -0.0200   0.00600   0.00200  -0.0500   0.6000   0.4000
+   0.000   0.2000   0.00550   0.00150  -0.0510   0.5500   0.4500
+   4.000   0.6400   0.00700   0.00300  -0.0530   0.4500   0.5500
+   6.000   0.8600   0.00800   0.00400  -0.0540   0.4000   0.6000
+'''
+
+
+
+class TestLowFidelityPolar(unittest.TestCase):
+
+    def setUp(self):
+        self.working_dir = tempfile.mkdtemp()
+        self.polar_file  = os.path.join(self.working_dir, 'polar.dat')
+        with open(self.polar_file, 'w') as f:
+            f.write(POLAR)
+
+    def tearDown(self):
+        shutil.rmtree(self.working_dir)
+
+    def test_missing_angle_is_nan(self):
+        AoA = np.array([-2., 0., 2., 4., 6.])
+        Cl, Cd, Cm, converged = read_polar(self.polar_file, AoA)
+
+        np.testing.assert_array_equal(converged, [True, True, False, True, True])
+        self.assertTrue(np.isnan(Cl[2]) and np.isnan(Cd[2]) and np.isnan(Cm[2]))
+        np.testing.assert_allclose(Cl[[0,1,3,4]], [-0.02, 0.2, 0.64, 0.86])
+        np.testing.assert_allclose(Cm[[0,1,3,4]], [-0.05, -0.051, -0.053, -0.054])
+
+        # The unconverged point is a failure, not a stall at the end of the sweep
+        Freestream                 = Data()
+        Freestream.Mach            = np.array([0.2])
+        Freestream.Angle_of_attack = AoA
+        priority = case_priority({"Cl": Cl[None,None,:], "Cd": Cd[None,None,:], "Cm": Cm[None,None,:]},
+                                 Freestream, 0.7)
+        np.testing.assert_array_equal(priority, [0, 0, 1, 0, 0])
+
+
+
+class TestHighFidelityRound(unittest.TestCase):
+
+    def setUp(self):
+        self.working_dir = tempfile.mkdtemp()
+        shutil.copy(TEMPLATE, os.path.join(self.working_dir, 'Run_airfoil_template.cfg'))
+        with open(os.path.join(self.working_dir, 'mesh.su2'), 'w') as f:
+            f.write('NDIME= 2\n')
+
+        self.Solver                   = Solver()
+        self.Solver.working_dir       = self.working_dir
+        self.Solver.config_file       = 'Run_airfoil_template.cfg'
+        self.Solver.turbulence_model  = 'SST'
+        self.Solver.su2_driver        = 'pysu2'
+        self.Solver.su2_python_module = 'fake_pysu2'
+
+        self.Mesh          = Mesh()
+        self.Mesh.filename = 'mesh.su2'
+
+        self.Freestream                 = Data()
+        self.Freestream.Altitude        = np.array([0.])
+        self.Freestream.Mach            = np.array([0.2, 0.3])
+        self.Freestream.Angle_of_attack = np.array([0., 2., 4.])
+
+        self.Geometry                  = Data()
+        self.Geometry.reference_values = {"Area": 1.0, "Length": 1.0, "Point": [0.25, 0, 0]}
+
+        fake_pysu2.drivers.clear()
+        fake_pysu2.FAIL_AOA.clear()
+
+    def tearDown(self):
+        fake_pysu2.FAIL_AOA.clear()
+        shutil.rmtree(self.working_dir)
+
+    def test_failed_case_stays_nan(self):
+        fake_pysu2.FAIL_AOA.append(2.0)
+
+        shape         = (1, 2, 3)
+        cases         = [np.ravel_multi_index(index, shape) for index in [(0,0,1), (0,1,0), (0,1,2)]]
+        high_fidelity = {name: np.full(shape, np.nan) for name in ('Cl', 'Cd', 'Cm')}
+
+        run_high_fidelity(self.Solver,self.Freestream,self.Mesh,self.Geometry,cases,shape,high_fidelity,False)
+
+        Cl = high_fidelity["Cl"]
+        self.assertTrue(np.isnan(Cl[0,0,1]))
+        self.assertAlmostEqual(Cl[0,1,0], 0.2)
+        self.assertAlmostEqual(Cl[0,1,2], 0.11*4.0 + 0.2)
+        self.assertEqual(int(np.sum(np.isfinite(Cl))), 2)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
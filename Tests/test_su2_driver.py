@@ -0,0 +1,90 @@
+# test_su2_driver.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Tests of the in-process SU2 driver with the fake_pysu2 stand-in module
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(TESTS_DIR), os.path.join(TESTS_DIR, 'fakes')]
+
+import fake_pysu2
+
+from Methods.Solver.su2_driver import SU2Driver
+
+
+
+class TestSU2Driver(unittest.TestCase):
+
+    def setUp(self):
+        self.working_dir = tempfile.mkdtemp()
+        self.driver      = SU2Driver('fake_pysu2')
+        fake_pysu2.drivers.clear()
+        fake_pysu2.FAIL_AOA.clear()
+
+    def tearDown(self):
+        self.driver.close()
+        fake_pysu2.FAIL_AOA.clear()
+        shutil.rmtree(self.working_dir)
+
+    def solve(self,AoA,parent):
+
+        ''' Writes the config of a case and solves it '''
+
+        case        = 'AoA' + str(AoA)
+        file_direct = os.path.join(self.working_dir, case)
+        os.makedirs(file_direct)
+        with open(os.path.join(file_direct, 'Config.cfg'), 'w') as f:
+            f.write('AOA= ' + str(AoA) + '\nRESTART_SOL= ' + ('NO' if parent is None else 'YES') + '\nCONV_FILENAME= history\n')
+
+        return self.driver.solve('Config.cfg', file_direct, case, parent, AoA)
+
+    def test_chain_loads_mesh_once(self):
+        results = [self.solve(0.0, None), self.solve(2.0, 'AoA0.0'), self.solve(4.0, 'AoA2.0')]
+
+        self.assertEqual(self.driver.loads, 1)
+        self.assertEqual(self.driver.solves, 3)
+        self.assertEqual(len(fake_pysu2.drivers), 1)
+        self.assertEqual([result["iterations"] for result in results],
+                         [fake_pysu2.COLD_ITERATIONS, fake_pysu2.WARM_ITERATIONS, fake_pysu2.WARM_ITERATIONS])
+        self.assertAlmostEqual(results[2]["Cl"], 0.11*4.0 + 0.2)
+        self.assertAlmostEqual(results[2]["residuals"]["rms[Rho]"], -1.0 - 0.1*(fake_pysu2.WARM_ITERATIONS - 1))
+
+    def test_new_chain_reloads(self):
+        self.solve(0.0, None)
+        self.solve(-2.0, None)
+
+        self.assertEqual(self.driver.loads, 2)
+        self.assertTrue(fake_pysu2.drivers[0].finalized)
+
+    def test_failed_case_is_not_reused(self):
+        fake_pysu2.FAIL_AOA.append(2.0)
+
+        self.solve(0.0, None)
+        with self.assertRaises(RuntimeError):
+            self.solve(2.0, 'AoA0.0')
+        self.assertIsNone(self.driver.case)
+        self.assertTrue(fake_pysu2.drivers[0].finalized)
+
+        # A case following the failed one starts again from its config
+        self.solve(4.0, 'AoA2.0')
+        self.assertEqual(self.driver.loads, 2)
+        self.assertEqual(self.driver.solves, 2)
+        self.assertEqual(os.path.basename(fake_pysu2.drivers[1].directory), 'AoA4.0')
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# test_sweep_result.py
+#
+# Created:  Oct 2026
+# Modified:
+
+
+"""
+    Tests of the interpolation of SweepResult lookup tables
+"""
+
+# ----------------------------------------------------------------------
+#   Imports
+# ----------------------------------------------------------------------
+import os
+import sys
+import unittest
+import numpy as np
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(TESTS_DIR)]
+
+from Methods.Solver.sweep_result import SweepResult
+
+
+
+def polar(Altitude,Mach,AoA):
+
+    ''' Linear in altitude, quadratic in Mach, and cubic in angle-of-attack '''
+
+    return 0.2 + 1e-5*Altitude + 0.3*Mach**2 + 0.11*AoA - 2e-4*AoA**3
+
+
+
+class TestSweepResult(unittest.TestCase):
+
+    def setUp(self):
+        axes = {"Altitude"        : [0.0, 2000.0],
+                "Mach"            : [0.2, 0.3, 0.4],
+                "Angle_of_attack" : [-4.0, -2.0, 0.0, 2.0, 4.0]}
+        A, M, a     = np.meshgrid(*axes.values(), indexing='ij')
+        self.result = SweepResult(axes, {"Cl": polar(A, M, a)})
+
+    def test_cubic_on_short_axes(self):
+        Altitude = np.array([500.0, 1500.0, 0.0])
+        Mach     = np.array([0.25, 0.33, 0.4])
+        AoA      = np.array([-3.1, 1.7, 4.0])
+
+        values = self.result.interpolate('Cl', Altitude, Mach, AoA, method='cubic')
+        np.testing.assert_allclose(values, polar(Altitude, Mach, AoA), rtol=1e-10)
+
+    def test_cubic_matches_table(self):
+        A, M, a = np.meshgrid(*self.result.axes.values(), indexing='ij')
+        values  = self.result.interpolate('Cl', A, M, a, method='cubic')
+        np.testing.assert_allclose(values, self.result.fields['Cl'], rtol=1e-12)
+
+    def test_linear_between_points(self):
+        value = self.result.interpolate('Cl', 0.0, 0.2, -3.0, method='linear')
+        self.assertAlmostEqual(float(value), 0.5*(polar(0.0, 0.2, -4.0) + polar(0.0, 0.2, -2.0)))
+
+
+
+if __name__ == '__main__':
+    unittest.main()